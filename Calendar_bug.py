@@ -1,52 +1,64 @@
 #!/usr/bin/env python3
 
+import os
 import sys
-import re
 from pathlib import Path
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPlainTextEdit, QPushButton, QFileDialog, QMessageBox,
-    QLineEdit, QCheckBox, QFrame, QSpacerItem, QSizePolicy
+    QLineEdit, QCheckBox, QFrame, QSpacerItem, QSizePolicy, QProgressBar
 )
 
+from bbtools.calendar_links import (DEFAULT_TEMPLATE, clean_and_split_emails, generate_links, iter_emails,
+                                    stream_links, write_links)
+from bbtools.qtmodels import ColumnTableModel, attach_filter, make_table_view
+
 # ---------- Config ----------
-DEFAULT_TEMPLATE = "https://calendar.google.com/calendar/u/0/htmlembed?src=XYZ"
 WINDOW_TITLE = "⚡ Calendar Link Generator"
 FONT_MONO = "Consolas, Monaco, 'Courier New', monospace"
 
-# ---------- Helper functions ----------
-_EMAIL_RE = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
-
-def clean_and_split_emails(text: str):
-    parts = re.split(r'[\n,;\s]+', text.strip())
-    seen = set()
-    out = []
-    for p in parts:
-        p = p.strip()
-        if not p:
-            continue
-        if p in seen:
-            continue
-        seen.add(p)
-        out.append(p)
-    return out
-
-
-def is_valid_email(email: str) -> bool:
-    return bool(_EMAIL_RE.match(email))
-
-
-def generate_link(template: str, email: str) -> str:
-    if "XYZ" in template:
-        return template.replace("XYZ", email)
-    if "{email}" in template:
-        return template.replace("{email}", email)
-    # fallback: append as src param if present, otherwise append
-    if "src=" in template and template.endswith("="):
-        return template + email
-    return template + email
+# ---------- Workers ----------
+class StreamExportThread(QThread):
+    """Stream an email file straight into a links (.txt) or CSV file, without the editor or table."""
+    progress = pyqtSignal(int)
+    done = pyqtSignal(int, int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, src, dst, template, valid_only):
+        super().__init__()
+        self.src = src
+        self.dst = dst
+        self.template = template
+        self.valid_only = valid_only
+        self.invalid = 0
+
+    def run(self):
+        try:
+            with open(self.src, encoding='utf-8', errors='ignore') as f, \
+                    open(self.dst, 'w', encoding='utf-8') as out:
+                rows = stream_links(iter_emails(self._lines(f)), self.template, self.valid_only, self._skip)
+                count = write_links(rows, out, as_csv=self.dst.lower().endswith('.csv'))
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.done.emit(count, self.invalid)
+
+    def _lines(self, f):
+        # Characters read approximate bytes closely enough for a progress bar.
+        total = os.path.getsize(self.src) or 1
+        read = percent = 0
+        for line in f:
+            read += len(line)
+            if read * 100 // total > percent:
+                percent = min(100, read * 100 // total)
+                self.progress.emit(percent)
+            yield line
+
+    def _skip(self, email):
+        self.invalid += 1
+
 
 # ---------- UI ----------
 class HackerVibeWindow(QMainWindow):
@@ -126,9 +138,13 @@ class HackerVibeWindow(QMainWindow):
         right_layout.setContentsMargins(6, 6, 6, 6)
 
         right_layout.addWidget(QLabel("Generated links (preview):"))
-        self.link_output = QPlainTextEdit()
-        self.link_output.setReadOnly(False)
+        self.link_filter = QLineEdit()
+        self.link_filter.setPlaceholderText("Filter links...")
+        right_layout.addWidget(self.link_filter)
+        self.link_model = ColumnTableModel(["Email", "Link"])
+        self.link_output = make_table_view(self.link_model, stretch_column=1)
         self.link_output.setFont(QFont(FONT_MONO, 10))
+        attach_filter(self.link_filter, self.link_model)
         right_layout.addWidget(self.link_output, stretch=1)
 
         right_buttons = QHBoxLayout()
@@ -141,7 +157,7 @@ class HackerVibeWindow(QMainWindow):
         right_buttons.addWidget(self.save_links_btn)
 
         self.clear_links_btn = QPushButton("Clear Links")
-        self.clear_links_btn.clicked.connect(lambda: self.link_output.clear())
+        self.clear_links_btn.clicked.connect(lambda: self.link_model.clear())
         right_buttons.addWidget(self.clear_links_btn)
 
         right_buttons.addSpacerItem(QSpacerItem(20, 10, QSizePolicy.Expanding, QSizePolicy.Minimum))
@@ -158,6 +174,18 @@ class HackerVibeWindow(QMainWindow):
 
         footer.addSpacerItem(QSpacerItem(20, 10, QSizePolicy.Expanding, QSizePolicy.Minimum))
 
+        self.progress = QProgressBar()
+        self.progress.setMaximumWidth(200)
+        self.progress.hide()
+        footer.addWidget(self.progress)
+
+        self.stream_btn = QPushButton("File → Links")
+        self.stream_btn.setToolTip("Convert an email file straight to a links .txt or .csv file "
+                                   "(for lists too big for the editor)")
+        self.stream_btn.clicked.connect(self.stream_file)
+        footer.addWidget(self.stream_btn)
+        self.streamer = None
+
         self.export_csv_btn = QPushButton("Export CSV")
         self.export_csv_btn.clicked.connect(self.export_csv)
         footer.addWidget(self.export_csv_btn)
@@ -190,13 +218,7 @@ class HackerVibeWindow(QMainWindow):
         valid_only = self.validate_cb.isChecked()
         template = self.template_input.text().strip() or DEFAULT_TEMPLATE
 
-        links = []
-        invalid = []
-        for e in emails:
-            if valid_only and not is_valid_email(e):
-                invalid.append(e)
-                continue
-            links.append(generate_link(template, e))
+        kept, links, invalid = generate_links(emails, template, valid_only)
 
         if invalid:
             self.status(f"Generated {len(links)} links — skipped {len(invalid)} invalid emails")
@@ -206,42 +228,74 @@ class HackerVibeWindow(QMainWindow):
         else:
             self.status(f"Generated {len(links)} links")
 
-        self.link_output.setPlainText('\n'.join(links))
+        self.link_model.load([kept, links])
+
+    def links_text(self) -> str:
+        return '\n'.join(self.link_model.column(1))
+
+    def stream_file(self):
+        src, _ = QFileDialog.getOpenFileName(self, "Open Email List", "", "Text Files (*.txt);;All Files (*)")
+        if not src:
+            return
+        dst, _ = QFileDialog.getSaveFileName(self, "Save Links As", "links.csv",
+                                             "CSV Files (*.csv);;Text Files (*.txt);;All Files (*)")
+        if not dst:
+            return
+        template = self.template_input.text().strip() or DEFAULT_TEMPLATE
+        self.stream_btn.setEnabled(False)
+        self.progress.setValue(0)
+        self.progress.show()
+        self.status_label.setText(f"Streaming {Path(src).name} -> {Path(dst).name}...")
+        self.streamer = StreamExportThread(src, dst, template, self.validate_cb.isChecked())
+        self.streamer.progress.connect(self.progress.setValue)
+        self.streamer.done.connect(lambda count, invalid: self.stream_done(dst, count, invalid))
+        self.streamer.failed.connect(self.stream_failed)
+        self.streamer.start()
+
+    def stream_done(self, dst, count, invalid):
+        self.progress.hide()
+        self.stream_btn.setEnabled(True)
+        self.status(f"Wrote {count} links to {Path(dst).name}"
+                    + (f" — skipped {invalid} invalid emails" if invalid else ""))
+
+    def stream_failed(self, error):
+        self.progress.hide()
+        self.stream_btn.setEnabled(True)
+        self.status("Ready")
+        QMessageBox.critical(self, "Error", f"Failed to generate links:\n{error}")
 
     def save_links(self):
-        if not self.link_output.toPlainText().strip():
+        if not self.link_model.total_rows():
             QMessageBox.warning(self, "No links", "No links to save. Generate first.")
             return
         path, _ = QFileDialog.getSaveFileName(self, "Save Links", "links.txt", "Text Files (*.txt);;All Files (*)")
         if path:
             try:
-                Path(path).write_text(self.link_output.toPlainText(), encoding='utf-8')
+                with open(path, 'w', encoding='utf-8') as f:
+                    write_links(self.link_model.rows(), f)
                 self.status(f"Saved links -> {Path(path).name}")
                 QMessageBox.information(self, "Saved", f"Links saved to {path}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to save file:\n{e}")
 
     def save_links_quiet(self, path: Path):
-        Path(path).write_text(self.link_output.toPlainText(), encoding='utf-8')
+        Path(path).write_text(self.links_text(), encoding='utf-8')
 
     def export_csv(self):
-        if not self.link_output.toPlainText().strip():
+        if not self.link_model.total_rows():
             QMessageBox.warning(self, "No links", "Generate links before exporting CSV.")
             return
         path, _ = QFileDialog.getSaveFileName(self, "Export CSV", "links.csv", "CSV Files (*.csv);;All Files (*)")
         if path:
             try:
-                emails = clean_and_split_emails(self.email_editor.toPlainText())
-                links = [l.strip() for l in self.link_output.toPlainText().splitlines() if l.strip()]
-                # pairwise -- if counts mismatch, export what we have
-                rows = [f'"{emails[i]}","{links[i]}"' for i in range(min(len(emails), len(links)))]
-                Path(path).write_text('\n'.join(rows) + '\n', encoding='utf-8')
+                with open(path, 'w', encoding='utf-8') as f:
+                    write_links(self.link_model.rows(), f, as_csv=True)
                 QMessageBox.information(self, "CSV Exported", f"CSV exported to {path}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to export CSV:\n{e}")
 
     def copy_links(self):
-        txt = self.link_output.toPlainText()
+        txt = self.links_text()
         if not txt.strip():
             QMessageBox.warning(self, "No links", "Nothing to copy. Generate first.")
             return
@@ -266,7 +320,7 @@ class HackerVibeWindow(QMainWindow):
         qss = r'''
         QWidget#main_widget { background: #0b0f0b; color: #C7F9C7; }
         QLabel { color: #9ef07a; }
-        QLineEdit, QPlainTextEdit, QTextEdit { background: #091109; color: #C7F9C7; border: 1px solid #173617; }
+        QLineEdit, QPlainTextEdit, QTextEdit, QTableView { background: #091109; color: #C7F9C7; border: 1px solid #173617; }
         QPushButton { background: #0f3b0f; color: #d9ffd9; border-radius: 6px; padding:6px; }
         QPushButton:hover { background: #1a5a1a; }
         QCheckBox { color: #9ef07a; }
@@ -2,14 +2,21 @@ import tkinter as tk
 from tkinter import filedialog, ttk, messagebox, scrolledtext
 import threading
 import queue
-import time
-import csv
-import re
-import requests
+from collections import deque
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
 
+from bbtools.gcal import RESULT_FIELDS, CalendarValidator, httpx
+from bbtools.journal import Journal, journal_path
+from bbtools.sinks import open_sink
+
+# GUI refresh: results are applied in one batch per tick and only the newest
+# rows stay in the Treeview (exports always contain every result).
+PUMP_INTERVAL_MS = 100
+MAX_VISIBLE_ROWS = 2000
+STATUS_TAGS = {"VALID": 'valid', "INVALID": 'invalid'}
+
+
 class CalendarEmailValidator:
     def __init__(self, root):
         self.root = root
@@ -17,17 +24,21 @@ class CalendarEmailValidator:
         self.root.geometry("1000x700")
         self.root.configure(bg='#f0f0f0')
         
-        # Email validation pattern
-        self.email_pattern = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
-        
-        # Results storage
+        # Results storage (only kept in memory when not streamed to a file)
         self.results = []
+        self.streamed_to = None
         self.running = False
         self.processed_count = 0
         self.total_emails = 0
+        self.valid_count = self.invalid_count = self.error_count = 0
+        self.validator = None
+        self.email_file = None
         
-        # Queue for thread-safe GUI updates
+        # Queue for thread-safe GUI updates (log lines, concurrency changes)
         self.update_queue = queue.Queue()
+        # Results from worker threads; deque appends/pops are atomic, so
+        # workers never block on the GUI and check_queue drains it per tick
+        self.pending_results = deque()
         
         # Setup GUI
         self.setup_gui()
@@ -70,6 +81,21 @@ class CalendarEmailValidator:
                  bg='#3498db', fg='white', font=('Arial', 10, 'bold'),
                  relief=tk.RAISED, padx=15, pady=5).pack(side=tk.LEFT, padx=5)
         
+        # Optional output file that results stream into while validating
+        stream_frame = tk.Frame(control_frame, bg='#f0f0f0')
+        stream_frame.pack(fill=tk.X, pady=5)
+        
+        tk.Label(stream_frame, text="Stream Results To:", font=('Arial', 11), 
+                bg='#f0f0f0', width=15, anchor='w').pack(side=tk.LEFT)
+        
+        self.stream_var = tk.StringVar()
+        tk.Entry(stream_frame, textvariable=self.stream_var, font=('Arial', 11),
+                width=42).pack(side=tk.LEFT, padx=(10, 5))
+        
+        tk.Button(stream_frame, text="Browse", command=self.choose_stream_file,
+                 bg='#3498db', fg='white', font=('Arial', 10, 'bold'),
+                 relief=tk.RAISED, padx=15, pady=5).pack(side=tk.LEFT, padx=5)
+        
         # Settings frame
         settings_frame = tk.Frame(control_frame, bg='#f0f0f0')
         settings_frame.pack(fill=tk.X, pady=(15, 5))
@@ -82,13 +108,36 @@ class CalendarEmailValidator:
                                     width=10, font=('Arial', 11))
         threads_spinbox.pack(side=tk.LEFT, padx=(10, 20))
         
-        tk.Label(settings_frame, text="Delay (ms):", font=('Arial', 11),
+        tk.Label(settings_frame, text="Rate (req/s):", font=('Arial', 11),
                 bg='#f0f0f0', width=10, anchor='w').pack(side=tk.LEFT)
         
-        self.delay_var = tk.StringVar(value="100")
-        delay_spinbox = tk.Spinbox(settings_frame, from_=0, to=5000, textvariable=self.delay_var,
-                                  width=10, font=('Arial', 11), increment=100)
-        delay_spinbox.pack(side=tk.LEFT, padx=(10, 0))
+        # 0 disables rate limiting
+        self.rate_var = tk.StringVar(value="10")
+        rate_spinbox = tk.Spinbox(settings_frame, from_=0, to=1000, textvariable=self.rate_var,
+                                 width=8, font=('Arial', 11))
+        rate_spinbox.pack(side=tk.LEFT, padx=(10, 20))
+        
+        tk.Label(settings_frame, text="Burst:", font=('Arial', 11),
+                bg='#f0f0f0', anchor='w').pack(side=tk.LEFT)
+        
+        self.burst_var = tk.StringVar(value="1")
+        burst_spinbox = tk.Spinbox(settings_frame, from_=1, to=1000, textvariable=self.burst_var,
+                                  width=8, font=('Arial', 11))
+        burst_spinbox.pack(side=tk.LEFT, padx=(10, 0))
+        
+        self.http2_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(settings_frame, text="HTTP/2", variable=self.http2_var, font=('Arial', 11),
+                      bg='#f0f0f0', state=tk.NORMAL if httpx else tk.DISABLED).pack(side=tk.LEFT, padx=(20, 0))
+        
+        # Adaptive mode treats Threads as the ceiling
+        self.adaptive_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(settings_frame, text="Adaptive", variable=self.adaptive_var, font=('Arial', 11),
+                      bg='#f0f0f0').pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Resume reuses answers journaled by an earlier run over the same file
+        self.resume_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(settings_frame, text="Resume", variable=self.resume_var, font=('Arial', 11),
+                      bg='#f0f0f0').pack(side=tk.LEFT, padx=(10, 0))
         
         # Button frame
         button_frame = tk.Frame(control_frame, bg='#f0f0f0')
@@ -129,8 +178,12 @@ class CalendarEmailValidator:
         tk.Label(stats_frame, textvariable=self.stats_text, font=('Arial', 11, 'bold'),
                 bg='#f0f0f0', fg='#2c3e50').pack()
         
+        self.concurrency_text = tk.StringVar(value="Concurrency: -")
+        tk.Label(stats_frame, textvariable=self.concurrency_text, font=('Arial', 10),
+                bg='#f0f0f0', fg='#7f8c8d').pack()
+        
         # Results display
-        results_frame = tk.LabelFrame(main_frame, text="Validation Results", 
+        results_frame = tk.LabelFrame(main_frame, text=f"Validation Results (latest {MAX_VISIBLE_ROWS:,} shown)", 
                                      font=('Arial', 12, 'bold'), bg='#f0f0f0', 
                                      fg='#2c3e50', padx=15, pady=15)
         results_frame.pack(fill=tk.BOTH, expand=True)
@@ -188,24 +241,38 @@ class CalendarEmailValidator:
         self.log_text.see(tk.END)
         
     def check_queue(self):
-        """Check for updates from worker threads"""
+        """Apply updates from worker threads, one batch per tick"""
         try:
+            batch = []
+            try:
+                while True:
+                    batch.append(self.pending_results.popleft())
+            except IndexError:
+                pass
+            if batch:
+                for result in batch:
+                    status = result[2]
+                    if status == "VALID":
+                        self.valid_count += 1
+                    elif status == "INVALID":
+                        self.invalid_count += 1
+                    else:
+                        self.error_count += 1
+                self.processed_count += len(batch)
+                self.add_results(batch)
+                self.update_stats(self.valid_count, self.invalid_count, self.error_count)
+                self.update_progress()
+
             while True:
                 update = self.update_queue.get_nowait()
-                if update[0] == 'result':
-                    _, idx, email, status, http_code, response_time, details = update
-                    self.add_result(idx, email, status, http_code, response_time, details)
-                    self.processed_count += 1
-                    self.update_progress()
-                elif update[0] == 'stats':
-                    valid, invalid, error = update[1:]
-                    self.update_stats(valid, invalid, error)
-                elif update[0] == 'log':
+                if update[0] == 'log':
                     self.log_message(update[1], update[2])
+                elif update[0] == 'concurrency':
+                    self.concurrency_text.set(f"Concurrency: {update[1]}")
         except queue.Empty:
             pass
         finally:
-            self.root.after(100, self.check_queue)
+            self.root.after(PUMP_INTERVAL_MS, self.check_queue)
             
     def load_file(self):
         """Load email list from text file"""
@@ -227,6 +294,7 @@ class CalendarEmailValidator:
                         self.emails.append(email)
                 
                 self.total_emails = len(self.emails)
+                self.email_file = os.path.abspath(filename)
                 self.file_label.config(text=f"{filename} ({self.total_emails} emails)")
                 self.start_btn.config(state=tk.NORMAL)
                 self.log_message(f"Loaded {self.total_emails} emails from {filename}")
@@ -234,53 +302,6 @@ class CalendarEmailValidator:
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load file: {str(e)}")
                 
-    def validate_email_format(self, email):
-        """Validate email format using regex"""
-        return bool(self.email_pattern.match(email))
-    
-    def check_calendar_url(self, email):
-        """Check if Google Calendar exists for email"""
-        url = f"https://calendar.google.com/calendar/u/0/htmlembed?src={email}"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        try:
-            start_time = time.time()
-            response = requests.get(url, headers=headers, timeout=10, allow_redirects=True)
-            response_time = int((time.time() - start_time) * 1000)  # Convert to ms
-            
-            # Check response
-            if response.status_code == 200:
-                # Check if it's a valid calendar or error page
-                if "That's an error" in response.text or "was not found" in response.text:
-                    return False, 404, response_time, "Calendar not found (404 in page content)"
-                return True, 200, response_time, "Calendar exists"
-            elif response.status_code == 404:
-                return False, 404, response_time, "Calendar not found (404)"
-            else:
-                return False, response.status_code, response_time, f"HTTP {response.status_code}"
-                
-        except requests.exceptions.Timeout:
-            return False, 0, 0, "Request timeout"
-        except requests.exceptions.ConnectionError:
-            return False, 0, 0, "Connection error"
-        except Exception as e:
-            return False, 0, 0, f"Error: {str(e)}"
-    
-    def validate_single_email(self, idx, email):
-        """Validate a single email address"""
-        # First validate email format
-        if not self.validate_email_format(email):
-            return idx, email, "INVALID", 0, 0, "Invalid email format"
-        
-        # Check calendar URL
-        valid, http_code, response_time, details = self.check_calendar_url(email)
-        
-        status = "VALID" if valid else "INVALID"
-        return idx, email, status, http_code, response_time, details
-    
     def validation_worker(self):
         """Main validation worker running in thread"""
         self.running = True
@@ -289,67 +310,56 @@ class CalendarEmailValidator:
         
         valid_count = 0
         invalid_count = 0
-        error_count = 0
         
         # Log start
         self.update_queue.put(('log', f"Starting validation of {self.total_emails} emails...", "INFO"))
         
+        journal = None
+        sink = None
+        self.streamed_to = None
         try:
-            max_workers = int(self.threads_var.get())
-            delay_ms = int(self.delay_var.get())
+            if self.stream_var.get().strip():
+                sink = open_sink(self.stream_var.get().strip(), RESULT_FIELDS)
+                self.streamed_to = self.stream_var.get().strip()
+                self.update_queue.put(('log', f"Streaming results to {self.streamed_to}", "INFO"))
+            journal = Journal(journal_path('calendar', self.email_file), resume=self.resume_var.get())
+            if len(journal):
+                self.update_queue.put(('log', f"Resuming: {len(journal)} emails already answered in {journal.path}", "INFO"))
+            
+            # Workers pace themselves through the validator's shared rate limiter
+            self.validator = CalendarValidator(
+                workers=int(self.threads_var.get()), rate=float(self.rate_var.get()),
+                burst=int(self.burst_var.get()), http2=self.http2_var.get(), adaptive=self.adaptive_var.get(),
+                on_concurrency=lambda n: self.update_queue.put(('concurrency', n)), journal=journal)
+            self.update_queue.put(('concurrency', self.validator.concurrency))
             
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = []
+            # Process results as they complete
+            for result in self.validator.run(self.emails, should_stop=lambda: not self.running):
+                # Update counts
+                if result[2] == "VALID":
+                    valid_count += 1
+                else:
+                    invalid_count += 1
                 
-                for idx, email in enumerate(self.emails, 1):
-                    if not self.running:
-                        break
-                    
-                    # Submit task to thread pool
-                    future = executor.submit(self.validate_single_email, idx, email)
-                    futures.append(future)
-                    
-                    # Small delay to avoid overwhelming
-                    if delay_ms > 0:
-                        time.sleep(delay_ms / 1000)
+                # Write to the output file as it arrives, or keep it for export
+                if sink:
+                    sink.write(result)
+                else:
+                    self.results.append(result)
                 
-                # Process results as they complete
-                for future in as_completed(futures):
-                    if not self.running:
-                        break
-                    
-                    try:
-                        idx, email, status, http_code, response_time, details = future.result()
-                        
-                        # Update counts
-                        if status == "VALID":
-                            valid_count += 1
-                        elif status == "INVALID":
-                            invalid_count += 1
-                        else:
-                            error_count += 1
-                        
-                        # Add to results
-                        self.results.append({
-                            'index': idx,
-                            'email': email,
-                            'status': status,
-                            'http_code': http_code,
-                            'response_time': response_time,
-                            'details': details
-                        })
-                        
-                        # Queue for GUI update
-                        self.update_queue.put(('result', idx, email, status, http_code, response_time, details))
-                        self.update_queue.put(('stats', valid_count, invalid_count, error_count))
-                        
-                    except Exception as e:
-                        self.update_queue.put(('log', f"Error processing email: {str(e)}", "ERROR"))
+                # Hand over to the GUI pump
+                self.pending_results.append(result)
                         
         except Exception as e:
             self.update_queue.put(('log', f"Validation error: {str(e)}", "ERROR"))
         finally:
             self.running = False
+            if self.validator:
+                self.validator.close()
+            if journal:
+                journal.close()
+            if sink:
+                sink.close()
             self.update_queue.put(('log', f"Validation completed! Valid: {valid_count}, Invalid: {invalid_count}", "INFO"))
             
             # Update button states
@@ -367,11 +377,12 @@ class CalendarEmailValidator:
             return
         
         # Clear previous results
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.tree.delete(*self.tree.get_children())
+        self.pending_results.clear()
         
         # Reset counters
         self.processed_count = 0
+        self.valid_count = self.invalid_count = self.error_count = 0
         self.results = []
         
         # Update UI
@@ -391,20 +402,18 @@ class CalendarEmailValidator:
         self.log_message("Stopping validation...", "INFO")
         self.stop_btn.config(state=tk.DISABLED)
     
-    def add_result(self, idx, email, status, http_code, response_time, details):
-        """Add result to treeview"""
-        tags = ()
-        if status == "VALID":
-            tags = ('valid',)
-        elif status == "INVALID":
-            tags = ('invalid',)
-        else:
-            tags = ('error',)
-        
-        self.tree.insert('', 'end', values=(
-            idx, email, status, http_code if http_code != 0 else "N/A", 
-            response_time if response_time != 0 else "N/A", details
-        ), tags=tags)
+    def add_results(self, batch):
+        """Add a batch of results to treeview, keeping the newest MAX_VISIBLE_ROWS rows"""
+        insert = self.tree.insert
+        for idx, email, status, http_code, response_time, details, _ in batch[-MAX_VISIBLE_ROWS:]:
+            insert('', 'end', values=(
+                idx, email, status, http_code if http_code != 0 else "N/A", 
+                response_time if response_time != 0 else "N/A", details
+            ), tags=(STATUS_TAGS.get(status, 'error'),))
+        
+        rows = self.tree.get_children()
+        if len(rows) > MAX_VISIBLE_ROWS:
+            self.tree.delete(*rows[:len(rows) - MAX_VISIBLE_ROWS])
     
     def update_progress(self):
         """Update progress bar"""
@@ -418,8 +427,27 @@ class CalendarEmailValidator:
         total = valid + invalid + error
         self.stats_text.set(f"✅ Valid: {valid} | ❌ Invalid: {invalid} | ⚠️ Error: {error} | 📊 Total: {total}")
     
+    def choose_stream_file(self):
+        """Pick the file results are streamed into during validation"""
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[
+                ("CSV files", "*.csv"),
+                ("JSON Lines", "*.jsonl"),
+                ("SQLite database", "*.db"),
+                ("Compressed CSV", "*.csv.gz"),
+                ("All files", "*.*")
+            ],
+            initialfile=f"calendar_validation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        )
+        if filename:
+            self.stream_var.set(filename)
+    
     def export_results(self):
-        """Export results to CSV file"""
+        """Export results to a CSV, JSONL or SQLite file (by extension)"""
+        if not self.results and self.streamed_to:
+            messagebox.showinfo("Export", f"Results were streamed to:\n\n{self.streamed_to}")
+            return
         if not self.results:
             messagebox.showwarning("Warning", "No results to export!")
             return
@@ -428,6 +456,8 @@ class CalendarEmailValidator:
             defaultextension=".csv",
             filetypes=[
                 ("CSV files", "*.csv"),
+                ("JSON Lines", "*.jsonl"),
+                ("SQLite database", "*.db"),
                 ("Text files", "*.txt"),
                 ("All files", "*.*")
             ],
@@ -436,21 +466,9 @@ class CalendarEmailValidator:
         
         if filename:
             try:
-                with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                    fieldnames = ['Index', 'Email', 'Status', 'HTTP_Code', 'Response_Time_ms', 'Details', 'Timestamp']
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    
-                    writer.writeheader()
-                    for result in self.results:
-                        writer.writerow({
-                            'Index': result['index'],
-                            'Email': result['email'],
-                            'Status': result['status'],
-                            'HTTP_Code': result['http_code'],
-                            'Response_Time_ms': result['response_time'],
-                            'Details': result['details'],
-                            'Timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        })
+                # Each row keeps the time its answer arrived
+                with open_sink(filename, RESULT_FIELDS) as sink:
+                    sink.write_many(self.results)
                 
                 self.log_message(f"Results exported to: {filename}", "INFO")
                 messagebox.showinfo("Success", f"Results exported successfully!\n\nFile: {filename}")
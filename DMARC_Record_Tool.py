@@ -1,7 +1,24 @@
+import argparse
+import asyncio
+import csv
+import json
+import dns.asyncresolver
+import dns.rdatatype
 import dns.resolver
+import itertools
+import random
+import struct
 import sys
+import time
+from collections import namedtuple
 from urllib.parse import urlparse
 
+from bbtools import dnscache
+
+# Selectors tried when looking for DKIM keys in bulk mode
+DKIM_SELECTORS = ('default', 'google', 'selector1', 'selector2', 'k1', 'k2',
+                  'dkim', 'mail', 's1', 's2', 'smtp', 'mx')
+
 def get_domain_from_url(url):
     """Extract domain from URL"""
     if not url.startswith(('http://', 'https://')):
@@ -16,40 +33,497 @@ def get_domain_from_url(url):
     
     return domain
 
-def check_dmarc_record(domain):
-    """Check if DMARC record exists for the domain"""
+def negative_ttl(exc):
+    """How long a NXDOMAIN/NoAnswer may be cached: min(SOA TTL, SOA MINIMUM) per RFC 2308"""
+    if isinstance(exc, dns.resolver.NXDOMAIN):
+        responses = exc.kwargs.get('responses', {}).values()
+    else:
+        responses = [exc.kwargs.get('response')]
+    for response in responses:
+        for rrset in getattr(response, 'authority', ()):
+            if rrset.rdtype == dns.rdatatype.SOA:
+                return min(rrset.ttl, rrset[0].minimum)
+    return 0  # no SOA: the answer must not be cached
+
+
+def txt_strings(answers):
+    """Decode TXT answers; long records are split into several strings, so join them back"""
+    return [b''.join(rdata.strings).decode('utf-8', 'replace') for rdata in answers]
+
+
+def resolve_txt(name, cache=None):
+    """Resolve TXT records for name, returning (records, error)"""
+    if cache:
+        hit = cache.get(name, 'TXT')
+        if hit:
+            return hit[1], None
     try:
-        # DMARC records are stored in _dmarc subdomain
-        dmarc_domain = f'_dmarc.{domain}'
-        
-        # Query TXT records for _dmarc.domain
-        answers = dns.resolver.resolve(dmarc_domain, 'TXT')
-        
-        dmarc_records = []
-        for rdata in answers:
-            for txt_string in rdata.strings:
-                txt_string = txt_string.decode('utf-8')
-                if txt_string.startswith('v=DMARC1'):
-                    dmarc_records.append(txt_string)
-        
-        return dmarc_records if dmarc_records else None
-        
-    except dns.resolver.NXDOMAIN:
-        return None  # No DMARC record found
-    except dns.resolver.NoAnswer:
-        return None  # No TXT records found
+        answers = dns.resolver.resolve(name, 'TXT')
+    except dns.resolver.NXDOMAIN as e:
+        return _store_negative(cache, name, dnscache.NXDOMAIN, e)
+    except dns.resolver.NoAnswer as e:
+        return _store_negative(cache, name, dnscache.NOANSWER, e)
     except dns.resolver.Timeout:
-        return "timeout"
+        return [], "timeout"
     except Exception as e:
-        return f"error: {str(e)}"
+        return [], f"error: {str(e)}"
+    return _store_answer(cache, name, answers), None
+
+
+def _store_answer(cache, name, answers):
+    records = txt_strings(answers)
+    if cache:
+        cache.put(name, 'TXT', dnscache.OK, records, answers.rrset.ttl)
+    return records
+
+
+def _store_negative(cache, name, status, exc):
+    if cache:
+        cache.put(name, 'TXT', status, [], negative_ttl(exc))
+    return [], None
+
+
+def check_dmarc_record(domain, cache=None):
+    """Check if DMARC record exists for the domain"""
+    # DMARC records are stored in _dmarc subdomain
+    records, error = resolve_txt(f'_dmarc.{domain}', cache)
+    if error:
+        return error
+    dmarc_records = [r for r in records if r.startswith('v=DMARC1')]
+    return dmarc_records if dmarc_records else None
+
+async def query_txt(resolver, name, limit, lifetime, cache=None):
+    """Resolve TXT records for name, returning (records, error)"""
+    if cache:
+        hit = cache.get(name, 'TXT')
+        if hit:
+            return hit[1], None
+    async with limit:
+        try:
+            answers = await resolver.resolve(name, 'TXT', lifetime=lifetime)
+        except dns.resolver.NXDOMAIN as e:
+            return _store_negative(cache, name, dnscache.NXDOMAIN, e)
+        except dns.resolver.NoAnswer as e:
+            return _store_negative(cache, name, dnscache.NOANSWER, e)
+        except dns.resolver.Timeout:
+            return [], "timeout"
+        except Exception as e:
+            return [], f"error: {str(e)}"
+    return _store_answer(cache, name, answers), None
+
+
+# ---------- Raw UDP query engine ----------
+TYPE_TXT = 16
+TYPE_SOA = 6
+FLAG_TC = 0x0200
+RCODE_NXDOMAIN = 3
+# EDNS0 OPT record advertising a 1232-byte UDP payload (DNS flag day 2020)
+EDNS_OPT = b'\x00' + struct.pack('!HHIH', 41, 1232, 0, 0)
+
+DNSAnswer = namedtuple('DNSAnswer', 'rcode records ttl negative_ttl')
+
+
+def encode_query(qid, question):
+    """Wire-format query with RD set, one question and an EDNS0 OPT record"""
+    return struct.pack('!HHHHHH', qid, 0x0100, 1, 0, 0, 1) + question + EDNS_OPT
+
+
+def encode_question(name, rdtype=TYPE_TXT):
+    out = bytearray()
+    for label in name.rstrip('.').split('.'):
+        raw = label.encode('ascii') if label.isascii() else label.encode('idna')
+        if not 0 < len(raw) < 64:
+            raise ValueError(f"invalid DNS name: {name!r}")
+        out.append(len(raw))
+        out += raw
+    out.append(0)
+    return bytes(out) + struct.pack('!HH', rdtype, 1)
+
+
+def _skip_name(buf, pos):
+    while True:
+        length = buf[pos]
+        if length == 0:
+            return pos + 1
+        if length >= 0xC0:  # compression pointer ends the name
+            return pos + 2
+        pos += length + 1
+
+
+def parse_answer(buf):
+    """Parse the parts of a response the DMARC audit needs: rcode, TXT strings,
+    the minimum answer TTL and the RFC 2308 negative TTL from an SOA"""
+    _, flags, qdcount, ancount, nscount, _ = struct.unpack_from('!HHHHHH', buf)
+    pos = 12
+    for _ in range(qdcount):
+        pos = _skip_name(buf, pos) + 4
+
+    records = []
+    ttl = None
+    for _ in range(ancount):
+        pos = _skip_name(buf, pos)
+        rdtype, _, rttl, rdlength = struct.unpack_from('!HHIH', buf, pos)
+        pos += 10
+        if rdtype == TYPE_TXT:
+            end, parts, p = pos + rdlength, [], pos
+            while p < end:
+                parts.append(buf[p + 1:p + 1 + buf[p]])
+                p += 1 + buf[p]
+            records.append(b''.join(parts).decode('utf-8', 'replace'))
+            ttl = rttl if ttl is None else min(ttl, rttl)
+        pos += rdlength
+
+    negative_ttl = 0
+    for _ in range(nscount):
+        pos = _skip_name(buf, pos)
+        rdtype, _, rttl, rdlength = struct.unpack_from('!HHIH', buf, pos)
+        pos += 10
+        if rdtype == TYPE_SOA:
+            p = _skip_name(buf, _skip_name(buf, pos))  # mname, rname
+            minimum = struct.unpack_from('!I', buf, p + 16)[0]
+            negative_ttl = min(rttl, minimum)
+        pos += rdlength
+    return DNSAnswer(flags & 0x000F, records, ttl or 0, negative_ttl)
+
+
+class _UDPSocket(asyncio.DatagramProtocol):
+    """One UDP socket; responses are matched to queries by ID and question"""
+
+    def __init__(self, servers):
+        self.servers = servers
+        self.pending = {}
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        if len(data) < 12 or addr[:2] not in self.servers:
+            return
+        entry = self.pending.get(int.from_bytes(data[:2], 'big'))
+        if entry is None:
+            return  # late answer to a query we already gave up on
+        question, future = entry
+        if not future.done() and data[12:12 + len(question)] == question:
+            future.set_result(data)
+
+    def error_received(self, exc):
+        pass
+
+
+class UDPQueryEngine:
+    """Pipelined DNS client: many queries in flight over a few UDP sockets.
+
+    Each query gets a random ID unique on its socket, is retransmitted with
+    exponential backoff (rotating through the nameservers) and falls back to
+    TCP when the answer comes back truncated. Retries are spaced so that all
+    attempts together fit within ``lifetime`` seconds.
+    """
+
+    def __init__(self, nameservers, port=53, max_in_flight=2000, lifetime=5.0, retries=3, sockets=None):
+        servers = [(ns, port) for ns in nameservers]
+        # All sockets share one address family; prefer IPv4 when both are configured
+        self.servers = [s for s in servers if ':' not in s[0]] or servers
+        self.max_in_flight = max_in_flight
+        self.retries = retries
+        self.initial_timeout = lifetime / (2 ** (retries + 1) - 1)
+        # Keep well clear of the 65536 IDs available per socket
+        self.n_sockets = sockets or max(2, max_in_flight // 16384 + 1)
+        self._sockets = []
+        self._next_socket = None
+        self._limit = None
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        servers = set(self.servers)
+        local = ('::', 0) if ':' in self.servers[0][0] else ('0.0.0.0', 0)
+        for _ in range(self.n_sockets):
+            _, sock = await loop.create_datagram_endpoint(lambda: _UDPSocket(servers), local_addr=local)
+            self._sockets.append(sock)
+        self._next_socket = itertools.cycle(self._sockets)
+        self._limit = asyncio.Semaphore(self.max_in_flight)
+
+    def close(self):
+        for sock in self._sockets:
+            sock.transport.close()
+        self._sockets = []
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    async def query(self, name, rdtype=TYPE_TXT):
+        """Resolve one name; returns a DNSAnswer or raises asyncio.TimeoutError"""
+        question = encode_question(name, rdtype)
+        async with self._limit:
+            sock = next(self._next_socket)
+            qid = random.getrandbits(16)
+            while qid in sock.pending:
+                qid = random.getrandbits(16)
+            wire = encode_query(qid, question)
+            future = asyncio.get_running_loop().create_future()
+            sock.pending[qid] = (question, future)
+            first = random.randrange(len(self.servers))
+            try:
+                timeout = self.initial_timeout
+                for attempt in range(self.retries + 1):
+                    server = self.servers[(first + attempt) % len(self.servers)]
+                    sock.transport.sendto(wire, server)
+                    await asyncio.wait((future,), timeout=timeout)
+                    if future.done():
+                        break
+                    timeout *= 2
+                else:
+                    raise asyncio.TimeoutError(name)
+            finally:
+                del sock.pending[qid]
+                future.cancel()
+
+        data = future.result()
+        if struct.unpack_from('!H', data, 2)[0] & FLAG_TC:
+            data = await self._query_tcp(wire, server, timeout)
+        return parse_answer(data)
+
+    async def _query_tcp(self, wire, server, timeout):
+        async def exchange():
+            reader, writer = await asyncio.open_connection(*server)
+            try:
+                writer.write(struct.pack('!H', len(wire)) + wire)
+                await writer.drain()
+                size = struct.unpack('!H', await reader.readexactly(2))[0]
+                return await reader.readexactly(size)
+            finally:
+                writer.close()
+        return await asyncio.wait_for(exchange(), timeout)
+
+
+async def udp_query_txt(engine, name, cache=None):
+    """Resolve TXT records for name through a UDPQueryEngine, returning (records, error)"""
+    if cache:
+        hit = cache.get(name, 'TXT')
+        if hit:
+            return hit[1], None
+    try:
+        answer = await engine.query(name)
+    except asyncio.TimeoutError:
+        return [], "timeout"
+    except Exception as e:
+        return [], f"error: {str(e)}"
+
+    if answer.rcode == RCODE_NXDOMAIN or (answer.rcode == 0 and not answer.records):
+        if cache:
+            status = dnscache.NXDOMAIN if answer.rcode else dnscache.NOANSWER
+            cache.put(name, 'TXT', status, [], answer.negative_ttl)
+        return [], None
+    if answer.rcode != 0:
+        return [], f"error: rcode {answer.rcode}"
+    if cache:
+        cache.put(name, 'TXT', dnscache.OK, answer.records, answer.ttl)
+    return answer.records, None
+
+
+async def audit_domain(lookup, domain, selectors, cache=None):
+    """Look up DMARC, SPF and DKIM records for one domain concurrently
+
+    ``lookup(name, cache)`` is a coroutine returning (records, error) for TXT
+    queries. The domain's cached answers are read and its new ones written
+    back in one batch each, in a worker thread, so SQLite never blocks the
+    event loop.
+    """
+    names = [f'_dmarc.{domain}', domain] + [f'{sel}._domainkey.{domain}' for sel in selectors]
+    batch = await asyncio.to_thread(cache.batch, names, 'TXT') if cache else None
+    answers = await asyncio.gather(*(lookup(name, batch) for name in names))
+    if batch:
+        await asyncio.to_thread(batch.commit)
+
+    (dmarc_txt, _), (spf_txt, _) = answers[0], answers[1]
+    dkim = [sel for sel, (records, _) in zip(selectors, answers[2:])
+            if any('v=DKIM1' in r or 'p=' in r for r in records)]
+    errors = sorted({f'{name}: {err}' for name, (_, err) in zip(names, answers) if err})
+    return {
+        'domain': domain,
+        'dmarc': next((r for r in dmarc_txt if r.startswith('v=DMARC1')), None),
+        'spf': next((r for r in spf_txt if r.startswith('v=spf1')), None),
+        'dkim_selectors': dkim,
+        'errors': errors,
+    }
+
+
+def make_async_resolver(nameservers=None, port=53):
+    resolver = dns.asyncresolver.Resolver(configure=not nameservers)
+    if nameservers:
+        resolver.nameservers = list(nameservers)
+    resolver.port = port
+    return resolver
+
+
+async def bulk_audit(domains, concurrency=200, selectors=DKIM_SELECTORS, nameservers=None,
+                     port=53, lifetime=5.0, cache=None, engine='resolver'):
+    """Audit an iterable of domains, yielding one result dict per domain as it completes.
+
+    At most ``concurrency`` DNS queries are in flight; domains are pulled
+    from the iterable lazily so huge inputs are never held in memory.
+    ``engine`` is 'resolver' (dnspython's asyncio resolver) or 'udp' (the
+    pipelined UDPQueryEngine).
+    """
+    udp = None
+    if engine == 'udp':
+        udp = UDPQueryEngine(nameservers or dns.resolver.get_default_resolver().nameservers,
+                             port, max_in_flight=concurrency, lifetime=lifetime)
+        await udp.start()
+        lookup = lambda name, batch: udp_query_txt(udp, name, batch)
+    else:
+        resolver = make_async_resolver(nameservers, port)
+        limit = asyncio.Semaphore(concurrency)
+        lookup = lambda name, batch: query_txt(resolver, name, limit, lifetime, batch)
+    results = asyncio.Queue(maxsize=concurrency)
+    domains = iter(domains)
+
+    async def worker():
+        for domain in domains:
+            await results.put(await audit_domain(lookup, domain, selectors, cache))
+
+    # Each domain fans out into several queries, so fewer domain workers
+    # than query slots are enough to keep the semaphore saturated.
+    n_workers = max(1, concurrency // (2 + len(selectors)) + 1)
+    async def run_workers():
+        workers = [asyncio.create_task(worker()) for _ in range(n_workers)]
+        try:
+            await asyncio.gather(*workers)
+        except Exception:
+            # Wake the consumer, which gets the error from the runner. (When
+            # the consumer cancels us instead, gather cancels the workers.)
+            for task in workers:
+                task.cancel()
+            await results.put(None)
+            raise
+        await results.put(None)
+
+    runner = asyncio.create_task(run_workers())
+    try:
+        while True:
+            result = await results.get()
+            if result is None:
+                break
+            yield result
+        await runner
+    finally:
+        if not runner.done():
+            runner.cancel()
+        if udp:
+            udp.close()
+
+
+def read_domains(stream):
+    """Yield normalized domains from a file of domains/URLs, one per line"""
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield get_domain_from_url(line)
+
+
+class ResultWriter:
+    """Write bulk results as JSONL or CSV"""
+    CSV_FIELDS = ['domain', 'dmarc', 'spf', 'dkim_selectors', 'errors']
+
+    def __init__(self, stream, fmt='jsonl'):
+        self.stream = stream
+        self.fmt = fmt
+        if fmt == 'csv':
+            self.writer = csv.DictWriter(stream, fieldnames=self.CSV_FIELDS)
+            self.writer.writeheader()
+
+    def write(self, result):
+        if self.fmt == 'csv':
+            row = dict(result)
+            row['dkim_selectors'] = ';'.join(result['dkim_selectors'])
+            row['errors'] = ';'.join(result['errors'])
+            self.writer.writerow(row)
+        else:
+            self.stream.write(json.dumps(result) + '\n')
+
+
+async def run_bulk(args):
+    source = sys.stdin if args.bulk == '-' else open(args.bulk, 'r', encoding='utf-8', errors='ignore')
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    fmt = args.format or ('csv' if args.output.endswith('.csv') else 'jsonl')
+    writer = ResultWriter(out, fmt)
+    selectors = tuple(args.selectors.split(',')) if args.selectors else DKIM_SELECTORS
+    cache = open_cache(args, dnscache.DEFAULT_PATH)
+
+    count = with_dmarc = 0
+    start = time.perf_counter()
+    results = bulk_audit(read_domains(source), args.concurrency, selectors,
+                         args.nameserver, args.port, args.timeout, cache, args.engine)
+    try:
+        async for result in results:
+            writer.write(result)
+            count += 1
+            with_dmarc += result['dmarc'] is not None
+    finally:
+        # Stop the workers and close the engine now, before the cache they use
+        await results.aclose()
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+        if cache:
+            cache.close()
+    elapsed = time.perf_counter() - start
+    print(f"[+] Audited {count} domains in {elapsed:.1f}s ({count / elapsed if elapsed else 0:.0f} domains/sec), "
+          f"{with_dmarc} with DMARC", file=sys.stderr)
+    if cache:
+        print(f"[+] DNS cache: {cache.hits} hits, {cache.misses} misses", file=sys.stderr)
+
+
+def open_cache(args, default=None):
+    """The DNS cache to use: --cache, else ``default`` (bulk mode), unless --no-cache"""
+    path = args.cache or default
+    if args.no_cache or not path:
+        return None
+    return dnscache.DNSCache(path, max_entries=args.cache_size)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="DMARC Record Checker")
+    parser.add_argument("domain", nargs="?", help="Website URL or domain to check")
+    parser.add_argument("-b", "--bulk", metavar="FILE",
+                        help="Audit DMARC/SPF/DKIM for every domain in FILE ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Bulk output file (.jsonl or .csv, default stdout)")
+    parser.add_argument("-f", "--format", choices=["jsonl", "csv"], help="Bulk output format")
+    parser.add_argument("-c", "--concurrency", type=int, default=200, help="Max DNS queries in flight")
+    parser.add_argument("-s", "--selectors", help="Comma-separated DKIM selectors to try")
+    parser.add_argument("-n", "--nameserver", action="append", help="Nameserver IP (repeatable)")
+    parser.add_argument("-p", "--port", type=int, default=53, help="Nameserver port")
+    parser.add_argument("-t", "--timeout", type=float, default=5.0, help="Per-query timeout in seconds")
+    parser.add_argument("-e", "--engine", choices=["resolver", "udp"], default="resolver",
+                        help="Bulk query engine: dnspython resolver or pipelined raw UDP")
+    parser.add_argument("--cache", metavar="PATH",
+                        help=f"DNS cache database (bulk mode default: {dnscache.DEFAULT_PATH}; "
+                             f"a single-domain check only uses a cache when this is given)")
+    parser.add_argument("--cache-size", type=int, default=500000, help="Max cached answers (LRU eviction)")
+    parser.add_argument("--no-cache", action="store_true", help="Always query the network")
+    return parser.parse_args(argv)
+
 
 def main():
+    args = parse_args()
+    if args.bulk:
+        try:
+            asyncio.run(run_bulk(args))
+        except BrokenPipeError:
+            pass  # output piped into head and the like
+        return
+
     print("DMARC Record Checker")
     print("===================")
     
-    if len(sys.argv) > 1:
+    if args.domain:
         # Get domain from command line argument
-        input_domain = sys.argv[1]
+        input_domain = args.domain
     else:
         # Interactive input
         input_domain = input("Enter website URL or domain: ").strip()
@@ -65,7 +539,12 @@ def main():
     print("Please wait...")
     
     # Check DMARC record
-    result = check_dmarc_record(domain)
+    cache = open_cache(args)
+    try:
+        result = check_dmarc_record(domain, cache)
+    finally:
+        if cache:
+            cache.close()
     
     print("\n" + "="*50)
     
@@ -1,82 +1,73 @@
 #!/usr/bin/env python3
 import sys
 import os
-import csv
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import requests
-from functools import partial
+from itertools import chain
+
+from bbtools.ratelimit import TokenBucket
+from bbtools.journal import Journal, journal_path
+from bbtools.orgscan import DEFAULT_TEMPLATE, FOUND_FIELDS, MAX_THREAD_WORKERS, OrgScanner, aiohttp
+from bbtools.sinks import open_sink
+from bbtools.wordlist import open_wordlist
 
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QMainWindow, QVBoxLayout, QHBoxLayout, QLabel,
-    QLineEdit, QPushButton, QTextEdit, QFileDialog, QProgressBar, QTableWidget,
-    QTableWidgetItem, QHeaderView, QSpinBox, QCheckBox, QMessageBox
+    QLineEdit, QPushButton, QTextEdit, QPlainTextEdit, QFileDialog, QProgressBar,
+    QSpinBox, QCheckBox, QMessageBox
 )
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
 
+from bbtools.qtmodels import ColumnTableModel, attach_filter, make_table_view
+
 # -------------------- Worker Thread --------------------
+# The scan engine lives in bbtools.orgscan (also usable headless:
+# python -m bbtools jira wordlist.txt); this thread only relays its
+# callbacks as Qt signals.
 class ScannerThread(QThread):
     progress = pyqtSignal(int)
-    found = pyqtSignal(str, int)
+    found = pyqtSignal(str, int, str)
     log = pyqtSignal(str)
+    concurrency = pyqtSignal(int)
     finished = pyqtSignal()
 
-    def __init__(self, words, url_template, workers=20, timeout=8, verify_ssl=True):
+    def __init__(self, words, url_template, workers=20, timeout=8, verify_ssl=True, use_async=True, total=None,
+                 rate_limiter=None, adaptive=False, journal=None, sink=None):
         super().__init__()
-        self.words = words
-        self.url_template = url_template
-        self.workers = workers
-        self.timeout = timeout
-        self.verify_ssl = verify_ssl
-        self._stop = False
+        self.sink = sink
+        self.scanner = OrgScanner(words, url_template, workers, timeout, verify_ssl, use_async, total,
+                                  rate_limiter, adaptive, on_progress=self.progress.emit,
+                                  on_found=self._found, on_log=self.log.emit,
+                                  on_concurrency=self.concurrency.emit, journal=journal)
 
     def stop(self):
-        self._stop = True
+        self.scanner.stop()
 
     def run(self):
-        total = len(self.words)
-        if total == 0:
-            self.log.emit('No words to test.')
-            self.finished.emit()
-            return
-
-        self.log.emit(f'Starting scan: {total} words with {self.workers} workers')
-        checked = 0
-
-        with ThreadPoolExecutor(max_workers=self.workers) as ex:
-            futures = {ex.submit(self._fetch, self.url_template.replace('ORG_NAME', w), w): w for w in self.words}
-            for fut in as_completed(futures):
-                if self._stop:
-                    break
-                word = futures[fut]
-                url = self.url_template.replace('ORG_NAME', word)
-                try:
-                    code = fut.result()
-                    checked += 1
-                    self.progress.emit(int(checked / total * 100))
-                    if code == 200:
-                        self.found.emit(url, code)
-                        self.log.emit(f'[FOUND 200] {url}')
-                    else:
-                        self.log.emit(f'[{code}] {url}')
-                except Exception as e:
-                    checked += 1
-                    self.progress.emit(int(checked / total * 100))
-                    self.log.emit(f'[ERROR] {url} -> {e}')
-        self.log.emit('Scan finished')
+        try:
+            self.scanner.run()
+        finally:
+            if self.scanner.journal is not None:
+                self.scanner.journal.close()
+            if self.sink is not None:
+                self.sink.close()
         self.finished.emit()
 
-    def _fetch(self, url, word):
-        r = requests.get(url, timeout=self.timeout, verify=self.verify_ssl, allow_redirects=True)
-        return r.status_code
+    def _found(self, url, code, stamp):
+        # Stream the hit here, as it arrives, not when the GUI gets to it.
+        row = (url, code, stamp)
+        if self.sink is not None:
+            self.sink.write(row)
+        self.found.emit(*row)
 
 # -------------------- Main Window --------------------
+RESULT_FILTERS = 'CSV Files (*.csv);;JSON Lines (*.jsonl);;SQLite (*.db);;Compressed (*.gz);;All Files (*)'
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle('Atlassian ORG_NAME Checker')
         self.setMinimumSize(950, 700)
         self._scanner = None
-        self._results = []
+        self.wordlist = None
         self._setup_ui()
         self._apply_professional_theme()
 
@@ -88,7 +79,7 @@ class MainWindow(QMainWindow):
 
         # URL template input
         tpl_label = QLabel('URL Template (use ORG_NAME placeholder)')
-        self.tpl_input = QLineEdit('https://ORG_NAME.atlassian.net/secure/ManageFilters.jspa')
+        self.tpl_input = QLineEdit(DEFAULT_TEMPLATE)
         layout.addWidget(tpl_label)
         layout.addWidget(self.tpl_input)
 
@@ -97,12 +88,14 @@ class MainWindow(QMainWindow):
         self.load_btn = QPushButton('Load Wordlist')
         self.load_btn.clicked.connect(self.load_wordlist)
         self.clear_btn = QPushButton('Clear Words')
-        self.clear_btn.clicked.connect(lambda: self.manual_text.clear())
+        self.clear_btn.clicked.connect(self.clear_words)
+        self.wordlist_label = QLabel('No wordlist loaded')
         wl_layout.addWidget(self.load_btn)
         wl_layout.addWidget(self.clear_btn)
+        wl_layout.addWidget(self.wordlist_label)
         layout.addLayout(wl_layout)
 
-        manual_label = QLabel('Manual Words (one per line)')
+        manual_label = QLabel('Manual Words (one per line, scanned before the loaded wordlist)')
         self.manual_text = QTextEdit()
         self.manual_text.setPlaceholderText('example\ncompany\nmyorg')
         layout.addWidget(manual_label)
@@ -110,29 +103,46 @@ class MainWindow(QMainWindow):
 
         # Controls layout
         controls_layout = QHBoxLayout()
-        self.workers_spin = QSpinBox(); self.workers_spin.setRange(1, 200); self.workers_spin.setValue(30)
+        self.workers_spin = QSpinBox(); self.workers_spin.setRange(1, 5000); self.workers_spin.setValue(30)
+        self.workers_spin.setToolTip(f'Concurrent requests (thread pool engine is capped at {MAX_THREAD_WORKERS})')
         self.timeout_spin = QSpinBox(); self.timeout_spin.setRange(1, 60); self.timeout_spin.setValue(8)
+        self.rate_spin = QSpinBox(); self.rate_spin.setRange(0, 10000); self.rate_spin.setValue(0); self.rate_spin.setSpecialValueText('Unlimited')
         self.verify_ssl_cb = QCheckBox('Verify SSL'); self.verify_ssl_cb.setChecked(True)
+        self.adaptive_cb = QCheckBox('Adaptive'); self.adaptive_cb.setToolTip('Grow concurrency while latency stays flat, back off on 429/5xx/timeouts (Workers is the ceiling)')
+        self.resume_cb = QCheckBox('Resume'); self.resume_cb.setToolTip('Skip URLs already answered by an earlier (interrupted) scan of this template')
+        self.async_cb = QCheckBox('Async engine'); self.async_cb.setChecked(aiohttp is not None); self.async_cb.setEnabled(aiohttp is not None)
         self.start_btn = QPushButton('Start Scan'); self.start_btn.clicked.connect(self.start_scan)
         self.stop_btn = QPushButton('Stop'); self.stop_btn.clicked.connect(self.stop_scan); self.stop_btn.setEnabled(False)
         controls_layout.addWidget(QLabel('Workers:')); controls_layout.addWidget(self.workers_spin)
         controls_layout.addWidget(QLabel('Timeout:')); controls_layout.addWidget(self.timeout_spin)
+        controls_layout.addWidget(QLabel('Rate (req/s):')); controls_layout.addWidget(self.rate_spin)
         controls_layout.addWidget(self.verify_ssl_cb)
+        controls_layout.addWidget(self.async_cb)
+        controls_layout.addWidget(self.adaptive_cb)
+        controls_layout.addWidget(self.resume_cb)
         controls_layout.addWidget(self.start_btn); controls_layout.addWidget(self.stop_btn)
         layout.addLayout(controls_layout)
 
         # Progress bar
+        progress_layout = QHBoxLayout()
         self.progress = QProgressBar(); self.progress.setValue(0)
-        layout.addWidget(self.progress)
+        self.concurrency_label = QLabel('Concurrency: -')
+        progress_layout.addWidget(self.progress); progress_layout.addWidget(self.concurrency_label)
+        layout.addLayout(progress_layout)
 
         # Results table
-        self.table = QTableWidget(0,2); self.table.setHorizontalHeaderLabels(['URL','Status'])
-        self.table.horizontalHeader().setSectionResizeMode(0,QHeaderView.Stretch)
-        self.table.horizontalHeader().setSectionResizeMode(1,QHeaderView.ResizeToContents)
+        self.results_model = ColumnTableModel(list(FOUND_FIELDS), int_columns=(1,))
+        self.table = make_table_view(self.results_model)
+        self.filter_input = QLineEdit(); self.filter_input.setPlaceholderText('Filter results...')
+        attach_filter(self.filter_input, self.results_model)
+        layout.addWidget(self.filter_input)
         layout.addWidget(self.table)
 
         # Save button
         save_layout = QHBoxLayout()
+        self.stream_input = QLineEdit(); self.stream_input.setPlaceholderText('Optional: stream hits to .csv / .jsonl / .db (add .gz to compress) as they are found')
+        self.stream_btn = QPushButton('Browse'); self.stream_btn.clicked.connect(self.choose_stream_file)
+        save_layout.addWidget(QLabel('Stream to:')); save_layout.addWidget(self.stream_input); save_layout.addWidget(self.stream_btn)
         self.save_btn = QPushButton('Save Results')
         self.save_btn.setEnabled(False)
         self.save_btn.clicked.connect(self.save_results)
@@ -141,32 +151,58 @@ class MainWindow(QMainWindow):
         layout.addLayout(save_layout)
 
         # Logs
-        self.log_box = QTextEdit(); self.log_box.setReadOnly(True); self.log_box.setMaximumHeight(180)
+        # One line per word: keep only the tail so long scans don't bog down the widget
+        self.log_box = QPlainTextEdit(); self.log_box.setReadOnly(True); self.log_box.setMaximumHeight(180); self.log_box.setMaximumBlockCount(5000)
         layout.addWidget(QLabel('Log')); layout.addWidget(self.log_box)
 
     def load_wordlist(self):
+        # The list is compiled once into the mmap format (bbtools.wordlist) and
+        # scanned from there; it never goes through the text widget.
         path, _ = QFileDialog.getOpenFileName(self, 'Open Wordlist', os.path.expanduser('~'))
         if path:
             try:
-                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read().strip()
-                self.manual_text.setPlainText(content)
-                self.log(f'Loaded wordlist: {path} ({len(content.splitlines())} lines)')
+                wordlist = open_wordlist(path)
             except Exception as e:
-                QMessageBox.critical(self, 'Error', f'Failed to load file: {e}')
+                QMessageBox.critical(self, 'Error', f'Failed to load file: {e}'); return
+            if self.wordlist is not None:
+                self.wordlist.close()
+            self.wordlist = wordlist
+            self.wordlist_label.setText(f'{os.path.basename(path)}: {len(wordlist)} words')
+            self.log(f'Loaded wordlist: {path} ({len(wordlist)} words)')
+
+    def clear_words(self):
+        self.manual_text.clear()
+        if self.wordlist is not None:
+            self.wordlist.close(); self.wordlist = None
+        self.wordlist_label.setText('No wordlist loaded')
 
     def start_scan(self):
-        words = [w.strip() for w in self.manual_text.toPlainText().splitlines() if w.strip()]
-        if not words:
+        manual = [w.strip() for w in self.manual_text.toPlainText().splitlines() if w.strip()]
+        loaded = self.wordlist if self.wordlist is not None else ()
+        words, total = chain(manual, loaded), len(manual) + len(loaded)
+        if not total:
             QMessageBox.warning(self,'No words','Provide words to scan.'); return
         url_template = self.tpl_input.text().strip();
         if 'ORG_NAME' not in url_template:
             QMessageBox.warning(self,'Template error','URL must contain ORG_NAME placeholder.'); return
-        self._results.clear(); self.table.setRowCount(0); self.progress.setValue(0); self.log_box.clear()
+        stream_path = self.stream_input.text().strip()
+        try:
+            sink = open_sink(stream_path, FOUND_FIELDS) if stream_path else None
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self,'Error',f'Cannot open {stream_path}: {e}'); return
+        self.results_model.clear(); self.progress.setValue(0); self.log_box.clear()
         self.start_btn.setEnabled(False); self.stop_btn.setEnabled(True); self.load_btn.setEnabled(False); self.clear_btn.setEnabled(False)
-        self._scanner = ScannerThread(words, url_template, self.workers_spin.value(), self.timeout_spin.value(), self.verify_ssl_cb.isChecked())
+        rate = self.rate_spin.value()
+        limiter = TokenBucket(rate, burst=rate) if rate else None
+        # Keyed by the word source too, so resuming with other words starts a new journal
+        wordlist_path = self.wordlist.path if self.wordlist is not None else ''
+        journal = Journal(journal_path('jira', url_template, wordlist_path, '\n'.join(manual)),
+                          resume=self.resume_cb.isChecked())
+        self._scanner = ScannerThread(words, url_template, self.workers_spin.value(), self.timeout_spin.value(), self.verify_ssl_cb.isChecked(), self.async_cb.isChecked(), total,
+                                      rate_limiter=limiter, adaptive=self.adaptive_cb.isChecked(), journal=journal, sink=sink)
         self._scanner.progress.connect(self.progress.setValue); self._scanner.found.connect(self.add_result)
         self._scanner.log.connect(self.log); self._scanner.finished.connect(self.scan_finished)
+        self._scanner.concurrency.connect(lambda n: self.concurrency_label.setText(f'Concurrency: {n}'))
         self._scanner.start()
 
     def stop_scan(self):
@@ -175,12 +211,8 @@ class MainWindow(QMainWindow):
             self.log('Stopping scan...')
             self.stop_btn.setEnabled(False)
 
-    def add_result(self,url,code):
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-        self.table.setItem(row,0,QTableWidgetItem(url))
-        self.table.setItem(row,1,QTableWidgetItem(str(code)))
-        self._results.append((url,code))
+    def add_result(self,url,code,stamp):
+        self.results_model.append((url,code,stamp))
         self.save_btn.setEnabled(True)
 
     def scan_finished(self):
@@ -191,25 +223,27 @@ class MainWindow(QMainWindow):
         self.clear_btn.setEnabled(True)
 
     def save_results(self):
-        if not self._results:
+        if not self.results_model.total_rows():
             QMessageBox.warning(self, 'No Data', 'No results to save.')
             return
-        path, _ = QFileDialog.getSaveFileName(self, 'Save Results As', os.path.expanduser('~'), 'CSV Files (*.csv)')
+        path, _ = QFileDialog.getSaveFileName(self, 'Save Results As', os.path.expanduser('~'), RESULT_FILTERS)
         if not path:
             return
         try:
-            with open(path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['URL', 'Status'])
-                for row in self._results:
-                    writer.writerow(row)
+            with open_sink(path, FOUND_FIELDS) as sink:
+                sink.write_many(self.results_model.rows())
             self.log(f'Saved results to: {path}')
             QMessageBox.information(self, 'Saved', f'Results successfully saved to:\n{path}')
         except Exception as e:
             QMessageBox.critical(self, 'Error', f'Failed to save file: {e}')
 
+    def choose_stream_file(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Stream Results To', os.path.expanduser('~'), RESULT_FILTERS)
+        if path:
+            self.stream_input.setText(path)
+
     def log(self,msg):
-        self.log_box.append(msg)
+        self.log_box.appendPlainText(msg)
 
     def _apply_professional_theme(self):
         qss = '''
@@ -217,11 +251,11 @@ class MainWindow(QMainWindow):
         QPushButton { background-color:#1DB954; border-radius:8px; padding:6px; color:white; font-weight:bold; }
         QPushButton:hover { background-color:#18a34a; }
         QPushButton:disabled { background-color:#2a2a2a; color:#7a7f86; }
-        QLineEdit,QTextEdit,QSpinBox,QTableWidget { background-color:#1c1c1c; border:1px solid #333; border-radius:6px; padding:4px; }
+        QLineEdit,QTextEdit,QPlainTextEdit,QSpinBox,QTableView { background-color:#1c1c1c; border:1px solid #333; border-radius:6px; padding:4px; }
         QHeaderView::section { background-color:#1a1a1a; padding:6px; border:none; }
         QProgressBar { background-color:#1c1c1c; border-radius:6px; text-align:center; }
         QProgressBar::chunk { background-color:#1DB954; }
-        QTableWidget { gridline-color:#2a2a2a; }
+        QTableView { gridline-color:#2a2a2a; }
         QLabel { color:#E0E0E0; font-weight:600; }
         QToolTip { background-color:#222; color:#ddd; }
         '''
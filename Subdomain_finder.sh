@@ -76,14 +76,6 @@ install_dependencies() {
         echo -e "${GREEN}[+] assetfinder is already installed${NC}"
     fi
     
-    # Install httprobe
-    if ! command_exists httprobe; then
-        echo -e "${YELLOW}[!] Installing httprobe...${NC}"
-        go install github.com/tomnomnom/httprobe@latest
-    else
-        echo -e "${GREEN}[+] httprobe is already installed${NC}"
-    fi
-    
     # Install waybackurls
     if ! command_exists waybackurls; then
         echo -e "${YELLOW}[!] Installing waybackurls...${NC}"
@@ -111,6 +103,14 @@ install_dependencies() {
     echo -e "${GREEN}[+] All dependencies checked and installed!${NC}"
 }
 
+# Directory of this script, so the bundled Python tools (bbtools) are importable
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# Run one of the bundled bbtools tools
+bbtools() {
+    PYTHONPATH="$SCRIPT_DIR${PYTHONPATH:+:$PYTHONPATH}" python3 -m bbtools "$@"
+}
+
 # Function to run subdomain enumeration
 run_enumeration() {
     local target=$1
@@ -118,32 +118,11 @@ run_enumeration() {
     
     echo -e "${BLUE}[*] Starting subdomain enumeration for: $target${NC}"
     
-    # Create temporary directory
-    mkdir -p "$output_dir/temp"
-    
-    # Run subfinder
-    echo -e "${YELLOW}[!] Running subfinder...${NC}"
-    subfinder -d "$target" -silent > "$output_dir/temp/subfinder.txt" 2>/dev/null
-    echo -e "${GREEN}[+] subfinder completed: $(wc -l < "$output_dir/temp/subfinder.txt") subdomains found${NC}"
-    
-    # Run assetfinder
-    echo -e "${YELLOW}[!] Running assetfinder...${NC}"
-    assetfinder "$target" > "$output_dir/temp/assetfinder.txt" 2>/dev/null
-    echo -e "${GREEN}[+] assetfinder completed: $(wc -l < "$output_dir/temp/assetfinder.txt") subdomains found${NC}"
-    
-    # Run findomain
-    echo -e "${YELLOW}[!] Running findomain...${NC}"
-    findomain -t "$target" --quiet > "$output_dir/temp/findomain.txt" 2>/dev/null
-    echo -e "${GREEN}[+] findomain completed: $(wc -l < "$output_dir/temp/findomain.txt") subdomains found${NC}"
-    
-    # Run sublist3r
-    echo -e "${YELLOW}[!] Running sublist3r...${NC}"
-    sublist3r -d "$target" -o "$output_dir/temp/sublist3r.txt" >/dev/null 2>&1
-    echo -e "${GREEN}[+] sublist3r completed: $(wc -l < "$output_dir/temp/sublist3r.txt") subdomains found${NC}"
-    
-    # Combine all results and remove duplicates
-    echo -e "${YELLOW}[!] Combining results and removing duplicates...${NC}"
-    cat "$output_dir/temp/"*.txt | sort -u > "$output_dir/all_subdomains.txt"
+    # subfinder, assetfinder, findomain and sublist3r run at the same time;
+    # their output is deduplicated as it streams in, so this takes as long
+    # as the slowest source rather than the sum of all four
+    echo -e "${YELLOW}[!] Running subfinder, assetfinder, findomain and sublist3r in parallel...${NC}"
+    bbtools subdomains "$target" -o "$output_dir/all_subdomains.txt" > /dev/null
     
     # Count total unique subdomains
     local total_count=$(wc -l < "$output_dir/all_subdomains.txt")
@@ -156,8 +135,8 @@ find_alive_subdomains() {
     
     echo -e "${YELLOW}[!] Probing for alive subdomains...${NC}"
     
-    # Use httprobe to find alive domains
-    cat "$output_dir/all_subdomains.txt" | httprobe -s -p https:443 | sed 's/https\?:\/\///' | tr -d ':443' | sort -u > "$output_dir/alive.txt"
+    # Probe https:443 on every host; status codes and page titles go to alive.csv
+    bbtools probe "$output_dir/all_subdomains.txt" -p https:443 --hosts-only -o "$output_dir/alive.csv" | sort -u > "$output_dir/alive.txt"
     
     local alive_count=$(wc -l < "$output_dir/alive.txt")
     echo -e "${GREEN}[+] Alive subdomains found: $alive_count${NC}"
@@ -178,41 +157,27 @@ run_waybackurls() {
     local wayback_dir="$output_dir/waybackurls"
     mkdir -p "$wayback_dir"
     
-    # Run waybackurls on the target domain
-    echo -e "${CYAN}[!] Running waybackurls on target domain...${NC}"
-    echo "$target" | waybackurls > "$wayback_dir/wayback_urls_raw.txt"
-    echo -e "${GREEN}[+] waybackurls completed: $(wc -l < "$wayback_dir/wayback_urls_raw.txt") URLs found${NC}"
-    
-    # Run waybackurls on all subdomains if available
-    if [ -f "$output_dir/all_subdomains.txt" ] && [ -s "$output_dir/all_subdomains.txt" ]; then
-        echo -e "${CYAN}[!] Running waybackurls on all subdomains...${NC}"
-        cat "$output_dir/all_subdomains.txt" | waybackurls > "$wayback_dir/wayback_subdomains_raw.txt"
-        echo -e "${GREEN}[+] waybackurls on subdomains completed: $(wc -l < "$wayback_dir/wayback_subdomains_raw.txt") URLs found${NC}"
-        
-        # Combine all wayback URLs
-        cat "$wayback_dir/wayback_urls_raw.txt" "$wayback_dir/wayback_subdomains_raw.txt" | sort -u > "$wayback_dir/all_wayback_urls.txt"
-    else
-        cp "$wayback_dir/wayback_urls_raw.txt" "$wayback_dir/all_wayback_urls.txt"
-    fi
+    # Run waybackurls on the target domain and all subdomains in one stream;
+    # URLs are deduplicated and their hosts extracted as they arrive
+    echo -e "${CYAN}[!] Running waybackurls on target domain and subdomains...${NC}"
+    { echo "$target"; [ -s "$output_dir/all_subdomains.txt" ] && cat "$output_dir/all_subdomains.txt"; } \
+        | waybackurls \
+        | bbtools wayback --urls "$wayback_dir/all_wayback_urls.txt" --hosts "$wayback_dir/wayback_domains.txt" > /dev/null
     
     local total_wayback=$(wc -l < "$wayback_dir/all_wayback_urls.txt")
     echo -e "${GREEN}[+] Total unique wayback URLs found: $total_wayback${NC}"
-    
-    # Extract domains from wayback URLs
-    echo -e "${CYAN}[!] Extracting domains from wayback URLs...${NC}"
-    cat "$wayback_dir/all_wayback_urls.txt" | sed -E 's|https?://([^/]+).*|\1|i' | sort -u > "$wayback_dir/wayback_domains.txt"
     echo -e "${GREEN}[+] Domains extracted: $(wc -l < "$wayback_dir/wayback_domains.txt")${NC}"
     
     # Find alive wayback domains
     echo -e "${CYAN}[!] Probing for alive wayback domains...${NC}"
-    cat "$wayback_dir/wayback_domains.txt" | httprobe -s -p https:443 | sed 's/https\?:\/\///' | tr -d ':443' | sort -u > "$wayback_dir/wayback_alive.txt"
+    bbtools probe "$wayback_dir/wayback_domains.txt" -p https:443 --hosts-only -o "$wayback_dir/wayback_alive.csv" | sort -u > "$wayback_dir/wayback_alive.txt"
     
     local alive_wayback=$(wc -l < "$wayback_dir/wayback_alive.txt")
     echo -e "${GREEN}[+] Alive wayback domains found: $alive_wayback${NC}"
     
     # Find unique wayback domains that weren't in original subdomain list
     if [ -f "$output_dir/all_subdomains.txt" ]; then
-        comm -13 <(sort "$output_dir/all_subdomains.txt") <(sort "$wayback_dir/wayback_alive.txt") > "$wayback_dir/wayback_unique_domains.txt"
+        bbtools wayback "$wayback_dir/wayback_alive.txt" --known "$output_dir/all_subdomains.txt" -q > "$wayback_dir/wayback_unique_domains.txt"
         local unique_count=$(wc -l < "$wayback_dir/wayback_unique_domains.txt")
         echo -e "${GREEN}[+] Unique wayback domains (not in original list): $unique_count${NC}"
     fi
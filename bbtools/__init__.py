@@ -0,0 +1,8 @@
+"""Shared, GUI-free building blocks for the Bug_Bounty_Tools scripts.
+
+The tool engines live in submodules (orgscan, gcal, calendar_links, emails)
+that are imported on demand; ``python -m bbtools <tool>`` runs them without
+a GUI. qtmodels is the only module that needs PyQt5. Nothing is imported
+here, so a tool only pays for the modules it uses: import from the
+submodules (bbtools.ratelimit, bbtools.concurrency, ...) directly.
+"""
@@ -0,0 +1,54 @@
+"""Headless entry point: python -m bbtools <tool> [options]
+
+Only the chosen tool's engine is imported; the GUI toolkits (PyQt5,
+Tkinter) are loaded only when --gui is given, which runs the original
+script instead (for the tools that have one).
+"""
+import importlib
+import os
+import runpy
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# tool -> (engine module, GUI script, description)
+TOOLS = {
+    'jira': ('bbtools.orgscan', 'Jira_Dashboard_Bug_Tool.py', 'Atlassian ORG_NAME checker'),
+    'calendar': ('bbtools.gcal', 'Calendar_validator.py', 'Google Calendar email validator'),
+    'links': ('bbtools.calendar_links', 'Calendar_bug.py', 'Calendar embed link generator'),
+    'emails': ('bbtools.emails', 'clean_email_list_generator.py', 'Email address extractor'),
+    'subdomains': ('bbtools.subenum', None, 'Parallel subdomain enumeration (subfinder, assetfinder, ...)'),
+    'probe': ('bbtools.probe', None, 'HTTP(S) liveness prober (httprobe replacement)'),
+    'wayback': ('bbtools.wayback', None, 'Streaming waybackurls dedup and host extraction'),
+    'dirs': ('bbtools.dirbrute', None, 'Directory brute-force with soft-404 detection'),
+    'wordlist': ('bbtools.wordlist', None, 'Compile wordlists into the indexed mmap format'),
+    'emailgen': ('bbtools.emailgen', None, 'Corporate email pattern generator'),
+    'seen': ('bbtools.bloom', None, 'Pass through lines not seen in earlier runs (persistent Bloom filter)'),
+}
+
+
+def usage():
+    lines = ['usage: python -m bbtools <tool> [options]',
+             '       python -m bbtools <tool> --gui', '', 'tools:']
+    lines += [f'  {name:10s} {description}' for name, (_, _, description) in TOOLS.items()]
+    lines += ['', "Run 'python -m bbtools <tool> -h' for a tool's options."]
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in TOOLS:
+        print(usage(), file=sys.stderr if argv and argv[0] not in ('-h', '--help') else sys.stdout)
+        return 0 if argv and argv[0] in ('-h', '--help') else 2
+
+    module, script, _ = TOOLS[argv[0]]
+    if '--gui' in argv[1:] and script:
+        path = os.path.join(ROOT, script)
+        sys.argv = [path]
+        runpy.run_path(path, run_name='__main__')
+        return 0
+    return importlib.import_module(module).main(argv[1:])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
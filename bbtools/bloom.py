@@ -0,0 +1,229 @@
+"""Persistent Bloom filter: remembers which strings earlier runs already handled, in a fixed-size mmapped file.
+
+File layout (little-endian): a 64-byte header (magic b'BBBF', format
+version, hash count k, bit count m, items added, capacity, target
+false-positive rate) followed by the m-bit array. A key's k bit positions
+are the little-endian 32-bit words (64-bit once m exceeds 2**32) of its
+blake2b digest, modulo m, so a file gives the same answers in every
+process and on every machine.
+"""
+import argparse
+import math
+import mmap
+import os
+import struct
+import sys
+from hashlib import blake2b
+
+MAGIC = b'BBBF'
+VERSION = 1
+HEADER = struct.Struct('<4sIIQQQd')
+DATA_OFFSET = 64
+DEFAULT_CAPACITY = 10_000_000
+DEFAULT_FP_RATE = 0.001
+# blake2b's largest digest, which bounds the hash count.
+MAX_DIGEST = 64
+# The header's item counter is written back every this many additions.
+COUNT_EVERY = 4096
+
+
+def optimal_size(capacity, fp_rate):
+    """(bits, hashes) for ``capacity`` items at false-positive rate ``fp_rate``.
+
+    The hash count is capped by what one digest holds (16, or 8 for
+    filters over 512 MiB), which only matters for rates below ~1e-5.
+    """
+    if capacity < 1 or not 0 < fp_rate < 1:
+        raise ValueError('capacity must be >= 1 and fp_rate between 0 and 1')
+    bits = math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)
+    bits = (bits + 63) // 64 * 64
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, min(hashes, MAX_DIGEST // _word_size(bits))
+
+
+def _word_size(bits):
+    return 4 if bits <= 1 << 32 else 8
+
+
+class BloomFilter:
+    """Set-like filter of strings with no false negatives and about ``fp_rate`` false positives.
+
+    With a path, the filter lives in that file: an existing file is opened
+    as is (capacity and fp_rate only apply to new files) and every add()
+    goes straight to the shared mapping, so it persists without an explicit
+    save; close() (or flush()) syncs it to disk. Without a path the filter
+    is in memory only. Past ``capacity`` items the false-positive rate
+    rises (see estimated_fp_rate()). Not safe for concurrent writers.
+    """
+
+    def __init__(self, path=None, capacity=DEFAULT_CAPACITY, fp_rate=DEFAULT_FP_RATE):
+        self.path = path
+        self._map = None
+        if path is not None and os.path.exists(path) and os.path.getsize(path):
+            with open(path, 'r+b') as f:
+                self._map = mmap.mmap(f.fileno(), 0)
+            magic, version, self.hashes, self.bits, self._count, self.capacity, self.fp_rate = \
+                HEADER.unpack_from(self._map)
+            if magic != MAGIC or version != VERSION or len(self._map) < DATA_OFFSET + self.bits // 8:
+                self._map.close()
+                raise ValueError(f'{path}: not a filter file (version {VERSION})')
+            self._data = self._map
+        else:
+            self.bits, self.hashes = optimal_size(capacity, fp_rate)
+            self.capacity, self.fp_rate, self._count = capacity, fp_rate, 0
+            size = DATA_OFFSET + self.bits // 8
+            if path is None:
+                self._data = bytearray(size)
+            else:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                with open(path, 'w+b') as f:
+                    f.truncate(size)  # sparse: blocks are only allocated as bits get set
+                    self._map = mmap.mmap(f.fileno(), 0)
+                self._data = self._map
+                self._write_header()
+        self._bytes = memoryview(self._data)[DATA_OFFSET:]
+        self._unsaved = 0
+        width = _word_size(self.bits)
+        self._digest_size = self.hashes * width
+        self._words = struct.Struct(f'<{self.hashes}{"I" if width == 4 else "Q"}').unpack
+        self._mod = self.bits.__rmod__
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        """Items added (counting a false positive on add() as already present)."""
+        return self._count
+
+    def _positions(self, key):
+        digest = blake2b(key.encode('utf-8', 'surrogatepass'), digest_size=self._digest_size).digest()
+        return map(self._mod, self._words(digest))
+
+    def __contains__(self, key):
+        data = self._bytes
+        for p in self._positions(key):
+            if not data[p >> 3] >> (p & 7) & 1:
+                return False
+        return True
+
+    def add(self, key):
+        """Add key; True if it was (definitely) not in the filter before."""
+        data = self._bytes
+        new = False
+        for p in self._positions(key):
+            i = p >> 3
+            bit = 1 << (p & 7)
+            byte = data[i]
+            if not byte & bit:
+                data[i] = byte | bit
+                new = True
+        if new:
+            self._count += 1
+            self._unsaved += 1
+            if self._unsaved >= COUNT_EVERY:
+                self._write_header()
+        return new
+
+    def update(self, keys):
+        """Add every key; returns how many were new."""
+        return sum(map(self.add, keys))
+
+    def estimated_fp_rate(self):
+        """False-positive rate at the current fill."""
+        return (1 - math.exp(-self.hashes * self._count / self.bits)) ** self.hashes
+
+    def _write_header(self):
+        HEADER.pack_into(self._data, 0, MAGIC, VERSION, self.hashes, self.bits, self._count, self.capacity,
+                         self.fp_rate)
+        self._unsaved = 0
+
+    def flush(self):
+        if self._map is not None:
+            self._write_header()
+            self._map.flush()
+
+    def close(self):
+        if self._map is None or self._map.closed:
+            return
+        self.flush()
+        self._bytes.release()
+        self._map.close()
+
+
+def open_history(path, capacity=DEFAULT_CAPACITY, fp_rate=DEFAULT_FP_RATE):
+    """The filter behind a tool's --history option, or None when no path is given."""
+    return BloomFilter(path, capacity, fp_rate) if path else None
+
+
+def close_history(history, label='items'):
+    """Close a --history filter, warning on stderr once it is past its capacity."""
+    if history is None:
+        return
+    if len(history) > history.capacity:
+        print(f'[!] {history.path} holds {len(history)} {label}, over its capacity of {history.capacity}: '
+              f'false-positive rate is now ~{history.estimated_fp_rate():.2%}; start a bigger one '
+              f'(python -m bbtools seen NEW --capacity N)', file=sys.stderr)
+    history.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bbtools seen',
+                                     description='Pass through only lines not seen in earlier runs, and remember them')
+    parser.add_argument('filter', help='Filter file (created if missing)')
+    parser.add_argument('inputs', nargs='*', help='Files to read (default: stdin)')
+    parser.add_argument('--capacity', type=int, default=DEFAULT_CAPACITY,
+                        help=f'Items a new filter is sized for (default: {DEFAULT_CAPACITY})')
+    parser.add_argument('--fp-rate', type=float, default=DEFAULT_FP_RATE,
+                        help=f'Target false-positive rate of a new filter (default: {DEFAULT_FP_RATE})')
+    parser.add_argument('-n', '--dry-run', action='store_true', help='Do not add the new lines to the filter')
+    parser.add_argument('--stats', action='store_true', help='Only print the filter size and fill')
+    args = parser.parse_args(argv)
+    if args.stats and not os.path.exists(args.filter):
+        parser.error(f'{args.filter} does not exist')
+    try:
+        optimal_size(args.capacity, args.fp_rate)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+def _lines(paths):
+    if not paths:
+        yield from sys.stdin
+        return
+    for path in paths:
+        with open(path, encoding='utf-8', errors='surrogateescape') as f:
+            yield from f
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    history = BloomFilter(args.filter, args.capacity, args.fp_rate)
+    if args.stats:
+        print(f'{args.filter}: {len(history)} items, capacity {history.capacity}, {history.bits} bits '
+              f'({history.bits // 8:,} bytes), {history.hashes} hashes, '
+              f'false-positive rate ~{history.estimated_fp_rate():.4%} (target {history.fp_rate:.4%})')
+        history.close()
+        return
+    seen = new = 0
+    try:
+        for line in _lines(args.inputs):
+            item = line.strip()
+            if not item:
+                continue
+            seen += 1
+            if item not in history if args.dry_run else history.add(item):
+                new += 1
+                sys.stdout.write(item + '\n')
+    except BrokenPipeError:
+        pass
+    finally:
+        close_history(history)
+    print(f'[+] {new} new out of {seen} lines', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""Adaptive concurrency control for the scanners."""
+import asyncio
+import threading
+import time
+from collections import deque
+
+# Responses that mean the target (or something in front of it) is shedding load.
+BACKOFF_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class AIMDController:
+    """Additive-increase / multiplicative-decrease limit on requests in flight.
+
+    Workers take a slot before each request and report how it went. Every
+    ``window`` successful samples the p95 latency is compared with the
+    best p95 seen so far: while it stays within ``tolerance`` of that
+    baseline the limit grows by ``increase``. A 429/5xx-overload response or
+    a timeout cuts the limit by ``decrease`` (at most once per ``cooldown``
+    seconds, so one burst of errors is a single back-off).
+
+    ``on_change(limit)`` is called from whichever thread changed the limit.
+    """
+
+    def __init__(self, initial=10, minimum=1, maximum=200, increase=1, decrease=0.5,
+                 window=20, tolerance=1.5, cooldown=1.0, on_change=None):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.increase = increase
+        self.decrease = decrease
+        self.window = window
+        self.tolerance = tolerance
+        self.cooldown = cooldown
+        self.on_change = on_change
+        self._limit = min(max(initial, self.minimum), self.maximum)
+        self._in_flight = 0
+        self._samples = []
+        self._baseline = None
+        self._last_backoff = 0.0
+        self._cond = threading.Condition()
+        self._async_waiters = deque()
+
+    @property
+    def limit(self):
+        return self._limit
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    # ---- slots ----
+    def acquire(self):
+        """Block until a request may start."""
+        with self._cond:
+            while self._in_flight >= self._limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    async def acquire_async(self):
+        """Like acquire(), but waits on the event loop instead of blocking."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._in_flight < self._limit:
+                    self._in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            await waiter
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._wake()
+
+    def slot(self, timeout_errors=()):
+        """Context manager (sync or async) that holds a slot for one request.
+
+        Set ``.status`` on the returned object to the HTTP status; the
+        latency is measured automatically. Exceptions matching
+        ``timeout_errors`` are recorded as timeouts, any other exception is
+        not recorded at all.
+        """
+        return _Slot(self, timeout_errors)
+
+    def _wake(self):
+        # Called with the lock held.
+        self._cond.notify_all()
+        free = self._limit - self._in_flight
+        while free > 0 and self._async_waiters:
+            loop, waiter = self._async_waiters.popleft()
+            loop.call_soon_threadsafe(_resolve, waiter)
+            free -= 1
+
+    # ---- feedback ----
+    def record(self, latency_ms, status=None, timed_out=False):
+        """Feed back the outcome of one request."""
+        changed = None
+        with self._cond:
+            if timed_out or status in BACKOFF_STATUSES:
+                now = time.monotonic()
+                if now - self._last_backoff >= self.cooldown:
+                    self._last_backoff = now
+                    self._samples.clear()
+                    changed = self._set_limit(int(self._limit * self.decrease))
+            else:
+                self._samples.append(latency_ms)
+                if len(self._samples) >= self.window:
+                    changed = self._evaluate_window()
+        if changed is not None and self.on_change:
+            self.on_change(changed)
+
+    def _evaluate_window(self):
+        samples = sorted(self._samples)
+        self._samples.clear()
+        p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+        if self._baseline is None or p95 < self._baseline:
+            self._baseline = p95
+        if p95 <= self._baseline * self.tolerance:
+            return self._set_limit(self._limit + self.increase)
+        # Latency is climbing: hold the limit and let the baseline drift so
+        # a permanently slower target does not freeze growth forever.
+        self._baseline = 0.9 * self._baseline + 0.1 * p95
+        return None
+
+    def _set_limit(self, limit):
+        limit = min(max(limit, self.minimum), self.maximum)
+        if limit == self._limit:
+            return None
+        self._limit = limit
+        self._wake()
+        return limit
+
+
+class _Slot:
+    def __init__(self, controller, timeout_errors):
+        self.controller = controller
+        self.timeout_errors = timeout_errors
+        self.status = None
+        self._start = 0.0
+
+    def __enter__(self):
+        self.controller.acquire()
+        self._start = time.monotonic()
+        return self
+
+    async def __aenter__(self):
+        await self.controller.acquire_async()
+        self._start = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        latency_ms = (time.monotonic() - self._start) * 1000
+        self.controller.release()
+        timed_out = exc_type is not None and issubclass(exc_type, self.timeout_errors)
+        if exc_type is None or timed_out:
+            self.controller.record(latency_ms, self.status, timed_out)
+        return False
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+def _resolve(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,248 @@
+"""String dedup with bounded memory, for streams too big for a Python set.
+
+sorted_unique() and the run-file helpers sort and compare the strings
+themselves, so they are exact. SpillingSet keeps 64-bit fingerprints
+instead: two distinct strings can share one, and the later string is then
+taken for a duplicate and dropped. Over n distinct strings that happens
+with probability ~n**2/2**65, about 3e-8 for a million and 3e-4 for a
+hundred million.
+"""
+import heapq
+import mmap
+import os
+import shutil
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import groupby, islice
+from operator import itemgetter
+
+# Fingerprints written per chunk while merging runs.
+MERGE_CHUNK = 1 << 16
+MASK64 = (1 << 64) - 1
+# Read buffer per run file during a k-way merge.
+RUN_BUFFER = 1 << 16
+# Items taken from the input at a time by sorted_unique().
+SORT_BATCH = 4096
+# Most run files merged at once; more are merged in several passes.
+MERGE_FAN_IN = 64
+
+
+class _Run:
+    """A sorted array of fingerprints in a file, searched in place through mmap."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.keys = memoryview(self._map).cast('Q')
+
+    def close(self):
+        self.keys.release()
+        self._map.close()
+        os.remove(self.path)
+
+
+class SpillingSet:
+    """Set of strings that keeps at most ``max_items`` fingerprints in memory.
+
+    Keys are stored as 64-bit fingerprints (the string's hash, which is
+    seeded per process, so run files are private to one set; n keys
+    collide with probability ~n**2/2**65). When the in-memory
+    part fills up it is written to a sorted run file; membership checks go
+    to memory first and then binary-search each run through mmap, so a
+    lookup stays O(log n) and memory stays flat however many keys arrive.
+    More than ``max_runs`` runs are merged into one. Run files live in a
+    private temporary directory that close() removes.
+    """
+
+    def __init__(self, max_items=1_000_000, directory=None, max_runs=4):
+        self.max_items = max_items
+        self.max_runs = max_runs
+        self._dir = tempfile.mkdtemp(prefix='bbtools-dedup-', dir=directory)
+        self._memory = set()
+        self._runs = []
+        self._keys = []
+        self._spills = 0
+        self._len = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, key):
+        d = hash(key) & MASK64
+        return d in self._memory or bool(self._keys) and self._in_runs(d)
+
+    def add(self, key):
+        """Add key; True if it was not in the set yet."""
+        d = hash(key) & MASK64
+        if d in self._memory or self._keys and self._in_runs(d):
+            return False
+        self._memory.add(d)
+        self._len += 1
+        if len(self._memory) >= self.max_items:
+            self._spill()
+        return True
+
+    def _in_runs(self, d):
+        for keys in self._keys:
+            i = bisect_left(keys, d)
+            if i < len(keys) and keys[i] == d:
+                return True
+        return False
+
+    def _path(self):
+        self._spills += 1
+        return os.path.join(self._dir, f'run-{self._spills:05d}.bin')
+
+    def _spill(self):
+        path = self._path()
+        with open(path, 'wb') as f:
+            array('Q', sorted(self._memory)).tofile(f)
+        self._memory.clear()
+        self._runs.append(_Run(path))
+        if len(self._runs) > self.max_runs:
+            self._merge()
+        self._keys = [run.keys for run in self._runs]
+
+    def _merge(self):
+        # Every fingerprint is stored once, so the merge needs no dedup.
+        path = self._path()
+        with open(path, 'wb') as f:
+            chunk = array('Q')
+            for d in heapq.merge(*(run.keys for run in self._runs)):
+                chunk.append(d)
+                if len(chunk) >= MERGE_CHUNK:
+                    chunk.tofile(f)
+                    chunk = array('Q')
+            chunk.tofile(f)
+        for run in self._runs:
+            run.close()
+        self._runs = [_Run(path)]
+
+    def close(self):
+        for run in self._runs:
+            run.close()
+        self._runs = []
+        self._keys = []
+        self._memory.clear()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+
+def write_run(items, path):
+    """Write the distinct strings of items to path, sorted, one per line; returns how many."""
+    items = sorted(items if isinstance(items, (set, frozenset)) else set(items))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(item + '\n' for item in items)
+    return len(items)
+
+
+def merge_runs(paths):
+    """Yield the strings of sorted run files in order, each once (a k-way merge).
+
+    Runs are merged a block at a time rather than line by line: every line
+    up to the smallest last line among the runs' read buffers can be
+    emitted, so those lines are sorted together (timsort merges the
+    presorted pieces in near-linear time) and no line equal to that bound
+    is left in any buffer.
+    """
+    files = [open(path, encoding='utf-8') for path in paths]
+    strip = itemgetter(slice(None, -1))
+    try:
+        active = [(f, []) for f in files]
+        while active:
+            for f, buf in active:
+                if not buf:
+                    buf += f.readlines(RUN_BUFFER)
+            active = [(f, buf) for f, buf in active if buf]
+            if not active:
+                break
+            bound = min(buf[-1] for _, buf in active)
+            block = []
+            for _, buf in active:
+                i = bisect_right(buf, bound)
+                block += buf[:i]
+                del buf[:i]
+            block.sort()
+            # groupby() drops the duplicates; the slice strips the newline.
+            yield from map(strip, map(itemgetter(0), groupby(block)))
+    finally:
+        for f in files:
+            f.close()
+
+
+def _distinct_chunks(items, max_items):
+    """Yield sets of ``max_items`` distinct strings from consecutive items; only the last can be smaller."""
+    items = iter(items)
+    buffer = set()
+    while True:
+        batch = list(islice(items, min(SORT_BATCH, max_items - len(buffer))))
+        if not batch:
+            break
+        buffer.update(batch)
+        if len(buffer) >= max_items:
+            yield buffer
+            buffer = set()
+    if buffer:
+        yield buffer
+
+
+def write_runs(items, directory, max_items=1_000_000, prefix='run'):
+    """Write items to sorted, distinct run files of up to ``max_items`` strings in directory; returns their paths."""
+    paths = []
+    for chunk in _distinct_chunks(items, max_items):
+        paths.append(os.path.join(directory, f'{prefix}-{len(paths):05d}.txt'))
+        write_run(chunk, paths[-1])
+        chunk.clear()
+    return paths
+
+
+def reduce_runs(paths, directory, fan_in=MERGE_FAN_IN):
+    """Merge groups of ``fan_in`` runs into new runs (removing the inputs) until at most fan_in are left."""
+    level = 0
+    while len(paths) > fan_in:
+        merged = []
+        for i in range(0, len(paths), fan_in):
+            group = paths[i:i + fan_in]
+            if len(group) == 1:
+                merged += group
+                continue
+            merged.append(os.path.join(directory, f'merge{level}-{len(merged):05d}.txt'))
+            with open(merged[-1], 'w', encoding='utf-8') as f:
+                f.writelines(line + '\n' for line in merge_runs(group))
+            for path in group:
+                os.remove(path)
+        paths = merged
+        level += 1
+    return paths
+
+
+def sorted_unique(items, max_items=1_000_000, directory=None):
+    """Yield the distinct strings of items in sorted order, holding at most ``max_items`` in memory.
+
+    An external sort: every ``max_items`` strings are sorted and written to
+    a run file, and the runs are merged at the end. Input that fits in
+    memory never touches the disk. Strings must not contain newlines.
+    """
+    runs = []
+    tmp = None
+    try:
+        for chunk in _distinct_chunks(items, max_items):
+            if not runs and len(chunk) < max_items:
+                yield from sorted(chunk)
+                return
+            if tmp is None:
+                tmp = tempfile.mkdtemp(prefix='bbtools-sort-', dir=directory)
+            runs.append(os.path.join(tmp, f'run-{len(runs):05d}.txt'))
+            write_run(chunk, runs[-1])
+            chunk.clear()
+        yield from merge_runs(reduce_runs(runs, tmp))
+    finally:
+        if tmp is not None:
+            shutil.rmtree(tmp, ignore_errors=True)
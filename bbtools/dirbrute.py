@@ -0,0 +1,352 @@
+"""Content discovery engine: brute-force paths under a base URL with the bundled Web_Directory_list wordlists."""
+import argparse
+import asyncio
+import secrets
+import sys
+import time
+from collections import Counter, deque
+from urllib.parse import quote, urljoin
+
+try:
+    import aiohttp  # HTTP/1.1 keep-alive engine
+except ImportError:
+    aiohttp = None
+
+try:
+    import httpx  # HTTP/2 engine (needs httpx[http2]); also the HTTP/1.1 fallback
+except ImportError:
+    httpx = None
+
+from .ratelimit import TokenBucket
+from .sinks import open_sinks, timestamp
+from .wordlist import WORDLISTS, open_wordlist
+
+DEFAULT_STATUSES = (200, 204, 301, 302, 307, 308, 401, 403, 405)
+REDIRECTS = (301, 302, 303, 307, 308)
+# Columns of a hit in every export.
+HIT_FIELDS = ('URL', 'Status', 'Size', 'Redirect', 'Timestamp')
+# Hits of one directory sharing a signature beyond this are treated as a soft-404 page.
+CLUSTER_LIMIT = 25
+# Characters left unescaped in words; '%' keeps pre-encoded entries intact.
+SAFE_CHARS = "/:@!$&'()*+,;=-._~%"
+# Concurrent streams per HTTP/2 connection (servers commonly allow 100-128).
+STREAMS_PER_CONNECTION = 100
+
+
+def expand_words(words, extensions=()):
+    """Yield every word plus word.ext for each extension, for words without an extension of their own."""
+    for word in words:
+        yield word
+        if extensions and not word.endswith('/') and '.' not in word.rsplit('/', 1)[-1]:
+            for ext in extensions:
+                yield f'{word}.{ext}'
+
+
+def signature(status, body, location, word):
+    """Response signature with the requested word blanked out, so error pages that echo the path still match."""
+    for token in {word, quote(word, SAFE_CHARS)}:
+        body = body.replace(token.encode('utf-8', 'ignore'), b'')
+        location = location.replace(token, '')
+    return status, location, len(body), hash(body)
+
+
+class SoftNotFound:
+    """What a directory answers for paths that cannot exist (wildcard and soft-404 responses).
+
+    Signatures are grouped by (status, normalized Location). A response
+    matches when its body hash is known, or when its length falls in the
+    range seen for that group widened by the spread of that range, which
+    absorbs pages with a changing timestamp or token.
+    """
+
+    def __init__(self):
+        self._groups = {}
+
+    def __bool__(self):
+        return bool(self._groups)
+
+    def add(self, sig):
+        status, location, length, digest = sig
+        group = self._groups.setdefault((status, location), [length, length, set()])
+        group[0] = min(group[0], length)
+        group[1] = max(group[1], length)
+        group[2].add(digest)
+
+    def matches(self, sig):
+        status, location, length, digest = sig
+        group = self._groups.get((status, location))
+        if group is None:
+            return False
+        low, high, digests = group
+        slack = high - low
+        return digest in digests or low - slack <= length <= high + slack
+
+
+class _AiohttpClient:
+    def __init__(self, concurrency, timeout, verify, headers):
+        connector = aiohttp.TCPConnector(limit=concurrency, ssl=None if verify else False, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(connector=connector, headers=headers,
+                                             timeout=aiohttp.ClientTimeout(total=timeout))
+        self.errors = (aiohttp.ClientError, asyncio.TimeoutError, OSError)
+
+    async def get(self, url):
+        async with self.session.get(url, allow_redirects=False) as r:
+            return r.status, await r.read(), r.headers.get('Location', '')
+
+    async def close(self):
+        await self.session.close()
+
+
+class _HttpxClient:
+    def __init__(self, concurrency, timeout, verify, headers, http2, cleartext):
+        # Cleartext HTTP/2 (h2c) has no ALPN to negotiate it, so it needs prior knowledge.
+        connections = -(-concurrency // STREAMS_PER_CONNECTION) if http2 else concurrency
+        self.client = httpx.AsyncClient(http1=not (http2 and cleartext), http2=http2, verify=verify,
+                                        headers=headers, timeout=timeout,
+                                        limits=httpx.Limits(max_connections=connections,
+                                                            max_keepalive_connections=connections))
+        self.errors = (httpx.HTTPError, asyncio.TimeoutError, OSError)
+
+    async def get(self, url):
+        r = await self.client.get(url)
+        return r.status_code, r.content, r.headers.get('Location', '')
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class DirScanner:
+    """Request base_url + word for every word (plus extensions) and yield the hits.
+
+    Before each directory is scanned, a few random paths are requested to
+    learn its soft-404 behaviour (SoftNotFound); responses matching it are
+    dropped. Within a directory, more than CLUSTER_LIMIT hits with the same
+    signature are treated the same way from then on. Redirects are not
+    followed; a redirect to the same path plus '/' (or a hit on a word
+    ending in '/') marks a directory, which is scanned in turn up to
+    ``max_depth`` levels below the base URL.
+
+    HTTP/1.1 uses an aiohttp keep-alive pool of ``concurrency`` connections
+    (httpx if aiohttp is missing); http2=True multiplexes the same number of
+    requests over a few HTTP/2 connections through httpx.
+    """
+
+    def __init__(self, base_url, words, extensions=(), concurrency=50, timeout=10, verify=True, http2=False,
+                 statuses=DEFAULT_STATUSES, max_depth=0, rate_limiter=None, headers=None, on_log=None):
+        self.base_url = base_url if base_url.endswith('/') else base_url + '/'
+        self.words = words
+        self.extensions = tuple(extensions)
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.verify = verify
+        self.http2 = http2
+        self.statuses = frozenset(statuses)
+        self.max_depth = max_depth
+        self.rate_limiter = rate_limiter
+        self.headers = headers or {'User-Agent': 'Mozilla/5.0'}
+        self.on_log = on_log or (lambda message: None)
+        self.stats = Counter()
+        self._stop = False
+
+    def stop(self):
+        self._stop = True
+
+    def _client(self):
+        if self.http2 or aiohttp is None:
+            if httpx is None:
+                raise RuntimeError('aiohttp or httpx is required' if not self.http2 else 'HTTP/2 needs httpx[http2]')
+            return _HttpxClient(self.concurrency, self.timeout, self.verify, self.headers, self.http2,
+                                self.base_url.startswith('http://'))
+        return _AiohttpClient(self.concurrency, self.timeout, self.verify, self.headers)
+
+    async def run(self):
+        """Async generator of hits (see HIT_FIELDS), as they are found."""
+        client = self._client()
+        pending = deque([(self.base_url, 0)])
+        queued = {self.base_url}
+        try:
+            while pending and not self._stop:
+                base, depth = pending.popleft()
+                baseline = await self._baseline(client, base)
+                scan = self._scan(client, base, baseline)
+                try:
+                    async for hit, directory in scan:
+                        yield hit
+                        if directory and depth < self.max_depth and directory not in queued:
+                            queued.add(directory)
+                            pending.append((directory, depth + 1))
+                            self.on_log(f'Queued directory {directory}')
+                finally:
+                    await scan.aclose()  # stop its workers before the client goes
+        finally:
+            await client.close()
+
+    async def _fetch(self, client, url):
+        if self.rate_limiter:
+            await self.rate_limiter.acquire_async()
+        self.stats['requests'] += 1
+        try:
+            return await client.get(url)
+        except client.errors as e:
+            self.stats['errors'] += 1
+            self.on_log(f'[ERROR] {url} -> {str(e) or type(e).__name__}')
+            return None
+
+    async def _baseline(self, client, base):
+        baseline = SoftNotFound()
+        token = secrets.token_hex(12)
+        probes = [token, token + '/', 'a' + token[:8]] + [f'{token}.{ext}' for ext in self.extensions[:3]]
+        for word in probes:
+            response = await self._fetch(client, base + word)
+            if response and response[0] in self.statuses:
+                baseline.add(signature(response[0], response[1], response[2], word))
+        if baseline:
+            self.on_log(f'{base}: soft-404 responses detected, filtering them')
+        return baseline
+
+    async def _scan(self, client, base, baseline):
+        results = asyncio.Queue(maxsize=self.concurrency)
+        words = expand_words(self.words, self.extensions)
+        clusters = Counter()
+
+        async def worker():
+            for word in words:
+                if self._stop:
+                    return
+                url = base + quote(word.lstrip('/'), SAFE_CHARS)
+                response = await self._fetch(client, url)
+                if response is None:
+                    continue
+                status, body, location = response
+                if status not in self.statuses:
+                    continue
+                sig = signature(status, body, location, word)
+                if baseline.matches(sig):
+                    self.stats['filtered'] += 1
+                    continue
+                clusters[sig] += 1
+                if clusters[sig] > CLUSTER_LIMIT:
+                    self.on_log(f'{base}: {CLUSTER_LIMIT} hits with the same {status} response, '
+                                f'treating it as a soft-404 page')
+                    baseline.add(sig)
+                    self.stats['filtered'] += 1
+                    continue
+                self.stats['hits'] += 1
+                await results.put(((url, status, len(body), location, timestamp()),
+                                   self._directory(url, status, location)))
+
+        async def run_workers():
+            workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+            try:
+                await asyncio.gather(*workers)
+            except Exception:
+                # Wake the consumer, which gets the error from the runner. (When
+                # the consumer cancels us instead, gather cancels the workers.)
+                for task in workers:
+                    task.cancel()
+                await results.put(None)
+                raise
+            await results.put(None)
+
+        runner = asyncio.create_task(run_workers())
+        try:
+            while True:
+                item = await results.get()
+                if item is None:
+                    break
+                yield item
+            await runner
+        finally:
+            if not runner.done():
+                runner.cancel()
+
+    @staticmethod
+    def _directory(url, status, location):
+        """URL of the directory a hit reveals, or None."""
+        if status in REDIRECTS and location and urljoin(url, location).split('?', 1)[0] == url + '/':
+            return url + '/'
+        if url.endswith('/') and status in (200, 401, 403):
+            return url
+        return None
+
+
+def parse_list(value, cast=str):
+    return [cast(v.strip().lstrip('.')) for v in value.split(',') if v.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bbtools dirs',
+                                     description='Directory and file brute-force with soft-404 detection')
+    parser.add_argument('url', help='Base URL, e.g. https://example.com/app/')
+    parser.add_argument('-w', '--wordlist', action='append', default=[],
+                        help=f'Wordlist path or bundled list ({", ".join(WORDLISTS)}), repeatable (default: raft)')
+    parser.add_argument('-x', '--extensions', type=parse_list, default=[],
+                        help='Comma-separated extensions to try on words without one, e.g. php,bak')
+    parser.add_argument('-c', '--concurrency', type=int, default=50, help='Requests in flight (default: 50)')
+    parser.add_argument('-t', '--timeout', type=float, default=10, help='Request timeout in seconds (default: 10)')
+    parser.add_argument('-r', '--recursion-depth', type=int, default=0,
+                        help='Scan found directories down to this many levels (default: 0)')
+    parser.add_argument('-s', '--status', type=lambda v: parse_list(v, int), default=list(DEFAULT_STATUSES),
+                        help=f'Status codes to report (default: {",".join(map(str, DEFAULT_STATUSES))})')
+    parser.add_argument('--http2', action='store_true', help='Multiplex requests over HTTP/2 (needs httpx[http2])')
+    parser.add_argument('--rate', type=float, default=0, help='Max requests per second (default: unlimited)')
+    parser.add_argument('-H', '--header', action='append', default=[], help="Extra header 'Name: value' (repeatable)")
+    parser.add_argument('-k', '--insecure', action='store_true', help='Do not verify TLS certificates')
+    parser.add_argument('-o', '--output', action='append', default=[],
+                        help='Stream hits to .csv, .jsonl or .db, add .gz to compress (repeatable)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Show status, size and redirects; log to stderr')
+    args = parser.parse_args(argv)
+    if not args.url.startswith(('http://', 'https://')):
+        parser.error('URL must start with http:// or https://')
+    for header in args.header:
+        if ':' not in header:
+            parser.error(f'bad header {header!r}, expected "Name: value"')
+    if args.http2 and httpx is None:
+        parser.error('--http2 needs httpx[http2]')
+    if aiohttp is None and httpx is None:
+        parser.error('aiohttp or httpx is required')
+    return args
+
+
+async def run(args):
+    words = open_wordlist(*(args.wordlist or ['raft']))
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    for header in args.header:
+        name, value = header.split(':', 1)
+        headers[name.strip()] = value.strip()
+    log = (lambda message: print(f'[*] {message}', file=sys.stderr, flush=True)) if args.verbose else None
+    scanner = DirScanner(args.url, words, args.extensions, args.concurrency, args.timeout, not args.insecure,
+                         args.http2, args.status, args.recursion_depth,
+                         TokenBucket(args.rate, burst=max(1, int(args.rate))) if args.rate > 0 else None,
+                         headers, log)
+    sink = open_sinks(args.output, HIT_FIELDS)
+    start = time.monotonic()
+    try:
+        async for hit in scanner.run():
+            url, status, size, location = hit[:4]
+            if args.verbose:
+                print(f'{status} {size:>8} {url}' + (f' -> {location}' if location else ''), flush=True)
+            else:
+                print(url, flush=True)
+            if sink:
+                sink.write(hit)
+    finally:
+        if sink:
+            sink.close()
+        elapsed = time.monotonic() - start
+        stats = scanner.stats
+        print(f'[+] {stats["hits"]} hits, {stats["filtered"]} soft-404s filtered, {stats["errors"]} errors; '
+              f'{stats["requests"]} requests in {elapsed:.1f}s ({stats["requests"] / max(elapsed, 1e-9):,.0f} req/s)',
+              file=sys.stderr)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""Persistent DNS answer cache shared across runs."""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'bug_bounty_tools', 'dns_cache.sqlite3')
+
+# Answer states stored in the cache. Lookup errors and timeouts are never cached.
+OK = 'ok'
+NXDOMAIN = 'nxdomain'
+NOANSWER = 'noanswer'
+
+
+class DNSCache:
+    """TTL-aware DNS cache in SQLite, keyed by (qname, rdtype).
+
+    Positive answers live for the record TTL; negative answers (NXDOMAIN,
+    NODATA) for the TTL the caller derives from the SOA, as in RFC 2308.
+    Entries are evicted least-recently-used first once the table grows past
+    ``max_entries``. Writes are committed in batches of ``commit_every``, so
+    call close() (or use the cache as a context manager) when done.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_entries=500000, commit_every=500):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.max_entries = max_entries
+        self.commit_every = commit_every
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('''CREATE TABLE IF NOT EXISTS answers (
+            qname TEXT NOT NULL,
+            rdtype TEXT NOT NULL,
+            status TEXT NOT NULL,
+            records TEXT NOT NULL,
+            expires REAL NOT NULL,
+            last_used REAL NOT NULL,
+            PRIMARY KEY (qname, rdtype))''')
+        self._db.execute('CREATE INDEX IF NOT EXISTS answers_last_used ON answers (last_used)')
+        self._db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, qname, rdtype):
+        """Return (status, records) for a live entry, or None on a miss."""
+        with self._lock:
+            return self._get(qname, rdtype, time.time())
+
+    def get_many(self, qnames, rdtype):
+        """{qname: (status, records)} for the live entries among qnames, under one lock."""
+        now = time.time()
+        with self._lock:
+            hits = {qname: self._get(qname, rdtype, now) for qname in qnames}
+        return {qname: hit for qname, hit in hits.items() if hit is not None}
+
+    def put(self, qname, rdtype, status, records, ttl):
+        """Store an answer for ``ttl`` seconds (non-positive TTLs are not cached)."""
+        self.put_many([(qname, rdtype, status, records, ttl)])
+
+    def put_many(self, answers):
+        """put() every (qname, rdtype, status, records, ttl) in answers, under one lock."""
+        now = time.time()
+        with self._lock:
+            for qname, rdtype, status, records, ttl in answers:
+                if ttl > 0:
+                    self._db.execute('INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?)',
+                                     (_normalize(qname), rdtype, status, json.dumps(records), now + ttl, now))
+                    self._wrote()
+
+    def batch(self, qnames, rdtype):
+        """A CacheBatch prefetched with the live entries among qnames."""
+        return CacheBatch(self, self.get_many(qnames, rdtype), rdtype)
+
+    def evict(self):
+        """Drop expired entries, then the least recently used beyond max_entries."""
+        with self._lock:
+            self._evict()
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._evict()
+            self._db.commit()
+            self._db.close()
+
+    def _get(self, qname, rdtype, now):
+        key = (_normalize(qname), rdtype)
+        row = self._db.execute('SELECT status, records, expires FROM answers WHERE qname=? AND rdtype=?',
+                               key).fetchone()
+        if row is None or row[2] <= now:
+            if row is not None:
+                self._db.execute('DELETE FROM answers WHERE qname=? AND rdtype=?', key)
+                self._wrote()
+            self.misses += 1
+            return None
+        self._db.execute('UPDATE answers SET last_used=? WHERE qname=? AND rdtype=?', (now,) + key)
+        self._wrote()
+        self.hits += 1
+        return row[0], json.loads(row[1])
+
+    def _wrote(self):
+        self._writes += 1
+        if self._writes % self.commit_every == 0:
+            if self._writes % (self.commit_every * 20) == 0:
+                self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        self._db.execute('DELETE FROM answers WHERE expires <= ?', (time.time(),))
+        (count,) = self._db.execute('SELECT COUNT(*) FROM answers').fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._db.execute('DELETE FROM answers WHERE rowid IN '
+                             '(SELECT rowid FROM answers ORDER BY last_used LIMIT ?)', (excess,))
+
+
+class CacheBatch:
+    """In-memory stand-in for a DNSCache over one group of lookups.
+
+    get() answers from the entries prefetched by DNSCache.batch() and put()
+    only buffers, so lookups running on an event loop never touch SQLite;
+    commit() then writes the buffered answers back in one go. Both the
+    prefetch and commit() block, so run them in a worker thread.
+    """
+
+    def __init__(self, cache, entries, rdtype):
+        self.cache = cache
+        self._entries = entries
+        self._rdtype = rdtype
+        self._pending = []
+
+    def get(self, qname, rdtype):
+        return self._entries.get(qname) if rdtype == self._rdtype else None
+
+    def put(self, qname, rdtype, status, records, ttl):
+        self._pending.append((qname, rdtype, status, records, ttl))
+
+    def commit(self):
+        if self._pending:
+            self.cache.put_many(self._pending)
+            self._pending = []
+
+
+def _normalize(qname):
+    return str(qname).rstrip('.').lower()
@@ -0,0 +1,421 @@
+"""Corporate email pattern generation (headless core of email_generator.py).
+
+Candidates are generated lazily from a stream of names, for any number of
+domains and user-defined patterns, and deduplicated with bounded memory.
+"""
+import argparse
+import io
+import os
+import re
+import shutil
+import string
+import sys
+import tempfile
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import chain
+
+try:
+    from unidecode import unidecode
+except ImportError:  # optional: scripts outside the built-in table are dropped without it
+    unidecode = None
+
+from .bloom import close_history, open_history
+from .dedup import SpillingSet, merge_runs, reduce_runs, sorted_unique, write_runs
+from .emails import RANGE_SIZE, split_ranges
+
+# Pattern fields: first/middle/last name and their initials.
+FIELDS = ('first', 'middle', 'last', 'f', 'm', 'l')
+# The patterns email_generator.py has always produced.
+DEFAULT_PATTERNS = (
+    '{first}', '{last}', '{first}.{last}', '{first}{last}', '{f}{last}',
+    '{first}{l}', '{first}_{last}', '{first}-{last}', '{f}.{last}', '{first}.{l}',
+)
+# Smallest byte range of the names file given to a worker with --jobs.
+MIN_RANGE = 64 * 1024
+DOMAIN_RE = re.compile(r'^[a-z0-9](?:[a-z0-9-]{0,62}\.)+[a-z0-9-]{2,63}$')
+
+# Letters NFKD does not reduce to ASCII, plus Greek and Cyrillic, applied to
+# casefolded text before decomposition (so e.g. 'й' is not read as 'и').
+TRANSLITERATION = str.maketrans({
+    'æ': 'ae', 'œ': 'oe', 'ø': 'o', 'đ': 'd', 'ð': 'd', 'þ': 'th', 'ł': 'l', 'ı': 'i', 'ħ': 'h',
+    'ŀ': 'l', 'ŧ': 't', 'ŋ': 'ng', 'ĸ': 'k', 'ſ': 's',
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'ґ': 'g', 'д': 'd', 'е': 'e', 'ё': 'e', 'є': 'ye', 'ж': 'zh',
+    'з': 'z', 'и': 'i', 'і': 'i', 'ї': 'yi', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o',
+    'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ў': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch',
+    'ш': 'sh', 'щ': 'shch', 'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+    'α': 'a', 'β': 'v', 'γ': 'g', 'δ': 'd', 'ε': 'e', 'ζ': 'z', 'η': 'i', 'θ': 'th', 'ι': 'i', 'κ': 'k',
+    'λ': 'l', 'μ': 'm', 'ν': 'n', 'ξ': 'x', 'ο': 'o', 'π': 'p', 'ρ': 'r', 'σ': 's', 'ς': 's', 'τ': 't',
+    'υ': 'u', 'φ': 'f', 'χ': 'ch', 'ψ': 'ps', 'ω': 'o',
+})
+NON_LETTERS_RE = re.compile(r'[^a-z]+')
+# Folded tokens dropped from the ends of a name, and surname particles
+# kept with the surname ('van der Berg' -> 'vanderberg').
+TITLES = frozenset({'mr', 'mrs', 'ms', 'miss', 'mx', 'dr', 'prof', 'sir'})
+SUFFIXES = frozenset({'jr', 'sr', 'ii', 'iii', 'iv', 'phd', 'md', 'esq', 'mba'})
+PARTICLES = frozenset({'al', 'bin', 'da', 'dal', 'de', 'dei', 'del', 'della', 'der', 'des', 'di', 'dos', 'du',
+                       'el', 'la', 'le', 'st', 'ten', 'ter', 'van', 'von'})
+# Distinct tokens remembered by fold_token(); rosters repeat names a lot.
+TOKEN_CACHE = 1 << 16
+
+
+@lru_cache(maxsize=TOKEN_CACHE)
+def fold_token(token):
+    """ASCII letters of one name token: 'José' -> 'jose', 'Müller' -> 'muller', 'Ирина' -> 'irina'."""
+    text = unicodedata.normalize('NFKD', token.casefold().translate(TRANSLITERATION))
+    if not text.isascii():
+        # Again for letters that carried an accent ('ώ' -> 'ω' -> 'o').
+        text = ''.join(c for c in text if not unicodedata.combining(c)).translate(TRANSLITERATION)
+        if unidecode is not None and not text.isascii():
+            text = unidecode(text).lower()
+    return NON_LETTERS_RE.sub('', text)
+
+
+def _clean_tokens(text):
+    """Folded tokens of text, without empty ones, trailing suffixes and leading titles."""
+    tokens = list(filter(None, map(fold_token, text.split())))
+    while tokens and tokens[-1] in SUFFIXES:
+        tokens.pop()
+    while len(tokens) > 1 and tokens[0] in TITLES:
+        del tokens[0]
+    return tokens
+
+
+def split_name(name: str):
+    """Normalize a name into (first, middle, last); (None, None, None) if nothing is left.
+
+    Tokens are transliterated to ASCII letters and titles and suffixes
+    (Dr, Jr, III, ...) are dropped. 'Last, First Middle' is read as such,
+    with every surname word kept; otherwise surname particles stay with
+    the last word ('van der Berg' -> 'vanderberg'). Only the first middle
+    name is kept, and a single word is a first name.
+    """
+    if ',' in name:
+        parts = [_clean_tokens(part) for part in name.split(',')]
+        parts = [tokens for tokens in parts if tokens]
+        if len(parts) == 2:
+            surname, given = parts
+            return given[0], given[1] if len(given) > 1 else '', ''.join(surname)
+        tokens = [t for tokens in parts for t in tokens]
+    else:
+        tokens = _clean_tokens(name)
+
+    if len(tokens) == 0:
+        return None, None, None
+    if len(tokens) == 1:
+        return tokens[0], '', ''
+
+    start = len(tokens) - 1
+    while start > 1 and tokens[start - 1] in PARTICLES:
+        start -= 1
+    return tokens[0], tokens[1] if start > 1 else '', ''.join(tokens[start:])
+
+
+def clean_name(name: str):
+    """Normalize and split name."""
+    first, _, last = split_name(name)
+    return first, last
+
+
+def generate_patterns(first, last, domain):
+    """Generate common corporate email patterns."""
+    emails = set()
+
+    if not first:
+        return emails
+
+    # If no last name
+    if not last:
+        emails.add(f"{first}@{domain}")
+        return emails
+
+    fi = first[0]
+    li = last[0]
+
+    patterns = [
+        f"{first}@{domain}",
+        f"{last}@{domain}",
+        f"{first}.{last}@{domain}",
+        f"{first}{last}@{domain}",
+        f"{fi}{last}@{domain}",
+        f"{first}{li}@{domain}",
+        f"{first}_{last}@{domain}",
+        f"{first}-{last}@{domain}",
+        f"{fi}.{last}@{domain}",
+        f"{first}.{li}@{domain}",
+    ]
+
+    emails.update(patterns)
+    return emails
+
+
+def parse_pattern(pattern):
+    """Split a pattern such as '{f}.{last}' into (literal, field) pairs; field is None after the last literal.
+
+    A pattern without '@' gets '@{domain}' appended; '{domain}' may also be
+    placed explicitly. Raises ValueError for unknown fields or bad syntax.
+    """
+    if '@' not in pattern:
+        pattern += '@{domain}'
+    parts = []
+    try:
+        parsed = list(string.Formatter().parse(pattern))
+    except ValueError as e:
+        raise ValueError(f'bad pattern {pattern!r}: {e}') from None
+    for literal, field, spec, conversion in parsed:
+        if field is not None and (field not in FIELDS + ('domain',) or spec or conversion):
+            raise ValueError(f'bad pattern {pattern!r}: unknown field {{{field}}} '
+                             f'(use {", ".join("{" + f + "}" for f in FIELDS + ("domain",))})')
+        parts.append((literal, field))
+    return parts
+
+
+def compile_patterns(patterns, domains):
+    """Compile patterns x domains into one function (first, middle, last) -> list of candidates.
+
+    The patterns are turned into Python source once, so generating a
+    name's candidates is a single call with plain string concatenation.
+    As with generate_patterns(), a pattern is skipped for a name that lacks
+    a field it uses (e.g. '{first}.{last}' for a single-word name).
+    """
+    full, without_middle, first_only = [], [], []
+    for pattern in patterns:
+        parts = parse_pattern(pattern)
+        uses_last = any(field in ('last', 'l') for _, field in parts)
+        uses_middle = any(field in ('middle', 'm') for _, field in parts)
+        for domain in domains:
+            terms = []
+            for literal, field in parts:
+                if field == 'domain':
+                    literal, field = literal + domain, None
+                if literal:
+                    terms.append(repr(literal))
+                if field:
+                    terms.append(field)
+            expression = ' + '.join(terms) or "''"
+            full.append(expression)
+            if not uses_middle:
+                without_middle.append(expression)
+                if not uses_last:
+                    first_only.append(expression)
+    # split_name() only finds a middle name when there is a last name.
+    source = (
+        'def generate(first, middle, last):\n'
+        '    f = first[:1]\n'
+        '    if last:\n'
+        '        l = last[:1]\n'
+        '        if middle:\n'
+        '            m = middle[:1]\n'
+        f'            return [{", ".join(full)}]\n'
+        f'        return [{", ".join(without_middle)}]\n'
+        f'    return [{", ".join(first_only)}]\n'
+    )
+    namespace = {}
+    exec(compile(source, '<email patterns>', 'exec'), namespace)
+    return namespace['generate']
+
+
+def iter_batches(lines, patterns=DEFAULT_PATTERNS, domains=(), stats=None):
+    """Yield the list of candidates of each name line, lazily and with duplicates.
+
+    ``stats`` gets the number of names and candidates, and of dropped names:
+    non-blank lines with no letters left after transliteration (such as
+    names in scripts outside TRANSLITERATION when unidecode is missing).
+    """
+    generate = compile_patterns(patterns, domains)
+    stats = {} if stats is None else stats
+    stats.update(names=0, candidates=0, dropped=0)
+    for line in lines:
+        first, middle, last = split_name(line)
+        if not first:
+            if line and not line.isspace():
+                stats['dropped'] += 1
+            continue
+        stats['names'] += 1
+        candidates = generate(first, middle, last)
+        stats['candidates'] += len(candidates)
+        yield candidates
+
+
+def iter_candidates(lines, patterns=DEFAULT_PATTERNS, domains=(), stats=None):
+    """Iterator over every candidate of every name line (see iter_batches())."""
+    return chain.from_iterable(iter_batches(lines, patterns, domains, stats))
+
+
+def unique_candidates(candidates, max_items=1_000_000, directory=None, ordered=True):
+    """Distinct candidates with bounded memory: sorted (an external sort), or streamed in first-seen order."""
+    if ordered:
+        yield from sorted_unique(candidates, max_items, directory)
+        return
+    with SpillingSet(max_items, directory) as seen:
+        for candidate in candidates:
+            if seen.add(candidate):
+                yield candidate
+
+
+def _generate_range(job):
+    """Worker: write the sorted, distinct candidates of one byte range of a names file to run files."""
+    path, start, end, patterns, domains, max_items, directory = job
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    stats = {}
+    # Decoded like open() would, so lines split exactly as in one process.
+    lines = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8')
+    runs = write_runs(iter_candidates(lines, patterns, domains, stats), directory, max_items,
+                      prefix=f'range{start:012d}')
+    return runs, stats
+
+
+def generate_parallel(path, patterns=DEFAULT_PATTERNS, domains=(), jobs=None, max_items=1_000_000,
+                      directory=None, stats=None):
+    """Yield the distinct candidates of a names file in sorted order, generated by a process pool.
+
+    The file is cut into line-aligned byte ranges (about four per worker);
+    each worker writes its range's candidates as sorted, distinct run files
+    holding up to ``max_items`` each, and the runs are k-way merged here.
+    ``stats`` gets the summed name, candidate and dropped name counts.
+    """
+    jobs = jobs or os.cpu_count()
+    stats = {} if stats is None else stats
+    stats.update(names=0, candidates=0, dropped=0)
+    range_size = min(RANGE_SIZE, max(os.path.getsize(path) // (jobs * 4) + 1, MIN_RANGE))
+    tmp = tempfile.mkdtemp(prefix='bbtools-emailgen-', dir=directory)
+    try:
+        runs = []
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_generate_range, (path, start, end, patterns, domains, max_items, tmp))
+                       for _, start, end in split_ranges(path, range_size)]
+            for fut in as_completed(futures):
+                paths, counts = fut.result()
+                runs += paths
+                stats['names'] += counts['names']
+                stats['candidates'] += counts['candidates']
+                stats['dropped'] += counts['dropped']
+        yield from merge_runs(reduce_runs(sorted(runs), tmp))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def normalize_domain(domain):
+    domain = domain.strip().lower().lstrip('@').rstrip('.')
+    if not DOMAIN_RE.match(domain):
+        raise ValueError(f'invalid domain {domain!r}')
+    return domain
+
+
+def read_lines(path):
+    """Non-blank, non-comment lines of a file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bbtools emailgen', description='Email Pattern Generator',
+                                     epilog='Pattern fields: {first} {middle} {last}, their initials {f} {m} {l}, '
+                                            "and {domain}; '@{domain}' is appended when a pattern has no '@'. "
+                                            'Names are transliterated to ASCII: Latin, Greek and Cyrillic '
+                                            'built in, other scripts (CJK, Arabic, ...) only with the optional '
+                                            'unidecode package (pip install unidecode); without it such names '
+                                            'are dropped and counted in the summary.')
+    parser.add_argument('-i', '--input', required=True, help="Input names file ('-' for stdin)")
+    parser.add_argument('-d', '--domain', action='append', default=[],
+                        help='Company domain; repeat or comma-separate for several')
+    parser.add_argument('-D', '--domains-file', help='File with one domain per line')
+    parser.add_argument('-p', '--pattern', action='append', default=[],
+                        help="Pattern such as '{f}{last}' (repeatable; default: the 10 built-in patterns)")
+    parser.add_argument('-P', '--patterns-file', help='File with one pattern per line')
+    parser.add_argument('-o', '--output', default='generated_emails.txt', help="Output file ('-' for stdout)")
+    parser.add_argument('--unsorted', action='store_true',
+                        help='Write candidates as they are generated (first-seen order) instead of sorted. '
+                             'Duplicates are then matched by 64-bit hash, so over N candidates one may be '
+                             'wrongly dropped with probability ~N**2/2**65; sorted output is exact')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Worker processes generating shards of the input file (0: all cores; default: 1)')
+    parser.add_argument('--max-memory', type=int, default=1_000_000, metavar='N',
+                        help='Candidates held in memory (per worker with --jobs) before spilling to disk '
+                             '(default: 1000000)')
+    parser.add_argument('--tmp', help='Directory for spill files (default: system temp)')
+    parser.add_argument('--history', metavar='FILE',
+                        help='Filter of emails generated by earlier runs: skip those, remember the new ones')
+    args = parser.parse_args(argv)
+
+    domains = [d for value in args.domain for d in value.split(',') if d.strip()]
+    patterns = list(args.pattern)
+    try:
+        if args.domains_file:
+            domains += read_lines(args.domains_file)
+        if args.patterns_file:
+            patterns += read_lines(args.patterns_file)
+        args.domains = list(dict.fromkeys(normalize_domain(d) for d in domains))
+        args.patterns = list(dict.fromkeys(patterns)) or list(DEFAULT_PATTERNS)
+        for pattern in args.patterns:
+            parse_pattern(pattern)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if not args.domains:
+        parser.error('at least one domain is required (-d or -D)')
+    if args.jobs < 0:
+        parser.error('--jobs must be 0 (all cores) or more')
+    if args.jobs != 1:
+        if args.input == '-':
+            parser.error('--jobs needs an input file, not stdin')
+        if args.unsorted:
+            parser.error('--jobs always writes sorted output; drop --unsorted')
+        args.jobs = args.jobs or os.cpu_count()
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.monotonic()
+    stats = {}
+    source = None
+    if args.jobs > 1:
+        emails = generate_parallel(args.input, args.patterns, args.domains, args.jobs, args.max_memory, args.tmp,
+                                   stats)
+    else:
+        source = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+        candidates = iter_candidates(source, args.patterns, args.domains, stats)
+        emails = unique_candidates(candidates, args.max_memory, args.tmp, ordered=not args.unsorted)
+    history = open_history(args.history)
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    written = skipped = 0
+    write = out.write
+    try:
+        if history is None:
+            for written, email in enumerate(emails, 1):
+                write(email + '\n')
+        else:
+            for email in emails:
+                if history.add(email):
+                    write(email + '\n')
+                    written += 1
+                else:
+                    skipped += 1
+    finally:
+        emails.close()
+        if source is not None and source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+        close_history(history, 'emails')
+
+    report = sys.stderr if out is sys.stdout else sys.stdout
+    elapsed = time.monotonic() - start
+    print(f'[+] Generated {written} unique emails ({stats.get("candidates", 0)} candidates from '
+          f'{stats.get("names", 0)} names, {len(args.patterns)} patterns x {len(args.domains)} domains) '
+          f'in {elapsed:.1f}s ({stats.get("candidates", 0) / max(elapsed, 1e-9):,.0f} candidates/s)', file=report)
+    if stats.get('dropped'):
+        hint = '' if unidecode is not None else ' (install unidecode to transliterate other scripts)'
+        print(f'[!] Dropped {stats["dropped"]} names with no letters left after transliteration{hint}', file=report)
+    if history is not None:
+        print(f'[+] Left out {skipped} emails already in {args.history}', file=report)
+    if out is not sys.stdout:
+        print(f'[+] Saved to {args.output}', file=report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""Email address extraction from large text dumps (headless core of clean_email_list_generator)."""
+import argparse
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .bloom import close_history, open_history
+
+EMAIL_REGEX = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
+
+CHUNK_SIZE = 8 * 1024 * 1024
+# Byte range handed to each worker process in parallel mode
+RANGE_SIZE = 64 * 1024 * 1024
+# Inputs at least this big are extracted with a process pool from the GUI
+PARALLEL_THRESHOLD = 256 * 1024 * 1024
+
+EMAIL_BYTES_RE = re.compile(EMAIL_REGEX.encode())
+# EMAIL_BYTES_RE where no local-part byte precedes the match; see _finditer().
+EMAIL_START_RE = re.compile(rb"(?<![a-zA-Z0-9._%+-])" + EMAIL_REGEX.encode())
+LOCAL_BYTES = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-"
+EMAIL_BYTES = LOCAL_BYTES + b"@"
+# A byte that can never be part of a match. Chunk boundaries are moved onto
+# one of these, so no email is ever split between two chunks.
+SEPARATOR_RE = re.compile(rb"[^a-zA-Z0-9._%+@-]")
+# Most bytes a stream chunk holds back for the next one. A longer run with
+# no separator cannot be a real address (they are at most 254 bytes), so
+# only its last MAX_CARRY bytes are kept.
+MAX_CARRY = 64 * 1024
+
+
+def iter_emails(path, chunk_size=CHUNK_SIZE, progress=None):
+    """Yield every email address in a file, scanning it chunk by chunk.
+
+    The file is memory-mapped when possible (falling back to buffered reads),
+    so memory use does not grow with the file size. progress(done, total) is
+    called after each chunk; total is 0 when the size is unknown.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):  # empty or not mappable (pipes, some mounts)
+            yield from _iter_stream(f, chunk_size, progress)
+            return
+
+        with buf:
+            pos = 0
+            while pos < size:
+                end = min(pos + chunk_size, size)
+                if end < size:
+                    sep = SEPARATOR_RE.search(buf, end)
+                    end = sep.start() if sep else size
+                for match in _finditer(buf, pos, end):
+                    yield match.group().decode("ascii")
+                pos = end
+                if progress:
+                    progress(pos, size)
+
+
+def _finditer(data, pos=0, end=None):
+    """EMAIL_BYTES_RE.finditer(data, pos, end), in time linear in the length of data.
+
+    finditer retries the pattern at every byte of a run of local-part bytes
+    that holds no address, scanning to the end of the run each time, which
+    is quadratic in the run length. When a start inside such a run fails,
+    every later start in the same run fails too (it only sees a shorter
+    local part before the same "@"), so only two starts can match: the
+    first byte of a run (EMAIL_START_RE), and the spot where scanning
+    starts or the previous match ended, tried with an anchored match.
+    """
+    if end is None:
+        end = len(data)
+    search, match = EMAIL_START_RE.search, EMAIL_BYTES_RE.match
+    while True:
+        found = pos < end and data[pos] in LOCAL_BYTES and match(data, pos, end) or search(data, pos, end)
+        if not found:
+            return
+        yield found
+        pos = found.end()
+
+
+def _iter_stream(f, chunk_size, progress):
+    carry = b""
+    done = 0
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        done += len(chunk)
+        data = carry + chunk
+        # Hold back the trailing run of email characters; it may continue
+        # in the next chunk.
+        cut = _trailing_run_start(data, MAX_CARRY)
+        carry = data[cut:]
+        for match in _finditer(data, 0, cut):
+            yield match.group().decode("ascii")
+        if progress:
+            progress(done, 0)
+    for match in _finditer(carry):
+        yield match.group().decode("ascii")
+
+
+def _trailing_run_start(data, limit, window=256):
+    """Start of the run of email bytes that ends ``data``, at most ``limit`` bytes back.
+
+    Walks backwards in growing windows, so the cost is linear in the run
+    length rather than in the size of data.
+    """
+    floor = max(0, len(data) - limit)
+    end = len(data)
+    while end > floor:
+        start = max(floor, end - window)
+        kept = len(data[start:end].rstrip(EMAIL_BYTES))
+        if kept:
+            return start + kept
+        end = start
+        window *= 2
+    return floor
+
+
+def collect_files(inputs):
+    """Expand files and directories (recursively) into a list of file paths"""
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, names in os.walk(item):
+                files.extend(os.path.join(root, name) for name in sorted(names))
+        else:
+            files.append(item)
+    return files
+
+
+def split_ranges(path, range_size=RANGE_SIZE):
+    """Split a file into (path, start, end) byte ranges that end on line boundaries"""
+    size = os.path.getsize(path)
+    ranges = []
+    start = 0
+    with open(path, "rb") as f:
+        while start < size:
+            end = start + range_size
+            if end >= size:
+                end = size
+            else:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            ranges.append((path, start, end))
+            start = end
+    return ranges
+
+
+def _extract_range(job):
+    """Worker: unique emails (as bytes) in one byte range of a file"""
+    path, start, end = job
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        return {match.group() for match in _finditer(buf, start, end)}, end - start
+
+
+def extract_parallel(paths, jobs=None, range_size=RANGE_SIZE, progress=None, mp_context=None):
+    """Extract unique emails from many files with a process pool.
+
+    Every file is cut into line-aligned byte ranges; each worker runs the
+    bytes regex over its range and returns a deduplicated set, and the sets
+    are merged here. progress(done, total) is called in bytes.
+    """
+    ranges = [r for path in paths for r in split_ranges(path, range_size)]
+    total = sum(end - start for _, start, end in ranges)
+    found = set()
+    done = 0
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=mp_context) as pool:
+        for fut in as_completed([pool.submit(_extract_range, r) for r in ranges]):
+            emails, size = fut.result()
+            found |= emails
+            done += size
+            if progress:
+                progress(done, total)
+    return {email.decode("ascii") for email in found}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bbtools emails",
+                                     description="Extract unique email addresses from text files (headless)")
+    parser.add_argument("inputs", nargs="+", help="Files or directories to scan")
+    parser.add_argument("-o", "--output", default="emails.txt", help="Output file")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="Worker processes (default: all cores)")
+    parser.add_argument("--history", metavar="FILE",
+                        help="Filter of emails extracted by earlier runs: leave those out, remember the new ones")
+    args = parser.parse_args(argv)
+
+    files = collect_files(args.inputs)
+    emails = sorted(extract_parallel(files, jobs=args.jobs))
+    history = open_history(args.history)
+    if history is not None:
+        found = len(emails)
+        emails = [email for email in emails if history.add(email)]
+        close_history(history, "emails")
+        print(f"[+] Left out {found - len(emails)} emails already in {args.history}")
+    with open(args.output, "w") as f:
+        f.write("\n".join(emails))
+    print(f"[+] {len(emails)} unique emails from {len(files)} file(s) saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
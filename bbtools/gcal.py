@@ -0,0 +1,293 @@
+"""Google Calendar email validation engine (headless core of Calendar_validator)."""
+import argparse
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx  # optional: HTTP/2 needs httpx[http2]
+except ImportError:
+    httpx = None
+
+from .bloom import close_history, open_history
+from .concurrency import AIMDController
+from .journal import Journal, journal_path
+from .ratelimit import TokenBucket
+from .sinks import open_sinks, timestamp
+
+CALENDAR_URL = 'https://calendar.google.com/calendar/u/0/htmlembed?src={email}'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+TIMEOUT_ERRORS = (requests.exceptions.Timeout,) + ((httpx.TimeoutException,) if httpx else ())
+CONNECTION_ERRORS = (requests.exceptions.ConnectionError,) + ((httpx.TransportError,) if httpx else ())
+
+# Outstanding lookups per worker thread; more emails are submitted as these finish.
+WINDOW_PER_WORKER = 4
+
+INVALID_FORMAT = "Invalid email format"
+# Column names of a result tuple, as written by every export.
+RESULT_FIELDS = ('Index', 'Email', 'Status', 'HTTP_Code', 'Response_Time_ms', 'Details', 'Timestamp')
+
+
+def is_final(result):
+    """True for answers worth journaling; timeouts, connection errors and 429/5xx are retried on resume."""
+    http_code, details = result[3], result[5]
+    return http_code in (200, 404) or details == INVALID_FORMAT
+
+
+class HTTPSessionPool:
+    """Keep-alive HTTP clients shared by the validation threads.
+
+    Every worker thread gets its own requests.Session, so repeated lookups
+    reuse one TLS connection instead of handshaking per email. With
+    http2=True a single thread-safe httpx client multiplexes all workers
+    over HTTP/2 connections sized to the thread count.
+    """
+
+    def __init__(self, size=10, http2=False, verify=True, headers=None):
+        self.size = size
+        self.http2 = http2 and httpx is not None
+        self.verify = verify
+        self.headers = headers or {'User-Agent': USER_AGENT}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._clients = []
+        self._shared = None
+
+    def get(self, url, timeout=10):
+        client = self._client()
+        if self.http2:
+            return client.get(url, timeout=timeout)
+        # Pass verify per request: requests lets REQUESTS_CA_BUNDLE override
+        # a session-level verify=False otherwise.
+        return client.get(url, timeout=timeout, verify=self.verify)
+
+    def _client(self):
+        if self.http2:
+            with self._lock:
+                if self._shared is None:
+                    limits = httpx.Limits(max_connections=self.size, max_keepalive_connections=self.size)
+                    self._shared = httpx.Client(http2=True, verify=self.verify, headers=self.headers,
+                                                limits=limits, follow_redirects=True)
+                    self._clients.append(self._shared)
+                return self._shared
+
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            session.verify = self.verify
+            # One thread never has more than one request in flight, but
+            # redirects may hop hosts, so keep a few per-host pools around.
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=1)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._local.session = session
+            with self._lock:
+                self._clients.append(session)
+        return session
+
+    def close(self):
+        with self._lock:
+            clients, self._clients, self._shared = self._clients, [], None
+        self._local = threading.local()
+        for client in clients:
+            client.close()
+
+
+class CalendarValidator:
+    """Check which email addresses have a public Google Calendar.
+
+    Results are (index, email, status, http_code, response_time_ms, details,
+    timestamp) tuples (see RESULT_FIELDS) with status "VALID" or "INVALID"
+    and the time the answer arrived. rate=0 disables rate limiting;
+    with adaptive=True the number of lookups in flight follows an
+    AIMDController (``workers`` is the ceiling) and on_concurrency(limit) is
+    called on every change. With a Journal, final answers are recorded in it
+    and emails already there are answered from it without a request.
+    """
+
+    def __init__(self, workers=10, rate=0, burst=1, http2=False, verify=True, adaptive=False, timeout=10,
+                 on_concurrency=None, journal=None):
+        self.workers = workers
+        self.timeout = timeout
+        self.journal = journal
+        self.http_pool = HTTPSessionPool(size=workers, http2=http2, verify=verify)
+        self.rate_limiter = TokenBucket(rate, burst) if rate > 0 else None
+        self.controller = AIMDController(initial=min(5, workers), maximum=workers,
+                                         on_change=on_concurrency) if adaptive else None
+
+    @property
+    def concurrency(self):
+        return self.controller.limit if self.controller else self.workers
+
+    def check(self, email):
+        """Return (exists, http_code, response_time_ms, details) for one email."""
+        url = CALENDAR_URL.format(email=email)
+
+        try:
+            start_time = time.time()
+            response = self.http_pool.get(url, timeout=self.timeout)
+            response_time = int((time.time() - start_time) * 1000)
+
+            if response.status_code == 200:
+                # Check if it's a valid calendar or error page
+                if "That's an error" in response.text or "was not found" in response.text:
+                    return False, 404, response_time, "Calendar not found (404 in page content)"
+                return True, 200, response_time, "Calendar exists"
+            elif response.status_code == 404:
+                return False, 404, response_time, "Calendar not found (404)"
+            else:
+                return False, response.status_code, response_time, f"HTTP {response.status_code}"
+
+        except TIMEOUT_ERRORS:
+            return False, 0, 0, "Request timeout"
+        except CONNECTION_ERRORS:
+            return False, 0, 0, "Connection error"
+        except Exception as e:
+            return False, 0, 0, f"Error: {str(e)}"
+
+    def validate(self, idx, email):
+        """Validate one email: format first, then the calendar lookup."""
+        if not EMAIL_RE.match(email):
+            return idx, email, "INVALID", 0, 0, INVALID_FORMAT, timestamp()
+
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        if self.controller:
+            self.controller.acquire()
+            try:
+                valid, http_code, response_time, details = self.check(email)
+            finally:
+                self.controller.release()
+            timed_out = details == "Request timeout"
+            if http_code or timed_out:
+                self.controller.record(response_time, http_code, timed_out)
+        else:
+            valid, http_code, response_time, details = self.check(email)
+
+        status = "VALID" if valid else "INVALID"
+        return idx, email, status, http_code, response_time, details, timestamp()
+
+    def run(self, emails, should_stop=None):
+        """Validate emails on a thread pool, yielding results as they complete.
+
+        Only ``workers * WINDOW_PER_WORKER`` lookups are queued at a time, so
+        emails may be a lazy iterable. Pending lookups are cancelled once
+        should_stop() returns true or the generator is closed.
+        """
+        stopped = should_stop or (lambda: False)
+        journal = self.journal
+        window = self.workers * WINDOW_PER_WORKER
+        pending = set()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                for idx, email in enumerate(emails, 1):
+                    if stopped():
+                        return
+                    if journal is not None and email in journal:
+                        yield (idx, email, *journal.get(email))
+                        continue
+                    if len(pending) >= window:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        yield from self._completed(done)
+                    pending.add(executor.submit(self.validate, idx, email))
+                while pending and not stopped():
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from self._completed(done)
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _completed(self, futures):
+        for future in futures:
+            result = future.result()
+            if self.journal is not None and is_final(result):
+                self.journal.record(result[1], result[2:])
+            yield result
+
+    def close(self):
+        self.http_pool.close()
+
+
+def read_emails(path):
+    """Emails from a file ('-' for stdin), one per line; blank and # lines are skipped."""
+    f = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+    try:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bbtools calendar',
+                                     description='Google Calendar email validator (headless)')
+    parser.add_argument('emails', help="Email list, one per line ('-' for stdin)")
+    parser.add_argument('-t', '--threads', type=int, default=10, help='Worker threads (default: 10)')
+    parser.add_argument('-r', '--rate', type=float, default=10, help='Max requests per second, 0 = unlimited (default: 10)')
+    parser.add_argument('-b', '--burst', type=int, default=1, help='Rate limiter burst (default: 1)')
+    parser.add_argument('--http2', action='store_true', help='Use one shared HTTP/2 client (needs httpx[http2])')
+    parser.add_argument('--adaptive', action='store_true', help='Adapt concurrency to latency (--threads is the ceiling)')
+    parser.add_argument('-k', '--insecure', action='store_true', help='Do not verify TLS certificates')
+    parser.add_argument('-o', '--output', action='append', default=[],
+                        help='Stream every result to this file: .csv, .jsonl or .db, add .gz to compress '
+                             '(repeat for several outputs)')
+    parser.add_argument('--resume', action='store_true', help='Reuse answers already in the journal')
+    parser.add_argument('--journal', help='Journal file (default: derived from the email list path)')
+    parser.add_argument('--no-journal', action='store_true', help='Do not record progress')
+    parser.add_argument('--history', metavar='FILE',
+                        help='Filter of emails answered in earlier campaigns: skip those, remember the new ones')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Print every result to stderr')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    emails = read_emails(args.emails)
+    history = open_history(args.history)
+    if history is not None:
+        listed = len(emails)
+        emails = [email for email in emails if email not in history]
+        print(f'[+] Skipping {listed - len(emails)} emails already answered in {args.history}', file=sys.stderr)
+    journal = None
+    if not args.no_journal:
+        journal = Journal(args.journal or journal_path('calendar', os.path.abspath(args.emails)), resume=args.resume)
+    validator = CalendarValidator(workers=args.threads, rate=args.rate, burst=args.burst, http2=args.http2,
+                                  verify=not args.insecure, adaptive=args.adaptive, journal=journal)
+    sink = open_sinks(args.output, RESULT_FIELDS)
+    valid = 0
+    try:
+        for result in validator.run(emails):
+            email, status, details = result[1], result[2], result[5]
+            if status == "VALID":
+                valid += 1
+                print(email, flush=True)
+            if args.verbose:
+                print(f'[{status}] {email} -> {details}', file=sys.stderr, flush=True)
+            if sink:
+                sink.write(result)
+            if history is not None and is_final(result):
+                history.add(email)
+    except KeyboardInterrupt:
+        if journal:
+            print(f'[!] Interrupted; continue with --resume (journal: {journal.path})', file=sys.stderr)
+    finally:
+        validator.close()
+        if journal:
+            journal.close()
+        if sink:
+            sink.close()
+        close_history(history, 'emails')
+    print(f'[+] {valid} valid out of {len(emails)} emails', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Append-only journal of completed work items, for resuming interrupted runs."""
+import hashlib
+import json
+import os
+import threading
+import time
+
+DEFAULT_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'bug_bounty_tools', 'journals')
+
+
+def journal_path(tool, *parts):
+    """Default journal file for a run of ``tool`` identified by ``parts`` (template, input file...)."""
+    digest = hashlib.sha1('\0'.join(map(str, parts)).encode()).hexdigest()[:12]
+    return os.path.join(DEFAULT_DIR, f'{tool}-{digest}.jsonl')
+
+
+class Journal:
+    """JSONL file of ``[key, value]`` lines, one per completed item.
+
+    With resume=True the existing file is loaded into an in-memory index
+    (key -> value) so callers can skip done items with get(); a torn last
+    line left by a crash is cut off first. Otherwise the file is started
+    afresh. Records are buffered and written every ``flush_every`` records
+    or ``flush_interval`` seconds, whichever comes first, so a crash loses
+    at most that much work. Safe to share between threads.
+    """
+
+    def __init__(self, path, resume=False, flush_every=200, flush_interval=1.0):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._index = {}
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        if resume and os.path.exists(path):
+            self._load()
+            self._file = open(path, 'a', encoding='utf-8')
+        else:
+            self._file = open(path, 'w', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def get(self, key, default=None):
+        return self._index.get(key, default)
+
+    def record(self, key, value=None):
+        """Mark key as done with a JSON-serializable value."""
+        line = json.dumps([key, value], separators=(',', ':')) + '\n'
+        with self._lock:
+            self._index[key] = value
+            self._buffer.append(line)
+            if (len(self._buffer) >= self.flush_every
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._file.close()
+
+    def _flush(self):
+        if self._buffer:
+            self._file.write(''.join(self._buffer))
+            self._file.flush()
+            self._buffer.clear()
+        self._last_flush = time.monotonic()
+
+    def _load(self):
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        end = data.rfind(b'\n') + 1
+        if end < len(data):
+            # Torn write: drop the partial line so new records start clean.
+            with open(self.path, 'r+b') as f:
+                f.truncate(end)
+        for line in data[:end].splitlines():
+            try:
+                key, value = json.loads(line)
+            except ValueError:
+                continue
+            self._index[key] = value
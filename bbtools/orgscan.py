@@ -0,0 +1,283 @@
+"""Atlassian ORG_NAME scan engine (headless core of Jira_Dashboard_Bug_Tool)."""
+import argparse
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+
+try:
+    import aiohttp
+except ImportError:  # optional: the async engine is skipped without it
+    aiohttp = None
+
+from .concurrency import AIMDController
+from .journal import Journal, journal_path
+from .ratelimit import TokenBucket
+from .sinks import open_sinks, timestamp
+from .wordlist import open_wordlist
+
+DEFAULT_TEMPLATE = 'https://ORG_NAME.atlassian.net/secure/ManageFilters.jspa'
+# Columns of a found URL in every export.
+FOUND_FIELDS = ('URL', 'Status', 'Timestamp')
+MAX_THREAD_WORKERS = 200
+# Outstanding tasks per worker in the thread pool engine's sliding window.
+WINDOW_PER_WORKER = 4
+# Starting concurrency in adaptive mode; the workers setting is the ceiling.
+ADAPTIVE_START = 10
+
+
+def _noop(*args):
+    pass
+
+
+class OrgScanner:
+    """Request url_template with ORG_NAME replaced by each word.
+
+    Results are reported through callbacks, called from worker threads (or
+    the event loop thread in async mode): on_progress(percent),
+    on_found(url, code, stamp) for 200 responses, on_log(message) and
+    on_concurrency(limit). stamp is the time the answer arrived.
+
+    With a Journal, every answered URL is recorded in it with its stamp and
+    URLs already there are reported from the journal instead of being
+    requested again, 200s included (with their original stamp), so the
+    outputs of a resumed run hold every hit. Errors are not recorded, so
+    they are retried on resume.
+    """
+
+    def __init__(self, words, url_template, workers=20, timeout=8, verify_ssl=True, use_async=True, total=None,
+                 rate_limiter=None, adaptive=False, on_progress=None, on_found=None, on_log=None,
+                 on_concurrency=None, journal=None):
+        # words may be any iterable (e.g. a generator over a wordlist file);
+        # pass total when it has no len().
+        self.words = words
+        self.total = len(words) if total is None else total
+        self.url_template = url_template
+        self.workers = workers
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+        self.use_async = use_async
+        self.rate_limiter = rate_limiter
+        self.adaptive = adaptive
+        self.journal = journal
+        self.on_progress = on_progress or _noop
+        self.on_found = on_found or _noop
+        self.on_log = on_log or _noop
+        self.on_concurrency = on_concurrency or _noop
+        self.controller = None
+        self._stop = False
+        self._checked = 0
+        self._total = 0
+
+    def stop(self):
+        self._stop = True
+
+    def run(self):
+        total = self.total
+        if total == 0:
+            self.on_log('No words to test.')
+            return
+
+        self._checked = 0
+        self._total = total
+        use_async = self.use_async and aiohttp is not None
+        if self.use_async and not use_async:
+            self.on_log('aiohttp is not installed, falling back to the thread pool engine')
+        if self.adaptive:
+            ceiling = self.workers if use_async else min(self.workers, MAX_THREAD_WORKERS)
+            self.controller = AIMDController(initial=min(ADAPTIVE_START, ceiling), maximum=ceiling,
+                                             on_change=self.on_concurrency)
+            self.on_log(f'Adaptive concurrency: starting at {self.controller.limit}, ceiling {ceiling}')
+        self.on_concurrency(self.controller.limit if self.controller else self.workers)
+        if self.journal is not None and len(self.journal):
+            self.on_log(f'Resuming: {len(self.journal)} URLs already done in {self.journal.path}')
+        if use_async:
+            self.on_log(f'Starting async scan: {total} words with {self.workers} concurrent requests')
+            asyncio.run(self._run_async())
+        else:
+            self._run_threaded()
+        self.on_log('Scan finished')
+
+    def _run_threaded(self):
+        workers = min(self.workers, MAX_THREAD_WORKERS)
+        self.on_log(f'Starting scan: {self._total} words with {workers} workers')
+        window = workers * WINDOW_PER_WORKER
+        pending = {}
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            # Only keep `window` futures alive: submit more as results drain
+            # instead of queueing the whole wordlist up front.
+            for word in self.words:
+                if self._stop:
+                    break
+                url = self.url_template.replace('ORG_NAME', word)
+                if self._replay(url):
+                    continue
+                if len(pending) >= window:
+                    self._drain(pending)
+                pending[ex.submit(self._fetch, url)] = url
+            while pending and not self._stop:
+                self._drain(pending)
+            for fut in pending:
+                fut.cancel()
+
+    def _drain(self, pending):
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            url = pending.pop(fut)
+            try:
+                self._report(url, fut.result())
+            except Exception as e:
+                self._report(url, error=e)
+
+    async def _run_async(self):
+        # One session for the whole scan: the connector keeps idle keep-alive
+        # connections per host, so consecutive words reuse sockets.
+        connector = aiohttp.TCPConnector(limit=self.workers, ssl=None if self.verify_ssl else False,
+                                         ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        words = iter(self.words)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            async def worker():
+                for word in words:
+                    if self._stop:
+                        return
+                    url = self.url_template.replace('ORG_NAME', word)
+                    if self._replay(url):
+                        continue
+                    try:
+                        code = await self._fetch_async(session, url)
+                    except Exception as e:
+                        self._report(url, error=e)
+                    else:
+                        self._report(url, code)
+
+            await asyncio.gather(*(worker() for _ in range(min(self.workers, self._total))))
+
+    def _replay(self, url):
+        """Report url from the journal; False if it still has to be requested."""
+        if self.journal is None or url not in self.journal:
+            return False
+        code, stamp = self.journal.get(url)
+        self._report(url, code, stamp=stamp)
+        return True
+
+    def _report(self, url, code=None, error=None, stamp=None):
+        replayed = stamp is not None
+        if error is None and not replayed:
+            stamp = timestamp()
+            if self.journal is not None:
+                self.journal.record(url, [code, stamp])
+        self._checked += 1
+        self.on_progress(int(self._checked / self._total * 100))
+        if error is not None:
+            self.on_log(f'[ERROR] {url} -> {str(error) or type(error).__name__}')
+        elif code == 200:
+            self.on_found(url, code, stamp)
+            self.on_log(f'[FOUND 200, journal] {url}' if replayed else f'[FOUND 200] {url}')
+        else:
+            self.on_log(f'[{code}] {url}')
+
+    def _fetch(self, url):
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        if self.controller is None:
+            return self._get(url)
+        with self.controller.slot(timeout_errors=(requests.exceptions.Timeout,)) as slot:
+            slot.status = self._get(url)
+        return slot.status
+
+    def _get(self, url):
+        r = requests.get(url, timeout=self.timeout, verify=self.verify_ssl, allow_redirects=True)
+        return r.status_code
+
+    async def _fetch_async(self, session, url):
+        if self.rate_limiter:
+            await self.rate_limiter.acquire_async()
+        if self.controller is None:
+            return await self._get_async(session, url)
+        async with self.controller.slot(timeout_errors=(asyncio.TimeoutError,)) as slot:
+            slot.status = await self._get_async(session, url)
+        return slot.status
+
+    async def _get_async(self, session, url):
+        async with session.get(url, allow_redirects=True) as r:
+            # Drain the body so the connection goes back to the pool.
+            await r.read()
+            return r.status
+
+
+def read_words(path):
+    """Words of a wordlist ('-' for stdin); files are opened as a compiled, mmapped Wordlist."""
+    if path != '-':
+        return open_wordlist(path)
+    return [w.strip() for w in sys.stdin if w.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bbtools jira',
+                                     description='Atlassian ORG_NAME checker (headless)')
+    parser.add_argument('wordlist', help="Wordlist file, one word per line ('-' for stdin)")
+    parser.add_argument('-u', '--url', default=DEFAULT_TEMPLATE, help='URL template with ORG_NAME placeholder')
+    parser.add_argument('-w', '--workers', type=int, default=30, help='Concurrent requests (default: 30)')
+    parser.add_argument('-t', '--timeout', type=int, default=8, help='Request timeout in seconds (default: 8)')
+    parser.add_argument('-r', '--rate', type=float, default=0, help='Max requests per second (default: unlimited)')
+    parser.add_argument('-k', '--insecure', action='store_true', help='Do not verify TLS certificates')
+    parser.add_argument('--threads', action='store_true', help='Use the thread pool engine instead of asyncio')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='Adapt concurrency to latency and 429/5xx/timeouts (--workers is the ceiling)')
+    parser.add_argument('-o', '--output', action='append', default=[],
+                        help='Stream found URLs to this file: .csv, .jsonl or .db, add .gz to compress '
+                             '(repeat for several outputs)')
+    parser.add_argument('--resume', action='store_true', help='Skip URLs already answered in the journal')
+    parser.add_argument('--journal', help='Journal file (default: derived from the template and wordlist)')
+    parser.add_argument('--no-journal', action='store_true', help='Do not record progress')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Log every request to stderr')
+    args = parser.parse_args(argv)
+    if 'ORG_NAME' not in args.url:
+        parser.error('URL must contain ORG_NAME placeholder')
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    words = read_words(args.wordlist)
+    sink = open_sinks(args.output, FOUND_FIELDS)
+    found = 0
+
+    def on_found(url, code, stamp):
+        nonlocal found
+        found += 1
+        print(url, flush=True)
+        if sink:
+            sink.write((url, code, stamp))
+
+    def on_log(message):
+        if args.verbose:
+            print(message, file=sys.stderr, flush=True)
+
+    journal = None
+    if not args.no_journal:
+        path = args.journal or journal_path('jira', args.url, os.path.abspath(args.wordlist))
+        journal = Journal(path, resume=args.resume)
+    scanner = OrgScanner(words, args.url, args.workers, args.timeout, not args.insecure, not args.threads,
+                         rate_limiter=TokenBucket(args.rate, burst=max(1, int(args.rate))) if args.rate > 0 else None,
+                         adaptive=args.adaptive, on_found=on_found, on_log=on_log, journal=journal)
+    try:
+        scanner.run()
+    except KeyboardInterrupt:
+        scanner.stop()
+        if journal:
+            print(f'[!] Interrupted; continue with --resume (journal: {journal.path})', file=sys.stderr)
+    finally:
+        if journal:
+            journal.close()
+        if sink:
+            sink.close()
+    print(f'[+] {found} found out of {len(words)} words', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
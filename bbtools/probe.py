@@ -0,0 +1,363 @@
+"""Asynchronous HTTP(S) liveness prober (replaces httprobe in Subdomain_finder.sh)."""
+import argparse
+import asyncio
+import html
+import ipaddress
+import re
+import socket
+import ssl
+import sys
+import time
+
+from .bloom import close_history, open_history
+from .sinks import open_sinks, timestamp
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+DEFAULT_PROBES = (('http', 80), ('https', 443))
+# Columns of a probe result in every export.
+PROBE_FIELDS = ('URL', 'Host', 'Port', 'Status', 'Title', 'Size', 'Time_ms', 'Timestamp')
+# Body bytes read per response; the title is looked for in the first TITLE_WINDOW.
+MAX_BODY = 256 * 1024
+TITLE_WINDOW = 64 * 1024
+TITLE_RE = re.compile(rb'<title[^>]*>(.*?)</title', re.I | re.S)
+STATUS_RE = re.compile(rb'^HTTP/\d(?:\.\d)? (\d{3})')
+# DNS name of 1-63 character labels, 253 characters at most (underscores allowed, as in real-world records).
+HOST_RE = re.compile(r'^(?=.{1,253}$)[a-z0-9_][a-z0-9_-]{0,62}(?:\.[a-z0-9_-]{1,63})*$')
+
+
+def parse_target(line):
+    """Split 'host', 'host:port', '[v6]:port' or 'scheme://host[:port]/path' into
+    (scheme, host, port). scheme and port are None when not given; None is
+    returned for lines that are not a valid target, including hosts that
+    are neither an IP address nor a well-formed DNS name.
+    """
+    s = line.strip()
+    scheme = None
+    if '://' in s:
+        scheme, s = s.split('://', 1)
+        scheme = scheme.lower()
+        if scheme not in DEFAULT_PORTS:
+            return None
+    s = re.split(r'[/?#]', s, 1)[0].rsplit('@', 1)[-1]
+    port = None
+    if s.startswith('['):
+        host, _, rest = s[1:].partition(']')
+        if rest:
+            if not rest.startswith(':'):
+                return None
+            port = rest[1:]
+    elif s.count(':') == 1:
+        host, port = s.split(':')
+    else:
+        host = s  # plain name, or a bare IPv6 address
+    if port is not None:
+        if not port.isdigit() or not 0 < int(port) < 65536:
+            return None
+        port = int(port)
+    host = host.lower().rstrip('.')
+    if not host or any(c in host for c in ' \t/\\'):
+        return None
+    if not host.isascii():
+        try:
+            host = host.encode('idna').decode('ascii')
+        except UnicodeError:
+            return None
+    if not HOST_RE.match(host) and not _is_ip(host):
+        return None
+    return scheme, host, port
+
+
+def expand_target(target, probes=DEFAULT_PROBES):
+    """(scheme, host, port) -> the (scheme, host, port) probes to run for it.
+
+    An explicit scheme and/or port narrows ``probes``: 'host:8443' is tried
+    with every scheme in probes, 'https://host' only on its default port.
+    """
+    scheme, host, port = target
+    if scheme and port:
+        return [(scheme, host, port)]
+    if scheme:
+        return [(scheme, host, DEFAULT_PORTS[scheme])]
+    if port:
+        schemes = [s for s, p in DEFAULT_PORTS.items() if p == port] or list(dict.fromkeys(s for s, _ in probes))
+        return [(s, host, port) for s in schemes]
+    return [(s, host, p) for s, p in probes]
+
+
+def format_url(scheme, host, port):
+    if ':' in host:
+        host = f'[{host}]'
+    return f'{scheme}://{host}' if port == DEFAULT_PORTS[scheme] else f'{scheme}://{host}:{port}'
+
+
+def parse_probe_spec(spec):
+    """'https:443' or 'http:8080' -> (scheme, port)"""
+    scheme, _, port = spec.partition(':')
+    scheme = scheme.lower()
+    if scheme not in DEFAULT_PORTS or not port.isdigit() or not 0 < int(port) < 65536:
+        raise argparse.ArgumentTypeError(f'expected http:PORT or https:PORT, got {spec!r}')
+    return scheme, int(port)
+
+
+def _is_ip(host):
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+def _extract_title(body):
+    match = TITLE_RE.search(body, 0, TITLE_WINDOW)
+    if not match:
+        return ''
+    title = html.unescape(match.group(1).decode('utf-8', 'replace'))
+    return ' '.join(title.split())[:200]
+
+
+def _dechunk(data):
+    """Decode as much of a chunked body as is present (it may be cut off)."""
+    out = bytearray()
+    pos = 0
+    while True:
+        end = data.find(b'\r\n', pos)
+        if end < 0:
+            break
+        try:
+            size = int(data[pos:end].split(b';', 1)[0], 16)
+        except ValueError:
+            break
+        if size == 0:
+            break
+        out += data[end + 2:end + 2 + size]
+        pos = end + 2 + size + 2
+        if pos > len(data):
+            break
+    return bytes(out)
+
+
+class Prober:
+    """Probe (scheme, host, port) targets with one HTTP/1.1 GET each over raw asyncio streams.
+
+    A target is alive when it answers with any HTTP status line; redirects
+    are not followed and certificates are not verified. ``connect_timeout``
+    covers DNS, TCP and the TLS handshake, ``read_timeout`` the response.
+    Name lookups are cached, so probing http and https of a host resolves
+    it once.
+    """
+
+    def __init__(self, concurrency=200, connect_timeout=5.0, read_timeout=10.0, user_agent='Mozilla/5.0'):
+        self.concurrency = concurrency
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.user_agent = user_agent
+        self.ssl_context = ssl.create_default_context()
+        self.ssl_context.check_hostname = False
+        self.ssl_context.verify_mode = ssl.CERT_NONE
+        self.ssl_context.set_alpn_protocols(['http/1.1'])
+        self.attempted = 0
+        self._addrs = {}
+
+    async def _resolve(self, host):
+        if _is_ip(host):
+            return host
+        fut = self._addrs.get(host)
+        if fut is None:
+            fut = self._addrs[host] = asyncio.ensure_future(
+                asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM))
+        infos = await asyncio.shield(fut)
+        return infos[0][4][0]
+
+    async def _connect(self, host, port, https):
+        addr = await self._resolve(host)
+        if not https:
+            return await asyncio.open_connection(addr, port)
+        return await asyncio.open_connection(addr, port, ssl=self.ssl_context,
+                                             server_hostname='' if _is_ip(host) else host)
+
+    async def probe(self, scheme, host, port):
+        """Result tuple (see PROBE_FIELDS) if the target answers HTTP, else None."""
+        self.attempted += 1
+        start = time.monotonic()
+        https = scheme == 'https'
+        try:
+            reader, writer = await asyncio.wait_for(self._connect(host, port, https), self.connect_timeout)
+        except (OSError, asyncio.TimeoutError, ssl.SSLError, ValueError):
+            return None  # ValueError: a name getaddrinfo cannot encode (UnicodeError)
+
+        try:
+            host_header = f'[{host}]' if ':' in host else host
+            if port != DEFAULT_PORTS[scheme]:
+                host_header += f':{port}'
+            writer.write(f'GET / HTTP/1.1\r\nHost: {host_header}\r\nUser-Agent: {self.user_agent}\r\n'
+                         f'Accept: */*\r\nConnection: close\r\n\r\n'.encode('ascii'))
+            deadline = start + self.connect_timeout + self.read_timeout
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), max(0.01, deadline - time.monotonic()))
+            match = STATUS_RE.match(head)
+            if not match:
+                return None
+            status = int(match.group(1))
+            headers = {}
+            for line in head.split(b'\r\n')[1:]:
+                name, sep, value = line.partition(b':')
+                if sep:
+                    headers[name.strip().lower()] = value.strip()
+            body, size = await self._read_body(reader, headers, deadline)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                ssl.SSLError, ValueError):
+            return None
+        finally:
+            writer.transport.abort()
+
+        elapsed = int((time.monotonic() - start) * 1000)
+        return (format_url(scheme, host, port), host, port, status, _extract_title(body), size, elapsed,
+                timestamp())
+
+    async def _read_body(self, reader, headers, deadline):
+        """(first MAX_BODY bytes of the body, body size). A slow body is cut off at the deadline."""
+        length = headers.get(b'content-length')
+        chunked = b'chunked' in headers.get(b'transfer-encoding', b'').lower()
+        want = min(int(length), MAX_BODY) if length is not None and length.isdigit() else MAX_BODY
+        data = bytearray()
+        try:
+            while len(data) < want:
+                chunk = await asyncio.wait_for(reader.read(want - len(data)),
+                                               max(0.01, deadline - time.monotonic()))
+                if not chunk:
+                    break
+                data += chunk
+        except (asyncio.TimeoutError, OSError, ssl.SSLError):
+            pass  # headers arrived, so the host is alive; report what we have
+        body = _dechunk(bytes(data)) if chunked else bytes(data)
+        if length is not None and length.isdigit():
+            return body, int(length)
+        return body, len(body)
+
+    async def run(self, targets):
+        """Probe an iterable of (scheme, host, port), yielding results of live ones as they complete."""
+        results = asyncio.Queue(maxsize=self.concurrency)
+        targets = iter(targets)
+
+        async def worker():
+            for target in targets:
+                result = await self.probe(*target)
+                if result is not None:
+                    await results.put(result)
+
+        async def run_workers():
+            workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+            try:
+                await asyncio.gather(*workers)
+            except Exception:
+                # Wake the consumer, which gets the error from the runner. (When
+                # the consumer cancels us instead, gather cancels the workers.)
+                for task in workers:
+                    task.cancel()
+                await results.put(None)
+                raise
+            await results.put(None)
+
+        runner = asyncio.create_task(run_workers())
+        try:
+            while True:
+                result = await results.get()
+                if result is None:
+                    break
+                yield result
+            await runner
+        finally:
+            if not runner.done():
+                runner.cancel()
+
+
+def read_targets(stream, probes=DEFAULT_PROBES):
+    """Yield (scheme, host, port) probes for each line of a hosts/URLs stream, skipping duplicates."""
+    seen = set()
+    for line in stream:
+        target = parse_target(line)
+        if target is None:
+            continue
+        for probe in expand_target(target, probes):
+            if probe not in seen:
+                seen.add(probe)
+                yield probe
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bbtools probe',
+                                     description='Find hosts that answer HTTP(S) (httprobe replacement)')
+    parser.add_argument('input', nargs='?', default='-', help="Hosts or URLs, one per line (default: stdin)")
+    parser.add_argument('-p', '--probe', dest='probes', action='append', type=parse_probe_spec, metavar='SCHEME:PORT',
+                        help='Scheme and port to try on bare hosts, repeatable (default: http:80 and https:443)')
+    parser.add_argument('-c', '--concurrency', type=int, default=200, help='Probes in flight (default: 200)')
+    parser.add_argument('-t', '--timeout', type=float, default=5.0,
+                        help='Connect timeout incl. DNS and TLS, seconds (default: 5)')
+    parser.add_argument('--read-timeout', type=float, default=10.0, help='Response timeout, seconds (default: 10)')
+    parser.add_argument('--hosts-only', action='store_true', help='Print each live hostname once instead of URLs')
+    parser.add_argument('-o', '--output', action='append', default=[],
+                        help='Stream results (status, title, size...) to .csv, .jsonl or .db, add .gz to compress '
+                             '(repeatable)')
+    parser.add_argument('--history', metavar='FILE',
+                        help='Filter of URLs found live by earlier runs: skip probing those, remember the new ones')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Print status and title next to each URL')
+    return parser.parse_args(argv)
+
+
+async def run(args):
+    prober = Prober(args.concurrency, args.timeout, args.read_timeout)
+    stream = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8', errors='ignore')
+    sink = open_sinks(args.output, PROBE_FIELDS)
+    history = open_history(args.history)
+    targets = read_targets(stream, args.probes or DEFAULT_PROBES)
+    skipped = 0
+    if history is not None:
+        def unseen(targets):
+            nonlocal skipped
+            for target in targets:
+                if format_url(*target) in history:
+                    skipped += 1
+                else:
+                    yield target
+        targets = unseen(targets)
+    printed = set()
+    alive = 0
+    start = time.monotonic()
+    try:
+        async for result in prober.run(targets):
+            alive += 1
+            if history is not None:
+                history.add(result[0])
+            if sink:
+                sink.write(result)
+            url, host, port, status, title = result[:5]
+            if args.hosts_only:
+                if host not in printed:
+                    printed.add(host)
+                    print(host, flush=True)
+            elif args.verbose:
+                print(f'{url} [{status}] [{result[5]}] {title}', flush=True)
+            else:
+                print(url, flush=True)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if sink:
+            sink.close()
+        close_history(history, 'URLs')
+    elapsed = time.monotonic() - start
+    print(f'[+] {alive} live of {prober.attempted} probes in {elapsed:.1f}s '
+          f'({prober.attempted / max(elapsed, 1e-9):,.0f} probes/s)', file=sys.stderr)
+    if history is not None:
+        print(f'[+] Skipped {skipped} URLs already live in {args.history}', file=sys.stderr)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
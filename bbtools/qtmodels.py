@@ -0,0 +1,198 @@
+"""Qt model/view helpers for large result sets.
+
+Imported only by the GUIs; the rest of bbtools does not depend on PyQt5.
+"""
+from array import array
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+from PyQt5.QtWidgets import QAbstractItemView, QHeaderView, QTableView
+
+ROW_HEIGHT = 22
+
+
+class ColumnTableModel(QAbstractTableModel):
+    """Table model storing each column as one flat list (or int array).
+
+    Views only ask for the visible cells, so rendering cost does not depend
+    on the row count. Rows added with append() are buffered and inserted in
+    one rowsInserted batch every ``flush_ms``; extend() and load() insert at
+    once. Sorting and text filtering are done here on the column arrays
+    (a permutation of row ids), which is far cheaper than a
+    QSortFilterProxyModel calling data() once per row.
+    """
+
+    def __init__(self, headers, int_columns=(), flush_ms=100, parent=None):
+        super().__init__(parent)
+        self.headers = list(headers)
+        self.int_columns = frozenset(int_columns)
+        self._cols = self._empty_columns()
+        self._count = 0  # rows exposed to views when no sort/filter is active
+        self._view = None  # array of row ids when sorted or filtered
+        self._pending = []
+        self._sort = None
+        self._filter = ''
+        self._filter_column = -1
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(flush_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def _empty_columns(self):
+        return [array('q') if i in self.int_columns else [] for i in range(len(self.headers))]
+
+    # ---- QAbstractTableModel ----
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._count if self._view is None else len(self._view)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        row = index.row() if self._view is None else self._view[index.row()]
+        return str(self._cols[index.column()][row])
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.flush()
+        self._sort = (column, order) if column >= 0 else None
+        self._rebuild()
+
+    # ---- data ----
+    def append(self, row):
+        """Queue one row; it reaches the views with the next batch."""
+        self._pending.append(row)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def extend(self, rows):
+        self._pending.extend(rows)
+        self.flush()
+
+    def load(self, columns):
+        """Replace all data with the given column sequences (no row tuples built)."""
+        self._pending = []
+        self.beginResetModel()
+        self._cols = [array('q', col) if i in self.int_columns else list(col)
+                      for i, col in enumerate(columns)]
+        self._count = len(self._cols[0]) if self._cols else 0
+        self._view = self._compute_view()
+        self.endResetModel()
+
+    def clear(self):
+        self._pending = []
+        self.beginResetModel()
+        self._cols = self._empty_columns()
+        self._count = 0
+        self._view = self._compute_view()
+        self.endResetModel()
+
+    def flush(self):
+        """Insert all queued rows with a single rowsInserted notification."""
+        self._timer.stop()
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        base = len(self._cols[0])
+        for col, values in zip(self._cols, zip(*rows)):
+            col.extend(values)
+
+        if self._view is None:
+            self.beginInsertRows(QModelIndex(), self._count, self._count + len(rows) - 1)
+            self._count += len(rows)
+            self.endInsertRows()
+            return
+        # Sorted/filtered: new matches are shown at the bottom until the
+        # next sort, like a log.
+        new_ids = [i for i in range(base, base + len(rows)) if self._matches(i)]
+        if new_ids:
+            first = len(self._view)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_ids) - 1)
+            self._view.extend(new_ids)
+            self._count = len(self._cols[0])
+            self.endInsertRows()
+        else:
+            self._count = len(self._cols[0])
+
+    def total_rows(self):
+        return len(self._cols[0]) + len(self._pending)
+
+    def rows(self):
+        """All rows in insertion order, regardless of sort and filter."""
+        self.flush()
+        return zip(*self._cols)
+
+    def column(self, i):
+        self.flush()
+        return self._cols[i]
+
+    # ---- filtering ----
+    def set_filter(self, text, column=-1):
+        """Show only rows containing text (case-insensitive) in column, or any column for -1."""
+        self.flush()
+        self._filter = text.lower()
+        self._filter_column = column
+        self._rebuild()
+
+    def _matches(self, row):
+        if not self._filter:
+            return True
+        cols = self._cols if self._filter_column < 0 else [self._cols[self._filter_column]]
+        return any(self._filter in str(col[row]).lower() for col in cols)
+
+    def _compute_view(self):
+        n = len(self._cols[0])
+        if not self._filter and self._sort is None:
+            return None
+        if self._filter:
+            cols = self._cols if self._filter_column < 0 else [self._cols[self._filter_column]]
+            needle = self._filter
+            ids = [i for i, values in enumerate(zip(*cols))
+                   if any(needle in str(v).lower() for v in values)]
+        else:
+            ids = range(n)
+        if self._sort is not None:
+            column, order = self._sort
+            ids = sorted(ids, key=self._cols[column].__getitem__, reverse=order == Qt.DescendingOrder)
+        return array('q', ids)
+
+    def _rebuild(self):
+        self.beginResetModel()
+        self._count = len(self._cols[0])
+        self._view = self._compute_view()
+        self.endResetModel()
+
+
+def make_table_view(model, parent=None, stretch_column=0):
+    """QTableView tuned for huge models: fixed row heights, no per-row sizing."""
+    view = QTableView(parent)
+    view.setModel(model)
+    # Start unsorted: enabling sorting sorts by the current indicator column.
+    view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+    view.setSortingEnabled(True)
+    view.setWordWrap(False)
+    view.setSelectionBehavior(QAbstractItemView.SelectRows)
+    view.verticalHeader().hide()
+    view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    view.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
+    header = view.horizontalHeader()
+    header.setSectionResizeMode(QHeaderView.Interactive)
+    header.setSectionResizeMode(stretch_column, QHeaderView.Stretch)
+    return view
+
+
+def attach_filter(line_edit, model, column=-1, delay_ms=250):
+    """Filter model as the user types, debounced so big tables are filtered once per pause."""
+    timer = QTimer(line_edit)
+    timer.setSingleShot(True)
+    timer.setInterval(delay_ms)
+    timer.timeout.connect(lambda: model.set_filter(line_edit.text(), column))
+    line_edit.textChanged.connect(lambda _: timer.start())
+    return timer
@@ -0,0 +1,57 @@
+"""Request rate limiting shared by the scanners."""
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every worker of a scan.
+
+    ``rate`` tokens are added per second, up to ``burst``. Each request takes
+    one token. A caller that finds the bucket empty reserves the next token
+    and sleeps until it is due, so the aggregate request rate never exceeds
+    ``rate`` (after the initial burst) however many threads or coroutines
+    share the bucket.
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def _reserve(self):
+        """Take a token, returning how long the caller must wait for it."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        """Block the calling thread until a request may be sent."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """Like acquire(), but yields to the event loop while waiting."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def try_acquire(self):
+        """Take a token only if one is available right now."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
@@ -0,0 +1,197 @@
+"""Streaming result sinks: rows are written as they arrive, not at the end of a run."""
+import csv
+import gzip
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+TEXT_BUFFER = 1 << 20
+
+
+def timestamp():
+    """Wall-clock time of a result, in the format used by every export."""
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+class Sink:
+    """Base class: thread-safe, buffered writer of rows (sequences in ``fields`` order).
+
+    Buffered rows reach the file at least every ``flush_interval`` seconds,
+    so partial output of a long run is usable while it is still going: a
+    write flushes once the interval has passed, and a daemon thread flushes
+    rows left waiting when no further writes come.
+    """
+
+    def __init__(self, fields, flush_interval=1.0):
+        self.fields = list(fields)
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._dirty = False
+        self._closed = threading.Event()
+        if 0 < flush_interval < float('inf'):
+            threading.Thread(target=self._flush_idle, name=f'{type(self).__name__}-flush', daemon=True).start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, row):
+        with self._lock:
+            self._write(row)
+            self.count += 1
+            self._dirty = True
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_now()
+
+    def write_many(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def flush(self):
+        with self._lock:
+            self._flush_now()
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            self._flush()
+            self._close()
+
+    def _flush_now(self):
+        self._flush()
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+    def _flush_idle(self):
+        while not self._closed.wait(self.flush_interval):
+            with self._lock:
+                if self._dirty and not self._closed.is_set() \
+                        and time.monotonic() - self._last_flush >= self.flush_interval:
+                    self._flush_now()
+
+    def _write(self, row):
+        raise NotImplementedError
+
+    def _flush(self):
+        pass
+
+    def _close(self):
+        pass
+
+
+class _TextSink(Sink):
+    def __init__(self, path, fields, flush_interval=1.0):
+        super().__init__(fields, flush_interval)
+        self.path = path
+        if path.endswith('.gz'):
+            self._file = gzip.open(path, 'wt', encoding='utf-8', newline='')
+        else:
+            self._file = open(path, 'w', encoding='utf-8', newline='', buffering=TEXT_BUFFER)
+
+    def _flush(self):
+        # On a gzip stream this is a sync flush: everything written so far
+        # can be decompressed while the run continues.
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+
+class CSVSink(_TextSink):
+    """CSV file with a header row (gzip-compressed if the path ends in .gz)."""
+
+    def __init__(self, path, fields, flush_interval=1.0):
+        super().__init__(path, fields, flush_interval)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.fields)
+
+    def _write(self, row):
+        self._writer.writerow(row)
+
+
+class JSONLSink(_TextSink):
+    """One JSON object per line (gzip-compressed if the path ends in .gz)."""
+
+    def _write(self, row):
+        self._file.write(json.dumps(dict(zip(self.fields, row))) + '\n')
+
+
+class SQLiteSink(Sink):
+    """Rows inserted into ``table`` in batches; WAL mode lets other processes read mid-run."""
+
+    def __init__(self, path, fields, table='results', batch_size=500, flush_interval=1.0):
+        super().__init__(fields, flush_interval)
+        self.path = path
+        self.batch_size = batch_size
+        self._rows = []
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        columns = ', '.join(_quote(f) for f in self.fields)
+        self._db.execute(f'CREATE TABLE IF NOT EXISTS {_quote(table)} ({columns})')
+        self._insert = (f'INSERT INTO {_quote(table)} ({columns}) '
+                        f'VALUES ({", ".join("?" * len(self.fields))})')
+
+    def _write(self, row):
+        self._rows.append(tuple(row))
+        if len(self._rows) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self._rows:
+            self._db.executemany(self._insert, self._rows)
+            self._db.commit()
+            self._rows.clear()
+
+    def _close(self):
+        self._db.close()
+
+
+class MultiSink(Sink):
+    """Fan every row out to several sinks."""
+
+    def __init__(self, sinks):
+        super().__init__(sinks[0].fields if sinks else (), flush_interval=float('inf'))
+        self.sinks = list(sinks)
+
+    def _write(self, row):
+        for sink in self.sinks:
+            sink.write(row)
+
+    def _flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def _close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def open_sink(path, fields, table='results'):
+    """Sink for path, by extension: .csv, .jsonl/.ndjson (either + .gz), .db/.sqlite/.sqlite3."""
+    name = path[:-3] if path.endswith('.gz') else path
+    ext = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+    if ext in ('db', 'sqlite', 'sqlite3'):
+        if name != path:
+            raise ValueError('SQLite output cannot be gzip-compressed')
+        return SQLiteSink(path, fields, table)
+    if ext in ('jsonl', 'ndjson', 'json'):
+        return JSONLSink(path, fields)
+    return CSVSink(path, fields)
+
+
+def open_sinks(paths, fields, table='results'):
+    """One sink for a single path, a MultiSink for several, None for none."""
+    sinks = [open_sink(path, fields, table) for path in paths]
+    if not sinks:
+        return None
+    return sinks[0] if len(sinks) == 1 else MultiSink(sinks)
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
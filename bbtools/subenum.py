@@ -0,0 +1,199 @@
+"""Subdomain enumeration: run the source tools concurrently and merge their output as it streams."""
+import argparse
+import asyncio
+import re
+import shlex
+import shutil
+import sys
+import time
+
+from .bloom import close_history, open_history
+from .probe import HOST_RE
+
+# Source tools and their command lines; {domain} is replaced by the target.
+SOURCES = {
+    'subfinder': ['subfinder', '-d', '{domain}', '-silent'],
+    'assetfinder': ['assetfinder', '--subs-only', '{domain}'],
+    'findomain': ['findomain', '-t', '{domain}', '--quiet'],
+    'sublist3r': ['sublist3r', '-d', '{domain}', '-n'],
+}
+
+ANSI_RE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+# Longest line accepted from a source (asyncio's default is 64 KiB).
+LINE_LIMIT = 1 << 20
+
+
+def normalize_host(line, domain):
+    """Hostname on a line of tool output if it is domain or one of its subdomains, else None.
+
+    Colour codes, URL schemes, ports, paths and wildcard prefixes are
+    stripped, so banner and progress lines simply fall out.
+    """
+    host = ANSI_RE.sub('', line).strip().lower()
+    if '://' in host:
+        host = host.split('://', 1)[1]
+    host = host.split('/', 1)[0].split(':', 1)[0].rstrip('.')
+    while host.startswith('*.'):
+        host = host[2:]
+    if host != domain and not host.endswith('.' + domain):
+        return None
+    return host if HOST_RE.match(host) else None
+
+
+def source_commands(domain, names=None, extra=None):
+    """Command lines of the requested (default: all) built-in sources plus extra {name: argv}."""
+    sources = {name: SOURCES[name] for name in (names or SOURCES)}
+    sources.update(extra or {})
+    return {name: [arg.replace('{domain}', domain) for arg in argv] for name, argv in sources.items()}
+
+
+async def enumerate_subdomains(domain, sources=None, timeout=600, seen=None, stats=None, on_log=None):
+    """Run every source at once, yielding (host, source) the first time each host is seen.
+
+    ``sources`` maps a name to a command line (default: all of SOURCES).
+    Output is read line by line as the tools print it, so hosts reach the
+    caller while slower sources are still running, and the whole run takes
+    as long as the slowest source. Sources missing from PATH are skipped;
+    a source still running after ``timeout`` seconds is killed. ``seen``
+    may be shared across calls to dedup several targets; ``stats`` is
+    filled with per-source counts, run time and exit status.
+    """
+    domain = domain.strip().lower().rstrip('.')
+    sources = source_commands(domain) if sources is None else sources
+    seen = set() if seen is None else seen
+    stats = {} if stats is None else stats
+    log = on_log or (lambda message: None)
+    found = asyncio.Queue(maxsize=1000)
+    procs = []
+
+    async def read(name, proc, st):
+        async for raw in proc.stdout:
+            host = normalize_host(raw.decode('utf-8', 'ignore'), domain)
+            if host is None:
+                continue
+            st['hosts'] += 1
+            if host not in seen:
+                seen.add(host)
+                st['new'] += 1
+                await found.put((host, name))
+        return await proc.wait()
+
+    async def run_source(name, argv):
+        st = stats[name] = {'hosts': 0, 'new': 0, 'seconds': 0.0, 'status': 'skipped'}
+        if shutil.which(argv[0]) is None:
+            log(f'{name}: {argv[0]} not found, skipped')
+            return
+        start = time.monotonic()
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *argv, stdin=asyncio.subprocess.DEVNULL, stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL, limit=LINE_LIMIT)
+        except OSError as e:
+            st['status'] = f'failed: {e}'
+            log(f'{name}: {st["status"]}')
+            return
+        procs.append(proc)
+        log(f'{name}: started')
+        try:
+            code = await asyncio.wait_for(read(name, proc, st), timeout)
+            st['status'] = 'ok' if code == 0 else f'exit {code}'
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            st['status'] = 'timeout'
+        except ValueError:  # a line longer than LINE_LIMIT
+            proc.kill()
+            await proc.wait()
+            st['status'] = 'failed: line too long'
+        st['seconds'] = time.monotonic() - start
+        log(f'{name}: {st["status"]}, {st["hosts"]} hosts ({st["new"]} new) in {st["seconds"]:.1f}s')
+
+    async def run_all():
+        await asyncio.gather(*(run_source(name, argv) for name, argv in sources.items()))
+        await found.put(None)
+
+    runner = asyncio.create_task(run_all())
+    try:
+        while True:
+            item = await found.get()
+            if item is None:
+                break
+            yield item
+        await runner
+    finally:
+        # Consumer stopped early (or was cancelled): do not leave tools running.
+        if not runner.done():
+            runner.cancel()
+            for proc in procs:
+                if proc.returncode is None:
+                    proc.kill()
+
+
+def parse_source(spec):
+    """NAME=COMMAND (shell-quoted, may contain {domain}) -> (name, argv)"""
+    name, sep, command = spec.partition('=')
+    if not sep or not name or not command.strip():
+        raise argparse.ArgumentTypeError(f'expected NAME=COMMAND, got {spec!r}')
+    return name, shlex.split(command)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bbtools subdomains',
+                                     description='Run subdomain sources in parallel and merge their output')
+    parser.add_argument('domain', help='Target domain')
+    parser.add_argument('-s', '--sources', default=','.join(SOURCES),
+                        help=f'Comma-separated built-in sources (default: {",".join(SOURCES)})')
+    parser.add_argument('--source', dest='extra', action='append', default=[], type=parse_source,
+                        metavar='NAME=COMMAND', help='Extra source command, {domain} is replaced (repeatable)')
+    parser.add_argument('-t', '--timeout', type=float, default=600, help='Per-source timeout in seconds (default: 600)')
+    parser.add_argument('-o', '--output', help='Also write hosts to this file as they are found')
+    parser.add_argument('--history', metavar='FILE',
+                        help='Filter of hosts found by earlier runs: leave those out, remember the new ones')
+    parser.add_argument('-q', '--quiet', action='store_true', help='No progress messages on stderr')
+    args = parser.parse_args(argv)
+    names = [n.strip() for n in args.sources.split(',') if n.strip()]
+    unknown = [n for n in names if n not in SOURCES]
+    if unknown:
+        parser.error(f'unknown source(s): {", ".join(unknown)}')
+    args.sources = names
+    return args
+
+
+async def run(args):
+    sources = source_commands(args.domain.strip().lower(), args.sources, dict(args.extra))
+    stats = {}
+    log = None if args.quiet else (lambda message: print(f'[*] {message}', file=sys.stderr, flush=True))
+    out = open(args.output, 'w', encoding='utf-8') if args.output else None
+    history = open_history(args.history)
+    count = known = 0
+    try:
+        async for host, _ in enumerate_subdomains(args.domain, sources, args.timeout, stats=stats, on_log=log):
+            if history is not None and not history.add(host):
+                known += 1
+                continue
+            count += 1
+            print(host, flush=True)
+            if out:
+                out.write(host + '\n')
+                out.flush()
+    finally:
+        if out:
+            out.close()
+        close_history(history, 'hosts')
+    if not args.quiet:
+        print(f'[+] {count} unique subdomains from {sum(st["status"] != "skipped" for st in stats.values())} '
+              f'source(s)', file=sys.stderr)
+        if history is not None:
+            print(f'[+] Left out {known} hosts already in {args.history}', file=sys.stderr)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
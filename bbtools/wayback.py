@@ -0,0 +1,141 @@
+"""Single-pass processing of waybackurls output: URL dedup, host extraction and diff against known hosts."""
+import argparse
+import re
+import sys
+import time
+
+from .bloom import close_history, open_history
+from .dedup import SpillingSet
+from .probe import HOST_RE, parse_target
+from .sinks import TEXT_BUFFER
+
+# scheme://authority part of a URL: millions of URLs share a few thousand of these.
+ORIGIN_RE = re.compile(r'[^:/?#]*://[^/?#]*|[^/?#]*')
+# Origins whose parsed host is cached; the cache is reset when it grows past this.
+ORIGIN_CACHE = 100_000
+
+
+def url_host(line):
+    """Hostname of a URL (or bare host) line, without port or userinfo.
+
+    None if there is none or it is not a well-formed DNS name (the check
+    subenum applies), so archive junk such as 'www..example.com' never
+    reaches the hosts output and the prober fed from it.
+    """
+    target = parse_target(line)
+    return target[1] if target and HOST_RE.match(target[1]) else None
+
+
+def load_hosts(paths):
+    """Set of the hostnames listed in the given files (URLs and host:port lines are reduced to hosts)."""
+    hosts = set()
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            hosts.update(filter(None, map(url_host, f)))
+    return hosts
+
+
+def unique_urls(lines, seen, stats=None):
+    """Yield (url, host) for every URL not seen before, as lines arrive.
+
+    ``seen`` is a set-like with add() returning True for new keys (a
+    SpillingSet keeps memory bounded on huge inputs). host is the URL's
+    hostname the first time that host appears and None afterwards, so
+    callers get both streams from one pass. ``stats`` is filled with line,
+    URL and host counts.
+    """
+    stats = {} if stats is None else stats
+    stats.update(lines=0, urls=0, hosts=0)
+    hosts = set()
+    origins = {}
+    for line in lines:
+        stats['lines'] += 1
+        url = line.strip()
+        if not url or not seen.add(url):
+            continue
+        stats['urls'] += 1
+        origin = ORIGIN_RE.match(url).group()
+        host = origins.get(origin, False)
+        if host is False:
+            if len(origins) >= ORIGIN_CACHE:
+                origins.clear()
+            host = origins[origin] = url_host(origin)
+        if host is None or host in hosts:
+            yield url, None
+            continue
+        hosts.add(host)
+        stats['hosts'] += 1
+        yield url, host
+
+
+def _read(paths):
+    for path in paths or ['-']:
+        if path == '-':
+            yield from sys.stdin
+        else:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                yield from f
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bbtools wayback',
+                                     description='Dedup waybackurls output and extract its hosts in one pass')
+    parser.add_argument('inputs', nargs='*', help="URL lists (default: stdin)")
+    parser.add_argument('--urls', help='Write each unique URL to this file')
+    parser.add_argument('--hosts', help='Write each unique host to this file')
+    parser.add_argument('--known', action='append', default=[],
+                        help='Hosts already known (e.g. all_subdomains.txt); only hosts not listed are printed '
+                             '(repeatable)')
+    parser.add_argument('--history', metavar='FILE',
+                        help='Filter of hosts printed by earlier runs: leave those out, remember the new ones')
+    parser.add_argument('--max-memory', type=int, default=1_000_000, metavar='N',
+                        help='URL fingerprints kept in memory before spilling to disk (default: 1000000). '
+                             'Fingerprints are 64-bit hashes: over N distinct URLs, one is wrongly dropped '
+                             'as a duplicate with probability ~N**2/2**65')
+    parser.add_argument('--tmp', help='Directory for spill files (default: system temp)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='No summary on stderr')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    known = load_hosts(args.known)
+    urls_out = open(args.urls, 'w', encoding='utf-8', buffering=TEXT_BUFFER) if args.urls else None
+    hosts_out = open(args.hosts, 'w', encoding='utf-8') if args.hosts else None
+    history = open_history(args.history)
+    stats = {}
+    new = old = 0
+    start = time.monotonic()
+    try:
+        with SpillingSet(args.max_memory, args.tmp) as seen:
+            for url, host in unique_urls(_read(args.inputs), seen, stats):
+                if urls_out:
+                    urls_out.write(url + '\n')
+                if host is None:
+                    continue
+                if hosts_out:
+                    hosts_out.write(host + '\n')
+                if host in known:
+                    continue
+                if history is not None and not history.add(host):
+                    old += 1
+                    continue
+                new += 1
+                print(host, flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for out in (urls_out, hosts_out):
+            if out:
+                out.close()
+        close_history(history, 'hosts')
+    if not args.quiet:
+        print(f'[+] {stats.get("lines", 0)} lines, {stats.get("urls", 0)} unique URLs, '
+              f'{stats.get("hosts", 0)} hosts ({new} not in known lists) in {time.monotonic() - start:.1f}s',
+              file=sys.stderr)
+        if history is not None:
+            print(f'[+] Left out {old} hosts already in {args.history}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+"""Compiled wordlists: normalized, deduplicated and stored as an offsets array plus a string blob for mmap.
+
+File layout (little-endian): a 12-byte header (magic b'BBWL', format
+version, word count), count + 1 uint32 offsets into the blob, then the
+UTF-8 blob with the words back to back. Word i is blob[offsets[i]:offsets[i + 1]].
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+WORDLIST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Web_Directory_list')
+# Short names for the bundled path lists. web-all-content-types.txt holds
+# MIME types, not paths, so it has no alias here.
+WORDLISTS = {
+    'raft': 'Raft_main.txt',
+    'wordpress': 'Main_wordpress_list.txt',
+    'j2ee': 'vulnerability-scan_j2ee-websites_WEB-INF.txt',
+}
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'bug_bounty_tools', 'wordlists')
+
+MAGIC = b'BBWL'
+VERSION = 1
+HEADER = struct.Struct('<4sII')
+INVISIBLE = '\u200b\u200c\u200d\u200e\u200f\u2060\ufeff'
+# Words decoded per blob read while iterating.
+ITER_CHUNK = 4096
+
+
+def resolve(name):
+    """Path of a bundled list given its short name (see WORDLISTS), else name itself."""
+    return os.path.join(WORDLIST_DIR, WORDLISTS[name]) if name in WORDLISTS else name
+
+
+def normalize(line):
+    """The word on a wordlist line, or None for blanks and entries without a single letter or digit."""
+    word = line.strip().strip(INVISIBLE).strip()
+    if not any(c.isalnum() for c in word):
+        return None
+    return word
+
+
+def is_compiled(path):
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def iter_words(names):
+    """Normalized words of text or compiled lists, in order, duplicates included."""
+    for name in names:
+        path = resolve(name)
+        if is_compiled(path):
+            with Wordlist(path) as words:
+                yield from words
+            continue
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                word = normalize(line)
+                if word is not None:
+                    yield word
+
+
+def compile_wordlists(names, out_path):
+    """Merge the given lists into one compiled file at out_path (first occurrence wins); returns the word count."""
+    seen = set()
+    offsets = array('I', [0])
+    blob = bytearray()
+    for word in iter_words(names):
+        if word in seen:
+            continue
+        seen.add(word)
+        blob += word.encode('utf-8')
+        if len(blob) > 0xFFFFFFFF:
+            raise ValueError('wordlist too large for the format (4 GiB of text)')
+        offsets.append(len(blob))
+    out_dir = os.path.dirname(os.path.abspath(out_path))
+    os.makedirs(out_dir, exist_ok=True)
+    # Write next to the target and rename, so readers never see a half-written file.
+    fd, tmp = tempfile.mkstemp(dir=out_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(offsets) - 1))
+            if sys.byteorder != 'little':
+                offsets.byteswap()
+            offsets.tofile(f)
+            f.write(blob)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, out_path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return len(offsets) - 1
+
+
+class Wordlist:
+    """Read-only sequence of the words in a compiled file, backed by mmap.
+
+    Opening costs the same for any list size: nothing is read or decoded
+    until a word is accessed. Slicing (step 1) and shard() return views
+    sharing the same mapping, for splitting a list between workers; views
+    do not own it, so closing one does nothing and the mapping goes away
+    when the Wordlist they came from is closed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f'{path}: not a compiled wordlist (version {VERSION})')
+        if sys.byteorder != 'little':
+            self._map.close()
+            raise ValueError('compiled wordlists can only be mapped on little-endian machines')
+        end = HEADER.size + 4 * (count + 1)
+        self._offsets = memoryview(self._map)[HEADER.size:end].cast('I')
+        self._base = end
+        self._start, self._stop = 0, count
+        self._owner = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError('wordlist slices must be contiguous')
+            view = object.__new__(Wordlist)
+            view.__dict__.update(self.__dict__)
+            view._start, view._stop = self._start + start, self._start + max(start, stop)
+            view._owner = False
+            return view
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('wordlist index out of range')
+        i = self._start + index
+        return self._map[self._base + self._offsets[i]:self._base + self._offsets[i + 1]].decode('utf-8')
+
+    def __iter__(self):
+        base = self._base
+        for first in range(self._start, self._stop, ITER_CHUNK):
+            offsets = self._offsets[first:min(first + ITER_CHUNK, self._stop) + 1].tolist()
+            text = self._map[base + offsets[0]:base + offsets[-1]]
+            origin = offsets[0]
+            for a, b in zip(offsets, offsets[1:]):
+                yield text[a - origin:b - origin].decode('utf-8')
+
+    def shard(self, index, count):
+        """The index-th of count contiguous, near-equal parts of the list."""
+        size, extra = divmod(len(self), count)
+        start = index * size + min(index, extra)
+        return self[start:start + size + (index < extra)]
+
+    def close(self):
+        """Unmap the file; do this only once no view or iterator is in use. A no-op on views."""
+        if not self._owner or self._map.closed:
+            return
+        self._offsets.release()
+        self._map.close()
+
+
+def open_wordlist(*names, cache_dir=CACHE_DIR):
+    """A Wordlist for one compiled file, or for text lists compiled (once) into the cache.
+
+    names are paths or bundled short names (see WORDLISTS). The cache entry
+    is keyed by the sources' paths, sizes and modification times, so an
+    edited list is recompiled on next use.
+    """
+    paths = [resolve(name) for name in names]
+    if len(paths) == 1 and is_compiled(paths[0]):
+        return Wordlist(paths[0])
+    key = hashlib.sha1()
+    for path in paths:
+        st = os.stat(path)
+        key.update(f'{os.path.abspath(path)}\0{st.st_size}\0{st.st_mtime_ns}\0'.encode())
+    cached = os.path.join(cache_dir, f'v{VERSION}-{key.hexdigest()[:16]}.bbw')
+    if not os.path.exists(cached):
+        compile_wordlists(paths, cached)
+    return Wordlist(cached)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bbtools wordlist',
+                                     description='Merge, normalize and dedup wordlists into the compiled format')
+    parser.add_argument('sources', nargs='+',
+                        help=f'Text or compiled lists, or bundled names ({", ".join(WORDLISTS)})')
+    parser.add_argument('-o', '--output', help='Compiled file to write (default: print the merged words)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.output:
+        count = compile_wordlists(args.sources, args.output)
+        print(f'[+] {count} words written to {args.output} ({os.path.getsize(args.output):,} bytes)',
+              file=sys.stderr)
+        return
+    with open_wordlist(*args.sources) as words:
+        try:
+            for word in words:
+                sys.stdout.write(word + '\n')
+        except BrokenPipeError:
+            pass
+
+
+if __name__ == '__main__':
+    main()
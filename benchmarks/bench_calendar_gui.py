@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+GUI throughput of Calendar_validator with the calendar lookup mocked out, so
+the Tk main loop (result pump, Treeview, progress bar) is the only cost.
+
+Reports emails/s shown in the GUI and the longest main-loop stall, measured
+with a 10 ms heartbeat. Point --script at another revision of the file to
+compare (e.g. `git show HEAD~1:Calendar_validator.py > /tmp/old.py`).
+Needs a display (use xvfb-run on a headless box).
+
+Usage:
+python benchmarks/bench_calendar_gui.py -n 50000 -t 20
+python benchmarks/bench_calendar_gui.py -n 50000 --script /tmp/old.py
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import time
+import tkinter as tk
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def load(path):
+    spec = importlib.util.spec_from_file_location('calendar_validator_bench', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Calendar_validator GUI pump benchmark')
+    parser.add_argument('-n', '--emails', type=int, default=50000, help='Number of emails')
+    parser.add_argument('-t', '--threads', type=int, default=20, help='Worker threads')
+    parser.add_argument('--script', default=os.path.join(ROOT, 'Calendar_validator.py'),
+                        help='Calendar_validator.py to benchmark')
+    args = parser.parse_args()
+
+    module = load(args.script)
+    root = tk.Tk()
+    app = module.CalendarEmailValidator(root)
+    mock = lambda *args: (True, 200, 1, "Calendar exists")
+    if hasattr(app, 'check_calendar_url'):  # revisions before bbtools.gcal
+        app.check_calendar_url = mock
+    else:
+        module.CalendarValidator.check = mock
+    app.emails = [f'user{i}@example.com' for i in range(args.emails)]
+    app.total_emails = len(app.emails)
+    app.threads_var.set(str(args.threads))
+    if hasattr(app, 'rate_var'):
+        app.rate_var.set('0')  # unthrottled
+
+    stalls = []
+    last = [time.perf_counter()]
+
+    def heartbeat():
+        now = time.perf_counter()
+        stalls.append(now - last[0])
+        last[0] = now
+        root.after(10, heartbeat)
+
+    def poll():
+        if app.processed_count >= app.total_emails:
+            elapsed = time.perf_counter() - start
+            print(f'{os.path.basename(args.script)}: {app.total_emails:,} emails in {elapsed:.2f}s '
+                  f'({app.total_emails / elapsed:,.0f}/s), longest main-loop stall {max(stalls) * 1000:.0f} ms')
+            root.destroy()
+            return
+        root.after(20, poll)
+
+    start = time.perf_counter()
+    app.start_validation()
+    heartbeat()
+    poll()
+    root.mainloop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Time and peak memory of turning an email list into calendar links (CSV):
+the old path of Calendar_bug / python -m bbtools links (read the whole
+file, split it, build every link per email with generate_link(), join the
+rows into one string) versus the streaming pipeline (compiled template,
+file -> emails -> links -> CSV), each in its own process.
+
+Usage:
+python benchmarks/bench_calendar_links.py -n 1000000 --max-memory 200000
+"""
+import argparse
+import filecmp
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# calendar_links as it was before the streaming pipeline.
+LEGACY = r'''
+import re, sys
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+def clean_and_split_emails(text):
+    parts = re.split(r'[\n,;\s]+', text.strip())
+    seen = set()
+    out = []
+    for p in parts:
+        p = p.strip()
+        if not p:
+            continue
+        if p in seen:
+            continue
+        seen.add(p)
+        out.append(p)
+    return out
+def generate_link(template, email):
+    if "XYZ" in template:
+        return template.replace("XYZ", email)
+    if "{email}" in template:
+        return template.replace("{email}", email)
+    return template + email
+with open(sys.argv[1], encoding='utf-8', errors='ignore') as f:
+    text = f.read()
+kept, links = [], []
+for e in clean_and_split_emails(text):
+    if not _EMAIL_RE.match(e):
+        continue
+    kept.append(e)
+    links.append(generate_link("https://calendar.google.com/calendar/u/0/htmlembed?src=XYZ", e))
+lines = [f'"{email}","{link}"' for email, link in zip(kept, links)]
+with open(sys.argv[2], 'w', encoding='utf-8') as out:
+    out.write('\n'.join(lines) + '\n' if lines else '')
+'''
+
+
+def make_input(path, count, seed=1):
+    """count emails (about 8% repeats, 1% malformed), mostly one per line, some comma-separated."""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            email = f'user{rng.randrange(count)}@corp{i % 7}.example.com'
+            if rng.random() < 0.01:
+                email = email.replace('@', '')
+            f.write(email + (', ' if i % 3 == 0 else '\n'))
+
+
+def measure(cmd):
+    """Wall time (s) and peak RSS (MiB) of cmd."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, usage = os.wait4(proc.pid, 0)
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise SystemExit(f'{cmd} failed')
+    return time.perf_counter() - start, usage.ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Calendar link generation benchmark')
+    parser.add_argument('-n', '--count', type=int, default=1_000_000, help='Emails in the input')
+    parser.add_argument('--max-memory', type=int, default=200_000,
+                        help='bbtools links --max-memory for the bounded case')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench-links-') as tmp:
+        emails = os.path.join(tmp, 'emails.txt')
+        make_input(emails, args.count)
+        outputs = []
+        cases = [('read all + join (old)', [sys.executable, '-c', LEGACY, emails]),
+                 ('streaming', [sys.executable, '-m', 'bbtools', 'links', emails, '--csv']),
+                 (f'streaming, --max-memory {args.max_memory}',
+                  [sys.executable, '-m', 'bbtools', 'links', emails, '--csv', '--max-memory', str(args.max_memory)])]
+        for label, cmd in cases:
+            out = os.path.join(tmp, f'out{len(outputs)}.csv')
+            outputs.append(out)
+            cmd += [out] if cmd[1] == '-c' else ['-o', out]
+            elapsed, peak = measure(cmd)
+            print(f'{label:34s} {elapsed:6.2f}s {args.count / elapsed:10,.0f} emails/s  peak {peak:7.1f} MiB')
+        print('outputs identical:', all(filecmp.cmp(outputs[0], other, shallow=False) for other in outputs[1:]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Per-request latency of Calendar_validator lookups with and without the
+keep-alive session pool, against a local TLS stub server.
+
+Usage:
+python benchmarks/bench_calendar_pool.py -n 500 -t 10
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import urllib3
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from local_http import self_signed_cert, serve
+from bbtools.gcal import HTTPSessionPool
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+
+def timed(get, url):
+    start = time.perf_counter()
+    get(url)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(label, get, urls, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as ex:
+        latencies = sorted(ex.map(lambda u: timed(get, u), urls))
+    elapsed = time.perf_counter() - start
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f'{label:14s} mean {statistics.mean(latencies):6.2f} ms  p50 {statistics.median(latencies):6.2f} ms  '
+          f'p95 {p95:6.2f} ms  {len(urls) / elapsed:,.0f} req/s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Calendar_validator session pool benchmark')
+    parser.add_argument('-n', '--requests', type=int, default=500, help='Number of lookups')
+    parser.add_argument('-t', '--threads', type=int, default=10, help='Worker threads')
+    args = parser.parse_args()
+
+    server, base = serve(found=['calendar'], certfile=self_signed_cert())
+    urls = [f'{base}/calendar?src=user{i}@example.com' for i in range(args.requests)]
+
+    run('requests.get', lambda u: requests.get(u, timeout=10, verify=False), urls, args.threads)
+
+    pool = HTTPSessionPool(size=args.threads, verify=False)
+    run('session pool', pool.get, urls, args.threads)
+    pool.close()
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
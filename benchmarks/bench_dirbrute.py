@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Requests/sec and accuracy of bbtools.dirbrute against a local site.
+
+The site runs in a child process and speaks HTTP/1.1 keep-alive on one
+port and cleartext HTTP/2 (prior knowledge, via the h2 package) on
+another. Every 200th word of the list exists, every 1000th is a directory
+(301 to word/), and /soft/ answers 200 with a page echoing the path for
+everything, which the soft-404 baseline has to filter out.
+
+Usage:
+python benchmarks/bench_dirbrute.py -n 20000 -c 100
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bbtools.dirbrute import DirScanner
+from bbtools.wordlist import open_wordlist
+
+NOT_FOUND = b'<html><body><h1>404 Not Found</h1></body></html>'
+
+
+def site(words):
+    """path -> (status, headers, body) for the pages that exist."""
+    pages = {}
+    for i, word in enumerate(words):
+        if i % 1000 == 500:
+            pages['/' + word] = (301, [('location', f'/{word}/')], b'')
+            pages[f'/{word}/{words[1]}'] = (200, [], f'page {word}/{words[1]}'.encode())
+        elif i % 200 == 100:
+            pages['/' + word] = (200, [], f'<html><body>{"page %d " % i * (i % 7 + 1)}</body></html>'.encode())
+    pages['/soft'] = (301, [('location', '/soft/')], b'')
+    return pages
+
+
+def respond(pages, path):
+    if path.startswith('/soft/'):
+        return 200, [], f'<html><body>Sorry, {path[6:]} was not found on this server.</body></html>'.encode()
+    return pages.get(path, (404, [], NOT_FOUND))
+
+
+async def _http1(reader, writer, pages):
+    try:
+        while True:
+            head = await reader.readuntil(b'\r\n\r\n')
+            path = head.split(b' ', 2)[1].decode('latin-1').split('?', 1)[0]
+            status, headers, body = respond(pages, path)
+            extra = ''.join(f'{name}: {value}\r\n' for name, value in headers)
+            writer.write(f'HTTP/1.1 {status} X\r\nContent-Length: {len(body)}\r\n{extra}\r\n'.encode() + body)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError, asyncio.LimitOverrunError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _http2(reader, writer, pages):
+    import h2.config
+    import h2.connection
+    import h2.events
+    conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+    conn.initiate_connection()
+    writer.write(conn.data_to_send())
+    try:
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    path = dict(event.headers)[b':path'].decode('latin-1').split('?', 1)[0]
+                    status, headers, body = respond(pages, path)
+                    conn.send_headers(event.stream_id, [(':status', str(status)),
+                                                        ('content-length', str(len(body)))] + headers,
+                                      end_stream=not body)
+                    if body:
+                        conn.send_data(event.stream_id, body, end_stream=True)
+            writer.write(conn.data_to_send())
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def _serve(wordlist):
+    pages = site(list(open_wordlist(wordlist)))
+    h1 = await asyncio.start_server(lambda r, w: _http1(r, w, pages), '127.0.0.1', 0, backlog=1024)
+    h2 = await asyncio.start_server(lambda r, w: _http2(r, w, pages), '127.0.0.1', 0, backlog=1024)
+    print(h1.sockets[0].getsockname()[1], h2.sockets[0].getsockname()[1], flush=True)
+    await asyncio.Event().wait()
+
+
+async def scan(url, words, concurrency, http2, depth):
+    scanner = DirScanner(url, words, concurrency=concurrency, http2=http2, max_depth=depth)
+    start = time.perf_counter()
+    hits = [hit async for hit in scanner.run()]
+    return time.perf_counter() - start, hits, scanner.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Directory brute-force benchmark')
+    parser.add_argument('-n', '--words', type=int, default=20000, help='Words taken from the list')
+    parser.add_argument('-c', '--concurrency', type=int, default=100, help='Requests in flight')
+    parser.add_argument('-w', '--wordlist', default='raft', help='Wordlist (default: raft)')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        asyncio.run(_serve(args.wordlist))
+        return
+
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--serve', '-w', args.wordlist],
+                            stdout=subprocess.PIPE, text=True)
+    h1_port, h2_port = map(int, proc.stdout.readline().split())
+    try:
+        all_words = list(open_wordlist(args.wordlist))
+        words = all_words[:args.words]
+        pages = site(all_words)
+        expected = sum(1 for word in words if '/' + word in pages)
+        for label, port, http2 in (('HTTP/1.1 aiohttp', h1_port, False), ('HTTP/2 httpx', h2_port, True)):
+            elapsed, hits, stats = asyncio.run(scan(f'http://127.0.0.1:{port}/', words, args.concurrency, http2, 0))
+            print(f'{label:16s} {stats["requests"]} requests in {elapsed:5.2f}s '
+                  f'({stats["requests"] / elapsed:6.0f} req/s), {len(hits)}/{expected} pages found, '
+                  f'{stats["errors"]} errors')
+
+        # Recursion and soft-404 filtering on a smaller slice.
+        sample = all_words[:3000] + ['soft']
+        elapsed, hits, stats = asyncio.run(scan(f'http://127.0.0.1:{h1_port}/', sample, args.concurrency, False, 1))
+        soft = sum('/soft/' in hit[0] for hit in hits)
+        print(f'recursive (depth 1) {stats["requests"]} requests, {len(hits)} hits, '
+              f'{sum(1 for h in hits if h[0].endswith("/") or h[1] == 301)} directories, '
+              f'{stats["filtered"]} soft-404s filtered, {soft} soft-404 hits leaked')
+    finally:
+        proc.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Email extraction throughput on a synthetic corpus: the single-process mmap
+scanner against the process-pool extractor at increasing job counts.
+
+Usage:
+python benchmarks/bench_email_extract.py --size-mb 2048 --jobs 1 2 4 8
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bbtools.emails import extract_parallel, iter_emails
+
+
+def make_corpus(path, size_mb, seed=0):
+    """Write a log-like file of about size_mb MiB with emails mixed into noise."""
+    rng = random.Random(seed)
+    words = ['GET', 'POST', '/index.php', 'status=200', 'user-agent', 'Mozilla/5.0',
+             'token=abc123', 'error', 'ok', 'session', 'id=42', 'ref=home']
+    block = []
+    for i in range(20000):
+        line = ' '.join(rng.choice(words) for _ in range(8))
+        if i % 3 == 0:
+            line += f' contact=user{rng.randrange(1_000_000)}.name@corp{rng.randrange(500)}.example.com'
+        block.append(line)
+    block = ('\n'.join(block) + '\n').encode()
+    target = size_mb * 1024 * 1024
+    with open(path, 'wb') as f:
+        written = 0
+        n = 0
+        while written < target:
+            # Rename the users in every copy of the block so dedup has real work to do
+            chunk = block.replace(b'user', b'u%d_' % (n % 200))
+            f.write(chunk)
+            written += len(chunk)
+            n += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Email extraction benchmark')
+    parser.add_argument('--size-mb', type=int, default=2048, help='Synthetic corpus size in MiB')
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1, 2, 4, os.cpu_count()],
+                        help='Process counts to try')
+    parser.add_argument('--keep', metavar='PATH', help='Write the corpus here and keep it')
+    args = parser.parse_args()
+
+    path = args.keep or os.path.join(tempfile.mkdtemp(prefix='bench-emails-'), 'corpus.txt')
+    if not os.path.exists(path):
+        print(f'Generating {args.size_mb} MiB corpus at {path}...')
+        make_corpus(path, args.size_mb)
+    size_mb = os.path.getsize(path) / 2 ** 20
+
+    start = time.perf_counter()
+    baseline = set(iter_emails(path))
+    single = time.perf_counter() - start
+    print(f'mmap scan, 1 process : {single:6.2f}s  {size_mb / single:7.1f} MiB/s  ({len(baseline)} unique)')
+
+    for jobs in sorted(set(args.jobs)):
+        start = time.perf_counter()
+        emails = extract_parallel([path], jobs=jobs)
+        elapsed = time.perf_counter() - start
+        assert emails == baseline
+        print(f'process pool, {jobs:2d} jobs: {elapsed:6.2f}s  {size_mb / elapsed:7.1f} MiB/s  '
+              f'(x{single / elapsed:.2f})')
+
+    if not args.keep:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
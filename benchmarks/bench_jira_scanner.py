@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Requests/sec of the Jira scanner engines (bbtools.orgscan) against a local HTTP server.
+
+Usage:
+python benchmarks/bench_jira_scanner.py -n 5000 -w 100
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from local_http import serve
+from bbtools.orgscan import OrgScanner
+
+
+def run_engine(words, url_template, workers, use_async):
+    hits = []
+    first = []
+    scanner = OrgScanner(iter(words), url_template, workers=workers, timeout=10, use_async=use_async,
+                         total=len(words), on_found=lambda url, code, stamp: hits.append(url),
+                         on_progress=lambda pct: first or first.append(time.perf_counter()))
+    start = time.perf_counter()
+    scanner.run()
+    elapsed = time.perf_counter() - start
+    return elapsed, (first[0] - start) if first else 0.0, len(hits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Jira scanner benchmark')
+    parser.add_argument('-n', '--words', type=int, default=5000, help='Number of words')
+    parser.add_argument('-w', '--workers', type=int, default=100, help='Workers / in-flight requests')
+    args = parser.parse_args()
+
+    words = [f'org{i}' for i in range(args.words)]
+    server, base = serve(found=words[::100])
+    url_template = f'{base}/ORG_NAME'
+
+    for label, use_async in (('thread pool', False), ('asyncio', True)):
+        elapsed, first, hits = run_engine(words, url_template, args.workers, use_async)
+        print(f'{label:12s} {len(words)} requests in {elapsed:.2f}s '
+              f'-> {len(words) / elapsed:,.0f} req/s, first result after {first * 1000:.1f} ms '
+              f'({hits} found)')
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Throughput and coverage of name normalization on a synthetic roster:
+the old regex clean_name() of email_generator.py (lowercase, drop
+everything outside a-z) versus bbtools.emailgen.split_name() without,
+then with its per-token transliteration cache (cold and warm). Coverage
+counts names that keep a first and last name, and names whose letters
+survived intact (compared with a hand-transliterated expectation).
+
+Usage:
+python benchmarks/bench_names.py -n 1000000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bbtools import emailgen
+from bbtools.emailgen import fold_token, split_name
+
+# (written form, expected ASCII form); rosters repeat these heavily.
+FIRST = [('John', 'john'), ('Mary', 'mary'), ('José', 'jose'), ('François', 'francois'), ('Jürgen', 'jurgen'),
+         ('Søren', 'soren'), ('Łukasz', 'lukasz'), ('Ирина', 'irina'), ('Дмитрий', 'dmitriy'),
+         ('Γιώργος', 'giorgos'), ('Zoë', 'zoe'), ('Ana', 'ana'), ('Michael', 'michael'), ('Chloé', 'chloe')]
+LAST = [('Smith', 'smith'), ('Müller', 'muller'), ('García', 'garcia'), ('Nowak', 'nowak'), ('Øster', 'oster'),
+        ('Шевченко', 'shevchenko'), ('Παπαδόπουλος', 'papadopoulos'), ('Dubois', 'dubois'),
+        ('Weiß', 'weiss'), ('Johnson', 'johnson'), ('Brown', 'brown'), ('Lefèvre', 'lefevre')]
+
+
+def legacy_clean_name(name):
+    name = name.strip().lower()
+    name = re.sub(r'[^a-z\s]', '', name)
+    parts = name.split()
+    if len(parts) == 0:
+        return None, None
+    if len(parts) == 1:
+        return parts[0], ""
+    return parts[0], parts[-1]
+
+
+def make_roster(count, seed=1):
+    """count (name, (first, last)) pairs, Zipf-like so common names repeat, with a suffix now and then."""
+    rng = random.Random(seed)
+    weights_first = [1 / (i + 1) for i in range(len(FIRST))]
+    weights_last = [1 / (i + 1) for i in range(len(LAST))]
+    roster = []
+    for first, last in zip(rng.choices(FIRST, weights_first, k=count), rng.choices(LAST, weights_last, k=count)):
+        name = f'{first[0]} {last[0]}'
+        if rng.random() < 0.05:
+            name += ' Jr.'
+        roster.append((name, (first[1], last[1])))
+    return roster
+
+
+def run(func, names):
+    start = time.perf_counter()
+    results = [func(name) for name in names]
+    return len(names) / (time.perf_counter() - start), results
+
+
+def report(label, rate, results, expected):
+    kept = sum(1 for first, last in results if first and last)
+    exact = sum(1 for got, want in zip(results, expected) if got == want)
+    print(f'{label:28s} {rate:12,.0f} names/s  first+last kept {kept / len(results):6.1%}  '
+          f'exact {exact / len(results):6.1%}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Name normalization benchmark')
+    parser.add_argument('-n', '--names', type=int, default=1_000_000, help='Names in the roster')
+    args = parser.parse_args()
+
+    roster = make_roster(args.names)
+    names = [name for name, _ in roster]
+    expected = [pair for _, pair in roster]
+
+    report('regex clean_name (old)', *run(legacy_clean_name, names), expected)
+    emailgen.fold_token = fold_token.__wrapped__
+    rate, results = run(split_name, names)
+    report('split_name, no cache', rate, [(first, last) for first, _, last in results], expected)
+    emailgen.fold_token = fold_token
+    fold_token.cache_clear()
+    rate, results = run(split_name, names)
+    report('split_name, cold cache', rate, [(first, last) for first, _, last in results], expected)
+    rate, results = run(split_name, names)
+    report('split_name, warm cache', rate, [(first, last) for first, _, last in results], expected)
+    info = fold_token.cache_info()
+    print(f'token cache: {info.currsize} tokens, {info.hits / (info.hits + info.misses):.2%} hits')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Throughput of bbtools.probe against a local server farm.
+
+The farm runs in a child process and listens on all of 127.0.0.0/8 on a
+plain HTTP port, a TLS port and a port answering with chunked bodies;
+targets are spread over thousands of loopback addresses so every probe is
+a fresh connection. A share of the targets points at a closed port.
+
+Usage:
+python benchmarks/bench_probe.py -n 5000 -c 100,250,500
+"""
+import argparse
+import asyncio
+import os
+import random
+import ssl
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bbtools.probe import Prober, expand_target, parse_target
+
+from local_http import self_signed_cert
+
+PAGE = b'<html><head><title>Farm &amp; host</title></head><body>' + b'x' * 2000 + b'</body></html>'
+
+
+async def _handle(reader, writer, chunked):
+    try:
+        await reader.readuntil(b'\r\n\r\n')
+        if chunked:
+            writer.write(b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\nConnection: close\r\n\r\n'
+                         + b'%x\r\n%s\r\n0\r\n\r\n' % (len(PAGE), PAGE))
+        else:
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: %d\r\nConnection: close\r\n\r\n%s' % (len(PAGE), PAGE))
+        await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError, asyncio.LimitOverrunError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _serve_farm():
+    ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    ctx.load_cert_chain(self_signed_cert())
+    servers = [await asyncio.start_server(lambda r, w: _handle(r, w, False), '0.0.0.0', 0, backlog=4096),
+               await asyncio.start_server(lambda r, w: _handle(r, w, False), '0.0.0.0', 0, ssl=ctx, backlog=4096),
+               await asyncio.start_server(lambda r, w: _handle(r, w, True), '0.0.0.0', 0, backlog=4096)]
+    print(*(s.sockets[0].getsockname()[1] for s in servers), flush=True)
+    await asyncio.Event().wait()
+
+
+def serve_process():
+    """Start the farm in a child process; returns (process, (http_port, https_port, chunked_port))."""
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--serve'], stdout=subprocess.PIPE, text=True)
+    return proc, tuple(int(p) for p in proc.stdout.readline().split())
+
+
+def targets(count, ports, closed_share, seed=1):
+    """count target lines on distinct loopback addresses, closed_share of them on a closed port."""
+    http_port, https_port, chunked_port = ports
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        host = f'127.{1 + i // 65536 % 254}.{i // 256 % 256}.{i % 256 or 1}'
+        if rng.random() < closed_share:
+            lines.append(f'http://{host}:1')
+        else:
+            lines.append(rng.choice((f'http://{host}:{http_port}', f'https://{host}:{https_port}',
+                                     f'http://{host}:{chunked_port}')))
+    return [probe for line in lines for probe in expand_target(parse_target(line))]
+
+
+async def run(probes, concurrency):
+    prober = Prober(concurrency, connect_timeout=5, read_timeout=5)
+    alive = titled = 0
+    start = time.perf_counter()
+    async for result in prober.run(probes):
+        alive += 1
+        titled += result[4] == 'Farm & host'
+    return time.perf_counter() - start, alive, titled
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Liveness prober benchmark')
+    parser.add_argument('-n', '--count', type=int, default=5000, help='Targets per run')
+    parser.add_argument('-c', '--concurrency', default='100,250,500', help='Comma-separated concurrency levels')
+    parser.add_argument('--closed', type=float, default=0.2, help='Share of targets on a closed port')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        asyncio.run(_serve_farm())
+        return
+
+    proc, ports = serve_process()
+    try:
+        probes = targets(args.count, ports, args.closed)
+        for concurrency in (int(c) for c in args.concurrency.split(',')):
+            elapsed, alive, titled = asyncio.run(run(probes, concurrency))
+            print(f'concurrency {concurrency:4d}: {len(probes)} probes in {elapsed:5.2f}s '
+                  f'({len(probes) / elapsed:6.0f} hosts/s), {alive} alive, {titled} titles parsed')
+    finally:
+        proc.terminate()
+
+
+if __name__ == '__main__':
+    main()
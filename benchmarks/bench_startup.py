@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Startup time and peak memory of each tool: headless (python -m bbtools
+<tool> -h) versus importing the GUI script and creating its toolkit root
+(QApplication or tk.Tk). Each case runs in a fresh interpreter.
+
+Qt cases use the offscreen platform; the Tk case needs a display and is
+skipped without one.
+
+Usage:
+python benchmarks/bench_startup.py -r 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QT_GUI = 'import {module}; from PyQt5.QtWidgets import QApplication; QApplication([])'
+TK_GUI = 'import {module}, tkinter; tkinter.Tk()'
+
+# tool -> (GUI script module, GUI startup snippet)
+TOOLS = {
+    'jira': ('Jira_Dashboard_Bug_Tool', QT_GUI),
+    'calendar': ('Calendar_validator', TK_GUI),
+    'links': ('Calendar_bug', QT_GUI),
+    'emails': ('clean_email_list_generator', QT_GUI),
+}
+
+
+def measure(cmd, repeat):
+    """Median wall time (s) and peak RSS (MiB) of running cmd, or None if it fails."""
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    times, rss = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        if proc.returncode != 0:
+            return None
+        times.append(time.perf_counter() - start)
+        rss.append(usage.ru_maxrss / 1024)
+    return statistics.median(times), max(rss)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless vs GUI startup benchmark')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='Runs per case')
+    args = parser.parse_args()
+
+    for tool, (module, gui) in TOOLS.items():
+        headless = measure([sys.executable, '-m', 'bbtools', tool, '-h'], args.repeat)
+        with_gui = measure([sys.executable, '-c', gui.format(module=module)], args.repeat)
+        line = f'{tool:9s} headless {headless[0] * 1000:5.0f} ms {headless[1]:5.1f} MiB'
+        if with_gui:
+            line += f'   GUI {with_gui[0] * 1000:5.0f} ms {with_gui[1]:5.1f} MiB'
+        else:
+            line += '   GUI  (failed to start, no display?)'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Wall-clock time of subdomain enumeration with the sources run one after
+another (as Subdomain_finder.sh did) versus concurrently through
+bbtools.subenum, using fake source scripts with different run times.
+
+Usage:
+python benchmarks/bench_subenum.py -n 2000
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bbtools.subenum import enumerate_subdomains, normalize_host
+
+FAKE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_source.py')
+DOMAIN = 'example.com'
+
+
+def sources(count):
+    return {f'fake{i}': [sys.executable, FAKE, DOMAIN, '-n', str(count), '-d', str(duration), '--seed', str(i)]
+            for i, duration in enumerate((1.0, 1.5, 2.0, 2.5))}
+
+
+def sequential(cmds):
+    start = time.perf_counter()
+    seen = set()
+    for argv in cmds.values():
+        out = subprocess.run(argv, capture_output=True, text=True).stdout
+        seen.update(filter(None, (normalize_host(line, DOMAIN) for line in out.splitlines())))
+    # Nothing reaches the next stage before the merge at the very end.
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed, len(seen)
+
+
+async def concurrent(cmds):
+    start = time.perf_counter()
+    first = None
+    count = 0
+    async for _ in enumerate_subdomains(DOMAIN, cmds):
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    return time.perf_counter() - start, first, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Subdomain orchestrator benchmark')
+    parser.add_argument('-n', '--count', type=int, default=2000, help='Hosts printed by each fake source')
+    args = parser.parse_args()
+
+    cmds = sources(args.count)
+    for label, result in (('sequential', sequential(cmds)), ('concurrent', asyncio.run(concurrent(cmds)))):
+        elapsed, first, unique = result
+        print(f'{label:11s} {elapsed:5.2f}s total, first host after {first * 1000:6.0f} ms, {unique} unique hosts')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Time and peak memory of post-processing waybackurls output: the old shell
+pipeline of Subdomain_finder.sh (sort -u over all URLs, sed host
+extraction, another sort -u, comm against the known subdomains) versus
+the single streaming pass of ``python -m bbtools wayback``, on a synthetic
+URL list with many repeats.
+
+Usage:
+python benchmarks/bench_wayback.py -n 2000000 --max-memory 250000
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SHELL = r'''
+sort -u "$1" > "$2/all_urls.txt"
+sed -E 's|https?://([^/]+).*|\1|i' "$2/all_urls.txt" | sort -u > "$2/domains.txt"
+comm -13 <(sort "$3") "$2/domains.txt" > "$2/new.txt"
+'''
+
+
+def make_input(path, count, hosts, seed=1):
+    """Write count URLs over ``hosts`` hosts of example.com; about a third are repeats."""
+    rng = random.Random(seed)
+    paths = ['', 'index.php', 'wp-login.php', 'static/app.js', 'api/v1/users', 'search']
+    with open(path, 'w') as f:
+        for _ in range(count):
+            host = f'h{rng.randrange(hosts)}.example.com'
+            page = rng.choice(paths)
+            query = f'?id={rng.randrange(count // 3)}' if page else ''
+            f.write(f'{rng.choice(("http", "https"))}://{host}/{page}{query}\n')
+    with open(path + '.known', 'w') as f:
+        f.writelines(f'h{i}.example.com\n' for i in range(0, hosts, 2))
+
+
+def measure(cmd):
+    """Wall time (s) and peak RSS (MiB) of cmd's largest process."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(proc.pid, 0)
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise SystemExit(f'{cmd[0]} failed')
+    return time.perf_counter() - start, usage.ru_maxrss / 1024
+
+
+def count(path):
+    with open(path) as f:
+        return sum(1 for _ in f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Wayback post-processing benchmark')
+    parser.add_argument('-n', '--count', type=int, default=2_000_000, help='URLs in the input')
+    parser.add_argument('--hosts', type=int, default=5000, help='Distinct hosts in the input')
+    parser.add_argument('--max-memory', type=int, default=250_000, help='bbtools wayback --max-memory')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench-wayback-') as tmp:
+        urls = os.path.join(tmp, 'urls.txt')
+        make_input(urls, args.count, args.hosts)
+        shell = measure(['bash', '-c', SHELL, 'bench', urls, tmp, urls + '.known'])
+        stream = measure([sys.executable, '-m', 'bbtools', 'wayback', urls, '--known', urls + '.known', '-q',
+                          '--urls', os.path.join(tmp, 'stream_urls.txt'),
+                          '--hosts', os.path.join(tmp, 'stream_hosts.txt'), '--max-memory', str(args.max_memory)])
+        print(f'{args.count} URLs, {count(os.path.join(tmp, "all_urls.txt"))} unique '
+              f'(streamed: {count(os.path.join(tmp, "stream_urls.txt"))}), '
+              f'{count(os.path.join(tmp, "domains.txt"))} hosts '
+              f'(streamed: {count(os.path.join(tmp, "stream_hosts.txt"))})')
+        print(f'shell pipeline  {shell[0]:6.2f}s  peak {shell[1]:7.1f} MiB (largest single process)')
+        print(f'bbtools wayback {stream[0]:6.2f}s  peak {stream[1]:7.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
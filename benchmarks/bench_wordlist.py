@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Load time and Python heap use of the bundled wordlists: reading and
+stripping the text files line by line (as read_words did) versus opening
+the compiled, mmapped format through bbtools.wordlist, plus the cost of a
+first compile and of iterating a shard.
+
+Usage:
+python benchmarks/bench_wordlist.py -r 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bbtools.wordlist import WORDLISTS, compile_wordlists, open_wordlist, resolve
+
+
+def read_text(names):
+    words = []
+    for name in names:
+        with open(resolve(name), encoding='utf-8', errors='ignore') as f:
+            words += [w.strip() for w in f if w.strip()]
+    return words
+
+
+def measure(func, repeat):
+    """Median seconds and peak traced heap (MiB) of func(); returns its last result too.
+
+    The heap is traced in a separate run so tracing does not skew the times.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak / 2 ** 20, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Wordlist loading benchmark')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='Runs per case')
+    parser.add_argument('--shards', type=int, default=32, help='Shards for the slicing case')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench-wordlist-') as cache:
+        for names in (['j2ee'], ['wordpress'], ['raft'], list(WORDLISTS)):
+            label = '+'.join(names)
+            text_t, text_mem, words = measure(lambda: read_text(names), args.repeat)
+            compile_t, _, _ = measure(lambda: compile_wordlists(names, os.path.join(cache, 'tmp.bbw')), 1)
+            open_wordlist(*names, cache_dir=cache).close()  # populate the cache
+            open_t, open_mem, compiled = measure(lambda: open_wordlist(*names, cache_dir=cache), args.repeat)
+            shard = compiled.shard(args.shards - 1, args.shards)
+            iter_t, _, _ = measure(lambda: sum(1 for _ in shard), args.repeat)
+            print(f'{label:25s} text {len(words):7d} lines {text_t * 1000:7.1f} ms {text_mem:6.1f} MiB | '
+                  f'compiled {len(compiled):7d} words: open {open_t * 1e6:6.0f} us {open_mem * 1024:5.1f} KiB, '
+                  f'1/{args.shards} shard iterated in {iter_t * 1000:5.1f} ms (first compile {compile_t * 1000:.0f} ms)')
+            compiled.close()
+
+
+if __name__ == '__main__':
+    main()
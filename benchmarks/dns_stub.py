@@ -0,0 +1,149 @@
+"""Minimal authoritative DNS stub used by the DNS benchmarks.
+
+Answers TXT queries for every ``*.test`` name from a deterministic rule set
+(DMARC on even-numbered domains, SPF everywhere, DKIM under ``selector1``)
+and NXDOMAIN with an SOA in the authority section for everything else.
+Messages are built by hand so the stub can keep up with the clients it
+benchmarks.
+"""
+import argparse
+import asyncio
+import os
+import struct
+import subprocess
+import sys
+import threading
+import zlib
+
+TTL = 300
+NEGATIVE_TTL = 60
+TYPE_TXT = 16
+FLAG_TC = 0x0200
+SOA_RR = (b'\x04test\x00' + struct.pack('!HHI', 6, 1, NEGATIVE_TTL)
+          + (lambda rdata: struct.pack('!H', len(rdata)) + rdata)(
+              b'\x02ns\x04test\x00\x0ahostmaster\x04test\x00'
+              + struct.pack('!IIIII', 1, 3600, 600, 86400, NEGATIVE_TTL)))
+
+
+def answer_for(qname, rdtype):
+    """Return the TXT string for a name, or None for NXDOMAIN."""
+    if rdtype != TYPE_TXT:
+        return None
+    labels = qname.rstrip('.').split('.')
+    if labels[0] == '_dmarc':
+        domain = '.'.join(labels[1:])
+        return 'v=DMARC1; p=reject' if zlib.crc32(domain.encode()) % 2 == 0 else None
+    if len(labels) > 2 and labels[1] == '_domainkey':
+        return 'v=DKIM1; k=rsa; p=MIGfMA0GCSqGSIb3DQEBAQUAA4GNADCBiQKBgQC' if labels[0] == 'selector1' else None
+    return 'v=spf1 include:_spf.test -all'
+
+
+def build_response(wire, pad=0):
+    """Return (response wire, max UDP payload the client accepts)."""
+    qid, flags, _, _, _, arcount = struct.unpack_from('!HHHHHH', wire)
+    pos, labels = 12, []
+    while wire[pos]:
+        labels.append(wire[pos + 1:pos + 1 + wire[pos]].decode('ascii', 'replace'))
+        pos += 1 + wire[pos]
+    rdtype = struct.unpack_from('!H', wire, pos + 1)[0]
+    question = wire[12:pos + 5]
+    payload = 512
+    if arcount and wire[pos + 5] == 0 and struct.unpack_from('!H', wire, pos + 6)[0] == 41:
+        payload = max(512, struct.unpack_from('!H', wire, pos + 8)[0])
+
+    text = answer_for('.'.join(labels).lower(), rdtype)
+    base_flags = 0x8400 | (flags & 0x0100)
+    if text is None:
+        header = struct.pack('!HHHHHH', qid, base_flags | 3, 1, 0, 1, 0)
+        return header + question + SOA_RR, payload
+    strings = [text.encode()] + [b'x' * 250] * pad
+    rdata = b''.join(bytes([len(part)]) + part for part in strings)
+    header = struct.pack('!HHHHHH', qid, base_flags, 1, 1, 0, 0)
+    answer = b'\xc0\x0c' + struct.pack('!HHIH', TYPE_TXT, 1, TTL, len(rdata)) + rdata
+    return header + question + answer, payload
+
+
+class _UDP(asyncio.DatagramProtocol):
+    def __init__(self, pad):
+        self.pad = pad
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        wire, payload = build_response(data, self.pad)
+        if len(wire) > payload:
+            # Too big for UDP: send the bare question with TC set so the client retries over TCP
+            qid, flags = struct.unpack_from('!HH', wire)
+            wire = struct.pack('!HHHHHH', qid, flags | FLAG_TC, 1, 0, 0, 0) + data[12:12 + len(_question(data))]
+        self.transport.sendto(wire, addr)
+
+
+def _question(wire):
+    pos = 12
+    while wire[pos]:
+        pos += 1 + wire[pos]
+    return wire[12:pos + 5]
+
+
+async def _tcp(reader, writer, pad):
+    try:
+        while True:
+            size = int.from_bytes(await reader.readexactly(2), 'big')
+            wire, _ = build_response(await reader.readexactly(size), pad)
+            writer.write(len(wire).to_bytes(2, 'big') + wire)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def _start(loop, host, port, pad):
+    transport, _ = loop.run_until_complete(
+        loop.create_datagram_endpoint(lambda: _UDP(pad), local_addr=(host, port)))
+    port = transport.get_extra_info('sockname')[1]
+    loop.run_until_complete(asyncio.start_server(lambda r, w: _tcp(r, w, pad), host, port))
+    return port
+
+
+def serve(host='127.0.0.1', port=0, pad=0):
+    """Run the stub on UDP and TCP in a daemon thread; returns (host, port).
+
+    ``pad`` adds that many 250-byte strings to every TXT answer, which makes
+    large answers truncate over UDP and exercises TCP fallback.
+    """
+    ready = threading.Event()
+    bound = {}
+
+    def run():
+        loop = asyncio.new_event_loop()
+        bound['port'] = _start(loop, host, port, pad)
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return host, bound['port']
+
+
+def serve_process(host='127.0.0.1', pad=0):
+    """Run the stub in a child process so it does not share the client's GIL.
+
+    Returns (process, host, port); terminate the process when done.
+    """
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--host', host, '--pad', str(pad)],
+                            stdout=subprocess.PIPE, text=True)
+    port = int(proc.stdout.readline())
+    return proc, host, port
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='DNS stub server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--pad', type=int, default=0)
+    args = parser.parse_args()
+    loop = asyncio.new_event_loop()
+    print(_start(loop, args.host, args.port, args.pad), flush=True)
+    loop.run_forever()
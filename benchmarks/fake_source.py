@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Stand-in for a subdomain source tool (subfinder, assetfinder, ...): prints
+``count`` hostnames of a domain, one per line, spread evenly over
+``duration`` seconds. Hosts are drawn from a shared pool so several fake
+sources overlap the way real ones do.
+
+Usage:
+python benchmarks/fake_source.py example.com -n 2000 -d 2.0 --seed 1
+"""
+import argparse
+import random
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake subdomain source')
+    parser.add_argument('domain')
+    parser.add_argument('-n', '--count', type=int, default=1000, help='Hosts to print')
+    parser.add_argument('-d', '--duration', type=float, default=1.0, help='Seconds to spread the output over')
+    parser.add_argument('--pool', type=int, default=5000, help='Size of the shared host pool')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    hosts = rng.sample(range(args.pool), min(args.count, args.pool))
+    start = time.monotonic()
+    for i, n in enumerate(hosts, 1):
+        print(f'host{n}.{args.domain}', flush=True)
+        delay = start + args.duration * i / len(hosts) - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+if __name__ == '__main__':
+    main()
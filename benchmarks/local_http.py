@@ -0,0 +1,51 @@
+"""Tiny keep-alive HTTP server used by the benchmark scripts."""
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    found = frozenset()
+
+    def do_GET(self):
+        name = self.path.lstrip('/').split('/', 1)[0].split('?', 1)[0]
+        status = 200 if name in self.found else 404
+        body = b'ok' if status == 200 else b'not found'
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def self_signed_cert():
+    """Create a throwaway self-signed certificate with the openssl CLI and
+    return the path of a PEM file holding both key and certificate."""
+    path = os.path.join(tempfile.mkdtemp(prefix='bench-tls-'), 'server.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                    '-subj', '/CN=127.0.0.1', '-keyout', path, '-out', path],
+                   check=True, capture_output=True)
+    return path
+
+
+def serve(found=(), host='127.0.0.1', port=0, certfile=None):
+    """Start a server in a daemon thread; paths whose first segment is in
+    ``found`` return 200, everything else 404. With ``certfile`` the server
+    speaks TLS. Returns (server, base_url)."""
+    handler = type('Handler', (_Handler,), {'found': frozenset(found)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    scheme = 'http'
+    if certfile:
+        ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ctx.load_cert_chain(certfile)
+        server.socket = ctx.wrap_socket(server.socket, server_side=True)
+        scheme = 'https'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'{scheme}://{host}:{server.server_address[1]}'
@@ -1,14 +1,49 @@
 import sys
-import re
+import os
+import multiprocessing
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QFileDialog, QTextEdit, QLabel,
-    QMessageBox, QStatusBar
+    QPushButton, QFileDialog, QLineEdit, QLabel,
+    QMessageBox, QStatusBar, QProgressBar
 )
 from PyQt5.QtGui import QFont
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
 
-EMAIL_REGEX = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
+from bbtools.emails import PARALLEL_THRESHOLD, extract_parallel, iter_emails, main as emails_cli
+from bbtools.qtmodels import ColumnTableModel, attach_filter, make_table_view
+
+
+class ExtractorThread(QThread):
+    progress = pyqtSignal(int)
+    done = pyqtSignal(list)
+    failed = pyqtSignal(str)
+
+    def __init__(self, paths):
+        super().__init__()
+        self.paths = paths
+
+    def run(self):
+        try:
+            sizes = [os.path.getsize(p) for p in self.paths]
+            total = sum(sizes)
+            if total >= PARALLEL_THRESHOLD:
+                # spawn, not fork: forking a process that runs Qt threads is unsafe
+                emails = extract_parallel(self.paths, progress=self._report,
+                                          mp_context=multiprocessing.get_context("spawn"))
+            else:
+                emails = set()
+                base = 0
+                for path, size in zip(self.paths, sizes):
+                    emails.update(iter_emails(path, progress=lambda done, _: self._report(base + done, total)))
+                    base += size
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.done.emit(sorted(emails))
+
+    def _report(self, done, total):
+        if total:
+            self.progress.emit(int(done / total * 100))
 
 class EmailExtractorApp(QWidget):
     def __init__(self):
@@ -17,6 +52,7 @@ class EmailExtractorApp(QWidget):
         self.setGeometry(300, 150, 900, 650)
 
         self.emails = []
+        self.extractor = None
 
         self.init_ui()
 
@@ -36,7 +72,7 @@ class EmailExtractorApp(QWidget):
 
         btn_layout = QHBoxLayout()
 
-        self.open_btn = QPushButton("📂 Open TXT File")
+        self.open_btn = QPushButton("📂 Open TXT Files")
         self.open_btn.setFixedHeight(40)
         self.open_btn.clicked.connect(self.open_file)
 
@@ -49,12 +85,23 @@ class EmailExtractorApp(QWidget):
 
         layout.addLayout(btn_layout)
 
-        self.text_area = QTextEdit()
-        self.text_area.setFont(QFont("Consolas", 11))
-        self.text_area.setPlaceholderText("Extracted emails will appear here...")
-        self.text_area.setReadOnly(True)
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter extracted emails...")
+
+        layout.addWidget(self.filter_input)
+
+        self.email_model = ColumnTableModel(["Email"])
+        self.email_table = make_table_view(self.email_model)
+        self.email_table.setFont(QFont("Consolas", 11))
+        attach_filter(self.filter_input, self.email_model)
+
+        layout.addWidget(self.email_table)
+
+        self.progress = QProgressBar()
+        self.progress.setValue(0)
+        self.progress.hide()
 
-        layout.addWidget(self.text_area)
+        layout.addWidget(self.progress)
 
         self.status = QStatusBar()
         self.status.showMessage("Ready")
@@ -78,7 +125,7 @@ class EmailExtractorApp(QWidget):
             QPushButton:hover {
                 background-color: #388bfd;
             }
-            QTextEdit {
+            QTableView, QLineEdit {
                 background-color: #0d1117;
                 border: 1px solid #30363d;
                 border-radius: 6px;
@@ -86,27 +133,39 @@ class EmailExtractorApp(QWidget):
         """)
 
     def open_file(self):
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Select TXT File", "", "Text Files (*.txt);;All Files (*)"
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self, "Select TXT Files", "", "Text Files (*.txt);;All Files (*)"
         )
 
-        if not file_path:
+        if not file_paths:
             return
 
-        try:
-            with open(file_path, "r", errors="ignore") as f:
-                content = f.read()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
-            return
+        self.open_btn.setEnabled(False)
+        self.progress.setValue(0)
+        self.progress.show()
+        self.status.showMessage(f"Extracting emails from {len(file_paths)} file(s)...")
+
+        self.extractor = ExtractorThread(file_paths)
+        self.extractor.progress.connect(self.progress.setValue)
+        self.extractor.done.connect(self.extraction_done)
+        self.extractor.failed.connect(self.extraction_failed)
+        self.extractor.start()
 
-        self.emails = sorted(set(re.findall(EMAIL_REGEX, content)))
+    def extraction_done(self, emails):
+        self.emails = emails
 
-        self.text_area.clear()
-        self.text_area.setPlainText("\n".join(self.emails))
+        self.email_model.load([self.emails])
 
+        self.progress.hide()
+        self.open_btn.setEnabled(True)
         self.status.showMessage(f"✅ {len(self.emails)} unique emails extracted")
 
+    def extraction_failed(self, error):
+        self.progress.hide()
+        self.open_btn.setEnabled(True)
+        self.status.showMessage("Ready")
+        QMessageBox.critical(self, "Error", error)
+
     def save_file(self):
         if not self.emails:
             QMessageBox.warning(self, "Warning", "No emails to save")
@@ -128,8 +187,17 @@ class EmailExtractorApp(QWidget):
 
         QMessageBox.information(self, "Success", "Emails saved successfully")
 
-if __name__ == "__main__":
+def main():
+    # With arguments this is the headless extractor (same as
+    # python -m bbtools emails); without, the GUI is started.
+    if len(sys.argv) > 1:
+        return emails_cli()
+
     app = QApplication(sys.argv)
     window = EmailExtractorApp()
     window.show()
     sys.exit(app.exec_())
+
+
+if __name__ == "__main__":
+    main()
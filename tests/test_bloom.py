@@ -0,0 +1,27 @@
+import pytest
+
+from bbtools.bloom import DATA_OFFSET, HEADER, MAGIC, VERSION, BloomFilter
+
+
+def test_header_round_trip(tmp_path):
+    path = str(tmp_path / 'seen.bbf')
+    with BloomFilter(path, capacity=1000, fp_rate=0.01) as bloom:
+        bloom.update(f'host{i}.example' for i in range(100))
+        bits, hashes = bloom.bits, bloom.hashes
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    assert len(data) == DATA_OFFSET + bits // 8
+    assert HEADER.unpack_from(data) == (MAGIC, VERSION, hashes, bits, 100, 1000, 0.01)
+
+    # Capacity and fp_rate only apply to new files.
+    with BloomFilter(path, capacity=5, fp_rate=0.5) as bloom:
+        assert (bloom.bits, bloom.hashes, len(bloom)) == (bits, hashes, 100)
+        assert all(f'host{i}.example' in bloom for i in range(100))
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'not-a-filter'
+    path.write_bytes(b'host1.example\n' * 10)
+    with pytest.raises(ValueError):
+        BloomFilter(str(path))
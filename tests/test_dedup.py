@@ -0,0 +1,52 @@
+import os
+import random
+
+from bbtools import dedup
+from bbtools.dedup import SpillingSet, merge_runs, reduce_runs, sorted_unique, write_run, write_runs
+
+
+def test_spilling_set_spills_and_merges(tmp_path):
+    words = [f'word{i}' for i in range(1000)]
+    with SpillingSet(max_items=50, directory=str(tmp_path), max_runs=3) as seen:
+        assert all(seen.add(w) for w in words)
+        assert not any(seen.add(w) for w in words[::7])
+        assert len(seen) == 1000
+        # 20 spills, merged whenever a fourth run appears
+        assert 1 <= len(seen._runs) <= 3
+        assert all(w in seen for w in words)
+        assert not any(f'other{i}' in seen for i in range(1000))
+        run_dir = seen._dir
+    assert not os.path.exists(run_dir)
+
+
+def _random_words(rng, count):
+    return [''.join(rng.choice('abé-.') for _ in range(rng.randrange(1, 6))) for _ in range(count)]
+
+
+def test_merge_runs_is_sorted_and_distinct(tmp_path, monkeypatch):
+    monkeypatch.setattr(dedup, 'RUN_BUFFER', 16)  # many small blocks, bounds shared between runs
+    rng = random.Random(5)
+    runs = [_random_words(rng, rng.randrange(0, 300)) for _ in range(6)]
+    paths = [str(tmp_path / f'run{i}.txt') for i in range(len(runs))]
+    for words, path in zip(runs, paths):
+        assert write_run(words, path) == len(set(words))
+    expected = sorted(set().union(*runs))
+    assert list(merge_runs(paths)) == expected
+
+
+def test_reduce_runs_merges_in_passes(tmp_path):
+    rng = random.Random(7)
+    words = _random_words(rng, 2000)
+    paths = write_runs(words, str(tmp_path), max_items=100)
+    assert len(paths) > 9
+    reduced = reduce_runs(paths, str(tmp_path), fan_in=3)
+    assert len(reduced) <= 3
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(p) for p in reduced)
+    assert list(merge_runs(reduced)) == sorted(set(words))
+
+
+def test_sorted_unique_spills_to_runs(tmp_path):
+    words = _random_words(random.Random(9), 3000)
+    assert list(sorted_unique(words, max_items=50, directory=str(tmp_path))) == sorted(set(words))
+    assert list(sorted_unique(words[:10], max_items=50)) == sorted(set(words[:10]))
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,49 @@
+import asyncio
+
+import local_http
+import pytest
+
+from bbtools.dirbrute import DirScanner
+
+
+@pytest.fixture(scope='module')
+def base():
+    return local_http.serve(found={'admin', 'backup', 'login'})[1]
+
+
+def _words(count):
+    for i in range(count):
+        yield ('admin', 'backup', 'login')[i] if i < 3 else f'missing{i}'
+
+
+async def _collect(scanner):
+    return [hit async for hit in scanner.run()]
+
+
+def test_finds_hits(base):
+    hits = asyncio.run(asyncio.wait_for(_collect(DirScanner(base, list(_words(40)), concurrency=4)), 10))
+    assert sorted((url, status) for url, status, *_ in hits) == [
+        (f'{base}/admin', 200), (f'{base}/backup', 200), (f'{base}/login', 200)]
+
+
+def test_worker_error_reaches_the_consumer(base):
+    def words():
+        yield from _words(20)
+        raise UnicodeDecodeError('utf-8', b'\xff', 0, 1, 'invalid start byte')
+
+    with pytest.raises(UnicodeDecodeError):
+        asyncio.run(asyncio.wait_for(_collect(DirScanner(base, words(), concurrency=4)), 10))
+
+
+def test_stopping_early_cancels_the_workers(base):
+    async def run():
+        hits = DirScanner(base, ['admin'] * 10_000, concurrency=4).run()
+        async for _ in hits:
+            break
+        await asyncio.sleep(0.2)  # let the workers fill the result queue
+        await hits.aclose()
+        others = asyncio.all_tasks() - {asyncio.current_task()}
+        _, pending = await asyncio.wait(others, timeout=2) if others else (None, ())
+        return pending
+
+    assert not asyncio.run(run())
@@ -0,0 +1,52 @@
+import asyncio
+import sqlite3
+
+import dns_stub
+import pytest
+from DMARC_Record_Tool import bulk_audit
+
+
+@pytest.fixture(scope='module')
+def stub():
+    return dns_stub.serve()
+
+
+def _audit(stub, domains, **kwargs):
+    host, port = stub
+    return bulk_audit(domains, concurrency=8, selectors=('selector1',), nameservers=[host], port=port,
+                      lifetime=2.0, engine='udp', **kwargs)
+
+
+def test_audits_every_domain(stub):
+    async def run():
+        return [result async for result in _audit(stub, [f'd{i}.test' for i in range(50)])]
+
+    results = asyncio.run(asyncio.wait_for(run(), 10))
+    assert sorted(r['domain'] for r in results) == sorted(f'd{i}.test' for i in range(50))
+    assert all(r['spf'] and r['dkim_selectors'] == ['selector1'] for r in results)
+
+
+def test_stopping_early_cancels_the_workers(stub):
+    async def run():
+        results = _audit(stub, (f'd{i}.test' for i in range(10_000)))
+        async for _ in results:
+            break
+        await results.aclose()
+        others = asyncio.all_tasks() - {asyncio.current_task()}
+        _, pending = await asyncio.wait(others, timeout=2)
+        return others, pending
+
+    others, pending = asyncio.run(run())
+    assert others and not pending and all(task.cancelled() for task in others)
+
+
+def test_worker_error_reaches_the_consumer(stub):
+    class BrokenCache:
+        def batch(self, names, rdtype):
+            raise sqlite3.OperationalError('database is locked')
+
+    async def run():
+        return [result async for result in _audit(stub, ['d1.test', 'd2.test'], cache=BrokenCache())]
+
+    with pytest.raises(sqlite3.OperationalError):
+        asyncio.run(asyncio.wait_for(run(), 10))
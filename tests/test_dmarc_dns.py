@@ -0,0 +1,50 @@
+import asyncio
+import struct
+
+import dns_stub
+from DMARC_Record_Tool import (FLAG_TC, TYPE_TXT, UDPQueryEngine, encode_query, encode_question,
+                               parse_answer)
+
+
+def test_encode_question_rejects_bad_labels():
+    assert encode_question('a.example') == b'\x01a\x07example\x00' + struct.pack('!HH', TYPE_TXT, 1)
+    for name in ('a..example', 'x' * 64 + '.example'):
+        try:
+            encode_question(name)
+        except ValueError:
+            continue
+        raise AssertionError(name)
+
+
+def test_parse_txt_answer():
+    wire, payload = dns_stub.build_response(encode_query(7, encode_question('mail.test')))
+    assert payload == 1232  # from our EDNS0 OPT record
+    answer = parse_answer(wire)
+    assert answer.rcode == 0
+    assert answer.records == ['v=spf1 include:_spf.test -all']
+    assert answer.ttl == dns_stub.TTL
+
+
+def test_parse_multi_string_txt_answer():
+    wire, _ = dns_stub.build_response(encode_query(7, encode_question('mail.test')), pad=2)
+    assert parse_answer(wire).records == ['v=spf1 include:_spf.test -all' + 'x' * 500]
+
+
+def test_parse_nxdomain_negative_ttl():
+    wire, _ = dns_stub.build_response(encode_query(7, encode_question('nokey._domainkey.mail.test')))
+    answer = parse_answer(wire)
+    assert (answer.rcode, answer.records, answer.ttl) == (3, [], 0)
+    assert answer.negative_ttl == dns_stub.NEGATIVE_TTL
+
+
+def test_truncated_answer_falls_back_to_tcp():
+    host, port = dns_stub.serve(pad=8)  # ~2 kB answers: over the 1232-byte UDP limit
+
+    async def run():
+        async with UDPQueryEngine([host], port=port, lifetime=2.0) as engine:
+            return await engine.query('mail.test')
+
+    wire, _ = dns_stub.build_response(encode_query(1, encode_question('mail.test')), pad=8)
+    assert len(wire) > 1232 and not struct.unpack_from('!H', wire, 2)[0] & FLAG_TC
+    answer = asyncio.run(run())
+    assert answer.records == ['v=spf1 include:_spf.test -all' + 'x' * 2000]
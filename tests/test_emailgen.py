@@ -0,0 +1,34 @@
+import pytest
+
+from bbtools.emailgen import fold_token, split_name
+
+
+@pytest.mark.parametrize('token, folded', [
+    ('José', 'jose'), ('Müller', 'muller'), ('Łukasz', 'lukasz'), ('Straße', 'strasse'), ('Ørsted', 'orsted'),
+    ('Ирина', 'irina'), ('Ἀθηνᾶ', 'athina'), ("O'Brien", 'obrien'), ('Jean-Luc', 'jeanluc'), ('Dr.', 'dr'),
+])
+def test_fold_token(token, folded):
+    assert fold_token(token) == folded
+
+
+@pytest.mark.parametrize('name, parts', [
+    ('John Smith', ('john', '', 'smith')),
+    ('Anna Marie Louise Smith', ('anna', 'marie', 'smith')),
+    # particles stay with the surname, but never swallow the first name
+    ('Ludwig van Beethoven', ('ludwig', '', 'vanbeethoven')),
+    ('Maria de la Cruz', ('maria', '', 'delacruz')),
+    ('Van Morrison', ('van', '', 'morrison')),
+    # 'Last, First Middle' keeps every surname word
+    ('van der Berg, Anna Maria', ('anna', 'maria', 'vanderberg')),
+    ("O'Brien, Patrick", ('patrick', '', 'obrien')),
+    # titles and suffixes are dropped, also around the comma form
+    ('Prof. Dr. Hans Müller III', ('hans', '', 'muller')),
+    ('John Smith, Jr.', ('john', '', 'smith')),
+    ('Smith, John, Jr', ('john', '', 'smith')),
+    ('Dr', ('dr', '', '')),
+    ('Cher', ('cher', '', '')),
+    ('  ,  ', (None, None, None)),
+    ('---', (None, None, None)),
+])
+def test_split_name(name, parts):
+    assert split_name(name) == parts
@@ -0,0 +1,42 @@
+import io
+import random
+import time
+
+from bbtools.emails import EMAIL_BYTES_RE, _finditer, _iter_stream, _trailing_run_start
+
+
+def _spans(matches):
+    return [m.span() for m in matches]
+
+
+def test_finditer_matches_re_finditer():
+    rng = random.Random(3)
+    pieces = [b'a', b'b', b'9', b'.', b'-', b'_', b'%', b'+', b'@', b'@', b'co', b'x.io', b' ', b'\n', b',', b'<']
+    for _ in range(3000):
+        data = b''.join(rng.choice(pieces) for _ in range(rng.randrange(0, 40)))
+        pos = rng.randrange(0, len(data) + 1)
+        end = rng.randrange(pos, len(data) + 1)
+        assert _spans(_finditer(data, pos, end)) == _spans(EMAIL_BYTES_RE.finditer(data, pos, end)), (data, pos, end)
+
+
+def test_finditer_is_linear_on_long_runs():
+    # re.finditer rescans the whole run from each of its bytes: minutes for this input
+    data = b'a.' * 100_000 + b'@ x ' + b'-' * 200_000 + b' me@example.com'
+    start = time.perf_counter()
+    assert [m.group() for m in _finditer(data)] == [b'me@example.com']
+    assert time.perf_counter() - start < 2
+
+
+def test_trailing_run_start():
+    assert _trailing_run_start(b'hello world', 100) == 6
+    assert _trailing_run_start(b'x ' + b'a' * 1000, 100) == 902  # capped at limit bytes back
+    assert _trailing_run_start(b'end\n', 100) == 4
+    assert _trailing_run_start(b'', 100) == 0
+
+
+def test_stream_finds_addresses_across_chunks():
+    rng = random.Random(4)
+    emails = [f'user{i}.{rng.randrange(10**6)}@corp{i % 5}.example.com' for i in range(500)]
+    data = ', '.join(emails).encode() + b'\n' + b'z' * 5000 + b' last@example.org'
+    for chunk_size in (7, 64, 4096):
+        assert list(_iter_stream(io.BytesIO(data), chunk_size, None)) == emails + ['last@example.org']
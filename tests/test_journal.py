@@ -0,0 +1,25 @@
+from bbtools.journal import Journal
+
+
+def test_resume_drops_torn_last_line(tmp_path):
+    path = tmp_path / 'run.jsonl'
+    with Journal(str(path)) as journal:
+        journal.record('a', 200)
+        journal.record('b', 404)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('["c",2')  # crash in the middle of a write
+
+    with Journal(str(path), resume=True) as journal:
+        assert len(journal) == 2
+        assert journal.get('b') == 404 and 'c' not in journal
+        journal.record('c', 200)
+    assert path.read_text().splitlines() == ['["a",200]', '["b",404]', '["c",200]']
+
+
+def test_without_resume_starts_afresh(tmp_path):
+    path = tmp_path / 'run.jsonl'
+    with Journal(str(path)) as journal:
+        journal.record('a')
+    with Journal(str(path)) as journal:
+        assert len(journal) == 0
+    assert path.read_text() == ''
@@ -0,0 +1,19 @@
+import local_http
+from bbtools.journal import Journal
+from bbtools.orgscan import OrgScanner
+
+
+def test_resume_reports_journaled_hits_with_their_stamp(tmp_path):
+    _, base = local_http.serve(found={'a', 'c'})
+    path = str(tmp_path / 'jira.jsonl')
+
+    def scan(resume):
+        found = []
+        with Journal(path, resume=resume) as journal:
+            OrgScanner(['a', 'b', 'c', 'd'], base + '/ORG_NAME', workers=2, use_async=False, journal=journal,
+                       on_found=lambda *hit: found.append(hit)).run()
+        return sorted(found)
+
+    first = scan(resume=False)
+    assert [(url, code) for url, code, _ in first] == [(base + '/a', 200), (base + '/c', 200)]
+    assert scan(resume=True) == first
@@ -0,0 +1,65 @@
+import asyncio
+
+import local_http
+import pytest
+
+from bbtools.probe import Prober, expand_target, format_url, parse_target
+
+
+def test_parse_target():
+    assert parse_target('Example.COM.') == (None, 'example.com', None)
+    assert parse_target('example.com:8443') == (None, 'example.com', 8443)
+    assert parse_target('https://user@example.com:8443/login?x=1') == ('https', 'example.com', 8443)
+    assert parse_target('[2001:db8::1]:8080') == (None, '2001:db8::1', 8080)
+    assert parse_target('2001:db8::1') == (None, '2001:db8::1', None)
+    assert parse_target('10.0.0.1:81') == (None, '10.0.0.1', 81)
+    assert parse_target('_dmarc.example.com') == (None, '_dmarc.example.com', None)
+    assert parse_target('bücher.example') == (None, 'xn--bcher-kva.example', None)
+    for bad in ('example.com:0', 'example.com:65536', 'example.com:http', 'ftp://example.com',
+                '[2001:db8::1]x', '', 'a..b.com', '.example.com', 'foo%2f.example.com',
+                'x' * 64 + '.example.com', '-www.example.com'):
+        assert parse_target(bad) is None, bad
+
+
+def test_expand_and_format():
+    assert expand_target((None, 'example.com', 8443)) == [('http', 'example.com', 8443),
+                                                           ('https', 'example.com', 8443)]
+    assert expand_target((None, 'example.com', 443)) == [('https', 'example.com', 443)]
+    assert format_url('https', 'example.com', 443) == 'https://example.com'
+    assert format_url('http', '2001:db8::1', 8080) == 'http://[2001:db8::1]:8080'
+
+
+async def _collect(prober, targets):
+    return [result async for result in prober.run(targets)]
+
+
+def test_unresolvable_name_is_dead_not_a_hang():
+    # getaddrinfo raises UnicodeError for empty labels
+    targets = [('http', 'a..b.com', 80), ('https', '.example.com', 443)]
+    assert asyncio.run(asyncio.wait_for(_collect(Prober(concurrency=2), targets), 10)) == []
+
+
+def test_worker_error_reaches_the_consumer():
+    class Broken(Prober):
+        async def probe(self, scheme, host, port):
+            raise RuntimeError(host)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(asyncio.wait_for(_collect(Broken(concurrency=4), [('http', 'example.com', 80)]), 10))
+
+
+def test_stopping_early_cancels_the_workers():
+    _, base = local_http.serve()
+    port = int(base.rsplit(':', 1)[1])
+
+    async def run():
+        results = Prober(concurrency=4).run(('http', '127.0.0.1', port) for _ in range(10_000))
+        async for _ in results:
+            break
+        await asyncio.sleep(0.2)  # let the workers fill the result queue
+        await results.aclose()
+        others = asyncio.all_tasks() - {asyncio.current_task()}
+        _, pending = await asyncio.wait(others, timeout=2) if others else (None, ())
+        return pending
+
+    assert not asyncio.run(run())
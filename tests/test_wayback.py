@@ -0,0 +1,22 @@
+from bbtools.dedup import SpillingSet
+from bbtools.wayback import unique_urls, url_host
+
+
+def test_url_host():
+    assert url_host('https://user:pw@Api.Example.com:8443/a?b') == 'api.example.com'
+    assert url_host('www.example.com/robots.txt') == 'www.example.com'
+    assert url_host('http://10.0.0.1/') == '10.0.0.1'
+    for junk in ('https://www..example.com/x', 'http://foo%2f.example.com/', 'https://-x.example.com/',
+                 'http://exa mple.com/', ''):
+        assert url_host(junk) is None, junk
+
+
+def test_unique_urls_streams_new_urls_and_hosts(tmp_path):
+    lines = ['https://a.example.com/1\n', 'https://a.example.com/1\n', 'https://a.example.com/2\n',
+             'http://www..example.com/\n', 'https://B.example.com:443/\n', '\n']
+    stats = {}
+    with SpillingSet(directory=str(tmp_path)) as seen:
+        out = list(unique_urls(lines, seen, stats))
+    assert out == [('https://a.example.com/1', 'a.example.com'), ('https://a.example.com/2', None),
+                   ('http://www..example.com/', None), ('https://B.example.com:443/', 'b.example.com')]
+    assert stats == {'lines': 6, 'urls': 4, 'hosts': 2}
@@ -0,0 +1,34 @@
+import struct
+
+from bbtools.wordlist import HEADER, MAGIC, VERSION, Wordlist, compile_wordlists, is_compiled
+
+
+def test_compiled_layout(tmp_path):
+    src = tmp_path / 'words.txt'
+    src.write_text('admin\n\n  login \n\u200bapi\u200b\nadmin\n---\ncafé\n', encoding='utf-8')
+    out = tmp_path / 'words.bbw'
+    assert compile_wordlists([str(src)], str(out)) == 4
+    assert is_compiled(str(out)) and not is_compiled(str(src))
+
+    data = out.read_bytes()
+    assert HEADER.unpack_from(data) == (MAGIC, VERSION, 4)
+    offsets = struct.unpack_from('<5I', data, HEADER.size)
+    blob = data[HEADER.size + 4 * 5:]
+    assert offsets == (0, 5, 10, 13, 18)
+    assert blob == 'adminloginapicafé'.encode('utf-8')
+
+
+def test_slices_and_shards(tmp_path):
+    src = tmp_path / 'words.txt'
+    src.write_text(''.join(f'w{i}\n' for i in range(10)))
+    out = str(tmp_path / 'words.bbw')
+    compile_wordlists([str(src)], out)
+    with Wordlist(out) as words:
+        assert list(words) == [f'w{i}' for i in range(10)]
+        assert words[-1] == 'w9'
+        view = words[2:5]
+        assert list(view) == ['w2', 'w3', 'w4'] and view[0] == 'w2'
+        shards = [list(words.shard(i, 3)) for i in range(3)]
+        assert shards == [['w0', 'w1', 'w2', 'w3'], ['w4', 'w5', 'w6'], ['w7', 'w8', 'w9']]
+        view.close()  # views do not own the mapping
+        assert words[0] == 'w0'